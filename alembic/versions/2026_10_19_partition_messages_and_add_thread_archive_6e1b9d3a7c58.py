@@ -0,0 +1,186 @@
+"""Partition messages and add thread archive
+
+Revision ID: 6e1b9d3a7c58
+Revises: 9f2c7d4b1a86
+Create Date: 2026-10-19 22:05:47.902114
+
+`message` is rebuilt as a new table in both directions. Its rows are copied in batches of COPY_BATCH_SIZE,
+each committed on its own, while a trigger mirrors concurrent writes, so chat writes keep going during the copy.
+They are only blocked while the tables are swapped, which takes a few renames.
+The copy commits the migrations applied before it in the same run.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1b9d3a7c58'
+down_revision: Union[str, None] = '9f2c7d4b1a86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions of `message` by hash of thread_id, so reads of a thread touch one of them
+PARTITIONS = 16
+
+# Messages copied per transaction while the table is rebuilt
+COPY_BATCH_SIZE = 10_000
+
+COLUMNS = 'id, role, content, tool_calls, tool_call_id, created_at, thread_id'
+
+# Indexes of `message` by name suffix, created on the new table under its own prefix and renamed after the swap
+INDEXES = {
+    'created_at': dict(columns=['created_at']),
+    'thread_id_created_at': dict(columns=['thread_id', 'created_at']),
+    'search_vector': dict(columns=['search_vector'], postgresql_using='gin'),
+    'content_trgm': dict(columns=['content'], postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'}),
+}
+
+
+def create_message_table(name: str, primary_key: list[str], partition_by: str = '', unique_id: bool = False) -> None:
+    op.execute(f"""
+        CREATE TABLE {name} (
+            id UUID NOT NULL,
+            role chat_role_enum NOT NULL,
+            content TEXT NOT NULL,
+            tool_calls JSONB,
+            tool_call_id VARCHAR,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+            search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED,
+            thread_id UUID NOT NULL
+        ) {partition_by}
+    """)
+    if partition_by:
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f'CREATE TABLE message_p{remainder} PARTITION OF {name} '
+                f'FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})'
+            )
+    # Built before the copy: indexes cannot be created concurrently on a partitioned table,
+    # and building them after the swap would lock `message` for as long
+    op.create_primary_key(f'{name}_pkey', name, primary_key)
+    op.create_foreign_key(f'{name}_thread_id_fkey', name, 'thread', ['thread_id'], ['id'])
+    if unique_id:
+        op.create_index(f'ix_{name}_id', name, ['id'], unique=True)
+    for suffix, index in INDEXES.items():
+        index = dict(index)
+        op.create_index(f'ix_{name}_{suffix}', name, index.pop('columns'), unique=False, **index)
+
+
+def copy_messages(target: str) -> None:
+    """
+    Copy `message` into `target` while the application keeps writing to it. A row trigger mirrors changes
+    made during the copy, and the existing rows are copied by a procedure committing every COPY_BATCH_SIZE rows,
+    so no lock is held on `message` for longer than a batch. Rows of a batch are locked FOR SHARE until it commits,
+    so a concurrent update or delete of a copied row waits and is mirrored after it.
+    """
+    op.execute(f"""
+        CREATE FUNCTION message_mirror() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {target} WHERE id = OLD.id AND thread_id = OLD.thread_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {target} ({COLUMNS})
+                VALUES (NEW.id, NEW.role, NEW.content, NEW.tool_calls, NEW.tool_call_id, NEW.created_at, NEW.thread_id)
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER message_mirror
+        AFTER INSERT OR UPDATE OR DELETE ON message
+        FOR EACH ROW EXECUTE FUNCTION message_mirror()
+    """)
+    op.execute(f"""
+        CREATE PROCEDURE message_copy(batch_size integer) LANGUAGE plpgsql AS $$
+        DECLARE
+            last_id uuid := '00000000-0000-0000-0000-000000000000';
+            copied integer;
+        BEGIN
+            LOOP
+                WITH batch AS (
+                    SELECT {COLUMNS} FROM message WHERE id > last_id ORDER BY id LIMIT batch_size FOR SHARE
+                ), inserted AS (
+                    INSERT INTO {target} ({COLUMNS}) SELECT {COLUMNS} FROM batch ON CONFLICT DO NOTHING
+                )
+                SELECT count(*), (array_agg(id ORDER BY id DESC))[1] INTO copied, last_id FROM batch;
+                EXIT WHEN copied = 0;
+                COMMIT;
+            END LOOP;
+        END
+        $$
+    """)
+    # Commits the work so far: the trigger must be visible to writers before the copy starts,
+    # and a procedure can only commit outside of a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(f'CALL message_copy({COPY_BATCH_SIZE})')
+
+    op.execute('DROP PROCEDURE message_copy')
+    op.execute('DROP TRIGGER message_mirror ON message')
+    op.execute('DROP FUNCTION message_mirror')
+
+
+def replace_message_table(name: str, unique_id: bool = False) -> None:
+    """Swap the copy in place of `message`, the only step locking the table, for the time of a few renames."""
+    op.drop_table('message')
+    op.rename_table(name, 'message')
+    op.execute(f'ALTER INDEX {name}_pkey RENAME TO message_pkey')
+    op.execute(f'ALTER TABLE message RENAME CONSTRAINT {name}_thread_id_fkey TO message_thread_id_fkey')
+    for suffix in [*(['id'] if unique_id else []), *INDEXES]:
+        op.execute(f'ALTER INDEX ix_{name}_{suffix} RENAME TO ix_message_{suffix}')
+    op.execute("""
+        CREATE TRIGGER message_touch_thread
+        AFTER INSERT ON message
+        REFERENCING NEW TABLE AS new_messages
+        FOR EACH STATEMENT EXECUTE FUNCTION touch_thread_updated_at()
+    """)
+
+
+def upgrade() -> None:
+    # The table is rebuilt: an existing table cannot be turned into a partitioned one.
+    # Unique constraints of a partitioned table must include the partition key
+    create_message_table('message_partitioned', ['id', 'thread_id'], 'PARTITION BY HASH (thread_id)')
+    copy_messages('message_partitioned')
+    replace_message_table('message_partitioned')
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('thread_archive',
+    sa.Column('thread_id', sa.Uuid(), nullable=False),
+    sa.Column('messages', sa.LargeBinary(), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('last_message_content', sa.Text(), nullable=True),
+    sa.Column('last_message_role', sa.String(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['thread_id'], ['thread.id'], ),
+    sa.PrimaryKeyConstraint('thread_id')
+    )
+    op.add_column('thread', sa.Column('archived_at', sa.DateTime(), nullable=True))
+    # ### end Alembic commands ###
+    # Archives are zlib compressed already, TOAST compression would only cost CPU
+    op.execute('ALTER TABLE thread_archive ALTER COLUMN messages SET STORAGE EXTERNAL')
+
+
+def downgrade() -> None:
+    # Archives are zlib compressed, which Postgres cannot read; they are restored by the application
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM thread_archive) THEN
+                RAISE EXCEPTION 'Restore archived threads before downgrading';
+            END IF;
+        END
+        $$
+    """)
+    op.drop_column('thread', 'archived_at')
+    op.drop_table('thread_archive')
+
+    # Rebuilt the same way as on upgrade, copying all messages back in batches
+    create_message_table('message_unpartitioned', ['id'], unique_id=True)
+    copy_messages('message_unpartitioned')
+    replace_message_table('message_unpartitioned', unique_id=True)
@@ -0,0 +1,41 @@
+"""Touch thread on message insert
+
+Revision ID: 2b8f4e6a0c17
+Revises: 7e3a9c5d1b64
+Create Date: 2026-10-19 20:47:21.556093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8f4e6a0c17'
+down_revision: Union[str, None] = '7e3a9c5d1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Statement-level, so a batch of messages updates each of its threads once
+    op.execute("""
+        CREATE OR REPLACE FUNCTION touch_thread_updated_at() RETURNS trigger AS $$
+        BEGIN
+            UPDATE thread SET updated_at = now()
+            WHERE id IN (SELECT DISTINCT thread_id FROM new_messages);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER message_touch_thread
+        AFTER INSERT ON message
+        REFERENCING NEW TABLE AS new_messages
+        FOR EACH STATEMENT EXECUTE FUNCTION touch_thread_updated_at()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS message_touch_thread ON message')
+    op.execute('DROP FUNCTION IF EXISTS touch_thread_updated_at()')
@@ -0,0 +1,27 @@
+"""Store missing tool calls as NULL
+
+Revision ID: 9e3b5d7f1a24
+Revises: 4a9c7e2d1b56
+Create Date: 2026-10-20 14:06:51.274390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3b5d7f1a24'
+down_revision: Union[str, None] = '4a9c7e2d1b56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Messages without tool calls were stored as JSON null, which `tool_calls IS NULL` does not match
+    op.execute("UPDATE message SET tool_calls = NULL WHERE tool_calls = 'null'::jsonb")
+
+
+def downgrade() -> None:
+    # SQL NULL is read back as None like JSON null, nothing to restore
+    pass
@@ -1,5 +0,0 @@
-from .message_events import register_message_events
-
-
-def register_events():
-    register_message_events()
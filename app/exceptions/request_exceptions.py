@@ -18,3 +18,7 @@ class EntryAlreadyExistsException(BadRequestException):
 
 class InvalidEventException(BadRequestException):
     message_pattern = ('Invalid event: {0}', 'event')
+
+
+class InvalidCursorException(BadRequestException):
+    message_pattern = ('Invalid pagination cursor.',)
@@ -0,0 +1,105 @@
+from typing import Callable
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, trim_messages
+from langgraph.graph.graph import CompiledGraph
+
+from app.inference.routing import ModelRoute
+from app.services.binance import BinanceService
+
+
+def with_recent_history(prompt: str, max_messages: int) -> Callable[[dict], list[BaseMessage]]:
+    """State modifier sending the system prompt and only the latest `max_messages` messages of the conversation."""
+    def modifier(state: dict) -> list[BaseMessage]:
+        recent = trim_messages(
+            state['messages'],
+            strategy='last',
+            token_counter=len,
+            max_tokens=max_messages,
+            start_on='human',
+        )
+        return [SystemMessage(content=prompt), *recent]
+    return modifier
+
+
+def split_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Messages of `AgentModel.complete` grouped by turn, each starting with its question."""
+    turns = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+class AgentModel:
+    """Common run logic of the chat and analyzer agents, subclasses build `model` and `agent_executor`."""
+
+    agent_executor: CompiledGraph
+    route: ModelRoute
+
+    @staticmethod
+    def _config(binance_service: BinanceService | None, run_key: str | None, thread_id: str | None) -> dict:
+        run_key = run_key or str(uuid4())
+        configurable = {'binance_service': binance_service, 'run_key': run_key}
+        if thread_id:
+            configurable['thread_id'] = str(thread_id)
+        # Saved with every checkpoint, so an interrupted run is finished under the key it started with
+        return {'configurable': configurable, 'metadata': {'run_key': run_key}}
+
+    @staticmethod
+    def _is_final(message: BaseMessage) -> bool:
+        return isinstance(message, AIMessage) and not message.tool_calls
+
+    async def run(
+        self,
+        messages: list,
+        binance_service: BinanceService | None = None,
+        run_key: str | None = None,
+        thread_id: str | None = None,
+        stream: bool = False
+    ) -> str:
+        if stream:
+            pass
+
+        response = await self.complete(messages, binance_service=binance_service, run_key=run_key, thread_id=thread_id)
+        return response[-1].content
+
+    async def complete(
+        self,
+        messages: list,
+        binance_service: BinanceService | None = None,
+        run_key: str | None = None,
+        thread_id: str | None = None,
+        history: list[BaseMessage] | None = None,
+    ) -> list[BaseMessage]:
+        """
+        Run the agent and return the messages added by this run, including the input.
+        With a checkpointer the conversation state of `thread_id` is restored, so only new messages are sent;
+        `history` is used to seed conversations that have no checkpoint yet.
+        A run interrupted before its final answer is finished first, under its own run key,
+        and its turn is returned ahead of this one from its question on (see `split_turns`).
+        """
+        config = self._config(binance_service, run_key, thread_id)
+        resumed: list[BaseMessage] = []
+        known = 0
+        if self.agent_executor.checkpointer:
+            # Read the checkpoint directly, `aget_state` also inspects every node for subgraphs
+            checkpoint = await self.agent_executor.checkpointer.aget_tuple(config)
+            saved = checkpoint.checkpoint['channel_values'].get('messages', []) if checkpoint else []
+            known = len(saved)
+            if saved and not self._is_final(saved[-1]):
+                start = max((i for i, message in enumerate(saved) if isinstance(message, HumanMessage)), default=0)
+                resume_config = self._config(binance_service, checkpoint.metadata.get('run_key'), thread_id)
+                state = await self.agent_executor.ainvoke(None, config=resume_config)
+                resumed = state['messages'][start:]
+                known = len(state['messages'])
+            elif not known and history:
+                messages = [*history, *messages]
+                known = len(history)
+        elif history:
+            messages = [*history, *messages]
+            known = len(history)
+
+        response = await self.agent_executor.ainvoke({'messages': messages}, config=config)
+        return [*resumed, *response['messages'][known:]]
@@ -1,18 +1,25 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import BaseMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 
+from app.inference.agent import AgentModel, with_recent_history
+from app.inference.analyzer.prompts import prompt
 from app.inference.analyzer.tools import toolkit
+from app.inference.checkpoint import checkpointer as default_checkpointer
+from app.inference.routing import ModelRoute, create_chat_model
+from app.inference.tool_node import BoundedToolNode
+from app.utils.rate_limiter import RequestPriority
 
+# Earlier analyses of a bot are kept in its checkpoint, only the most recent messages are sent to the model
+HISTORY_MESSAGES = 40
 
-class AnalyzerModel:
-    def __init__(self):
-        self.model = ChatOpenAI(model='gpt-4o-mini')
-        self.agent_executor = create_react_agent(self.model, toolkit)
 
-    def run(self, messages: list[BaseMessage], stream: bool = False) -> str:
-        if stream:
-            pass
-
-        response = self.agent_executor.invoke({'messages': messages})
-        return response.content
+class AnalyzerModel(AgentModel):
+    def __init__(self, checkpointer: BaseCheckpointSaver | None = default_checkpointer):
+        self.route = ModelRoute.ANALYSIS
+        self.model = create_chat_model(self.route, priority=RequestPriority.BOT)
+        self.agent_executor = create_react_agent(
+            self.model,
+            BoundedToolNode(toolkit),
+            state_modifier=with_recent_history(prompt, HISTORY_MESSAGES),
+            checkpointer=checkpointer,
+        )
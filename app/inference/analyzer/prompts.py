@@ -1,4 +1,10 @@
 prompt = """\
 ## Objective
 You are an AI analyzer, who's main task is to make good decisions and trade crypto assets of the user.
-"""
\ No newline at end of file
+"""
+
+bot_prompt = """\
+## Task
+Analyze the market and manage positions for the following tickers: {tickers}.
+Risk tolerance is {risk_tolerance} out of 100, target profit is {target_profit}%.
+"""
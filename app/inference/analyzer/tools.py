@@ -1,8 +1,12 @@
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 
+from app.inference.context import get_binance_service, get_idempotency_key
+from app.services.orders import order_gateway
+
 
 @tool
-def place_order(symbol: str, side: str, order_type: str, quantity: float, price: float = None, stop_price: float = None, time_in_force: str = 'GTC'):
+async def place_order(symbol: str, side: str, order_type: str, quantity: float, config: RunnableConfig, price: float = None, stop_price: float = None, time_in_force: str = 'GTC'):
     """
     Places an order on Binance based on the provided parameters.
 
@@ -22,25 +26,20 @@ def place_order(symbol: str, side: str, order_type: str, quantity: float, price:
         place_order('BTCUSDT', 'BUY', 'LIMIT', 0.001, price=30000, time_in_force='GTC')
         place_order('ETHUSDT', 'SELL', 'MARKET', 0.5)
     """
-    order_params = {
-        'symbol': symbol,
-        'side': side,
-        'type': order_type,
-        'quantity': quantity,
-        'timeInForce': time_in_force
-    }
-
-    if price is not None:
-        order_params['price'] = price
-
-    if stop_price is not None:
-        order_params['stopPrice'] = stop_price
-
-    # Example API call (You need to replace with actual Binance API request)
-    # response = client.new_order(**order_params)
-    response = {"status": "order placed"}  # Placeholder for actual API call
-
-    return response
+    try:
+        return await order_gateway.place_order(
+            get_binance_service(config),
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=price,
+            stop_price=stop_price,
+            time_in_force=time_in_force,
+            idempotency_key=get_idempotency_key(config),
+        )
+    except Exception as e:
+        return {"error": str(e)}
 
 @tool
 def check_balance(asset: str):
@@ -107,7 +106,7 @@ def get_open_orders(symbol: str = None):
     return response
 
 @tool
-def cancel_order(symbol: str, order_id: int):
+async def cancel_order(symbol: str, order_id: int, config: RunnableConfig):
     """
     Cancels an open order by order ID for a specified trading pair.
 
@@ -121,11 +120,10 @@ def cancel_order(symbol: str, order_id: int):
     Example:
         cancel_order('BTCUSDT', 12345)
     """
-    # Example API call (Replace with actual Binance API call)
-    # response = client.cancel_order(symbol=symbol, orderId=order_id)
-    response = {"status": "order canceled", "orderId": order_id}  # Placeholder for actual API response
-
-    return response
+    try:
+        return await get_binance_service(config).cancel_order(symbol, order_id)
+    except Exception as e:
+        return {"error": str(e)}
 
 @tool
 def check_order_status(symbol: str, order_id: int):
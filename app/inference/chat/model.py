@@ -1,17 +1,29 @@
-from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 
+from app.inference.agent import AgentModel, with_recent_history
+from app.inference.checkpoint import checkpointer as default_checkpointer
+from app.inference.chat.prompts import prompt
 from app.inference.chat.tools import toolkit
+from app.inference.routing import ModelRoute, create_chat_model
+from app.inference.tool_node import BoundedToolNode
+from app.settings import settings
+from app.utils.rate_limiter import RequestPriority
 
 
-class ChatModel:
-    def __init__(self):
-        self.model = ChatOpenAI(model='gpt-4o-mini')
-        self.agent_executor = create_react_agent(self.model, toolkit)
-
-    def run(self, messages: list, stream: bool = False) -> str:
-        if stream:
-            pass
-
-        response = self.agent_executor.invoke({'messages': messages})
-        return response['messages'][-1].content
+class ChatModel(AgentModel):
+    def __init__(
+        self,
+        route: ModelRoute = ModelRoute.CHAT,
+        checkpointer: BaseCheckpointSaver | None = default_checkpointer,
+    ):
+        self.route = route
+        self.model = create_chat_model(route, priority=RequestPriority.INTERACTIVE)
+        # Static system prompt and tools come first, so every turn shares the provider-cached prompt prefix.
+        # The checkpoint keeps the whole thread, only its latest messages are sent to the model
+        self.agent_executor = create_react_agent(
+            self.model,
+            BoundedToolNode(toolkit),
+            state_modifier=with_recent_history(prompt, settings.llm.CHAT_HISTORY_MESSAGES),
+            checkpointer=checkpointer,
+        )
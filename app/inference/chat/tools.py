@@ -1,22 +1,51 @@
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from binance.client import Client
-from app.settings import settings
 
-# client = Client(
-#     api_key=settings.binance.BINANCE_API_KEY,
-#     api_secret=settings.binance.BINANCE_API_SECRET,
-# )
+from app.inference.context import get_binance_service, get_idempotency_key
+from app.inference.memo import MemoScope, tool_memo
+from app.services.orders import order_gateway
 
-test_client = Client(
-    api_key=settings.binance.TESTNET_BINANCE_API_KEY,
-    api_secret=settings.binance.TESTNET_BINANCE_API_SECRET,
-    testnet=True
-)
+# Seconds a read is reused by further tool calls, writes of the account drop them earlier
+ACCOUNT_DATA_TTL = 10
+PRICE_TTL = 2
+OPEN_ORDERS_TTL = 30
+ORDER_STATUS_TTL = 5
+RECENT_TRADES_TTL = 30
+
+
+@tool_memo.memoize(ttl=ACCOUNT_DATA_TTL, scope=MemoScope.ACCOUNT)
+async def fetch_account_data(config: RunnableConfig):
+    return await get_binance_service(config).get_account_data()
+
+
+@tool_memo.memoize(ttl=PRICE_TTL, scope=MemoScope.GLOBAL)
+async def fetch_symbol_ticker(config: RunnableConfig, symbol: str):
+    return await get_binance_service(config).get_symbol_ticker(symbol)
+
+
+@tool_memo.memoize(ttl=PRICE_TTL, scope=MemoScope.GLOBAL)
+async def fetch_symbol_tickers(config: RunnableConfig, symbols: tuple[str, ...]):
+    return await get_binance_service(config).get_symbol_tickers(list(symbols))
+
+
+@tool_memo.memoize(ttl=OPEN_ORDERS_TTL, scope=MemoScope.RUN)
+async def fetch_open_orders(config: RunnableConfig, symbol: str | None):
+    return await get_binance_service(config).get_open_orders(symbol)
+
+
+@tool_memo.memoize(ttl=ORDER_STATUS_TTL, scope=MemoScope.RUN)
+async def fetch_order(config: RunnableConfig, symbol: str, order_id: int):
+    return await get_binance_service(config).get_order(symbol, order_id)
+
+
+@tool_memo.memoize(ttl=RECENT_TRADES_TTL, scope=MemoScope.RUN)
+async def fetch_all_orders(config: RunnableConfig, symbol: str, limit: int):
+    return await get_binance_service(config).get_all_orders(symbol, limit=limit)
 
 
 @tool
-def place_order(symbol: str, side: str, order_type: str, quantity: float, price: float = None, stop_price: float = None,
-                time_in_force: str = 'GTC'):
+async def place_order(symbol: str, side: str, order_type: str, quantity: float, config: RunnableConfig,
+                      price: float = None, stop_price: float = None, time_in_force: str = 'GTC'):
     """
     Places an order on Binance based on the provided parameters.
 
@@ -37,25 +66,25 @@ def place_order(symbol: str, side: str, order_type: str, quantity: float, price:
         place_order('ETHUSDT', 'SELL', 'MARKET', 0.5)
     """
     try:
-        order_params = {
-            'symbol': symbol,
-            'side': side,
-            'type': order_type,
-            'quantity': quantity,
-            'timeInForce': time_in_force if order_type == 'LIMIT' else None,
-            'price': price,
-            'stopPrice': stop_price
-        }
-        order_params = {k: v for k, v in order_params.items() if v is not None}
-
-        response = test_client.create_order(**order_params)
-        return response
+        return await order_gateway.place_order(
+            get_binance_service(config),
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=price,
+            stop_price=stop_price,
+            time_in_force=time_in_force,
+            idempotency_key=get_idempotency_key(config),
+        )
     except Exception as e:
         return {"error": str(e)}
+    finally:
+        tool_memo.invalidate(config)
 
 
 @tool
-def check_balance(asset: str):
+async def check_balance(asset: str, config: RunnableConfig):
     """
     Retrieves the account balance for a specific asset.
 
@@ -68,15 +97,16 @@ def check_balance(asset: str):
     Example:
         check_balance('BTC')
     """
-    # Example API call to get account balances (Replace with actual Binance API call)
-    print('GET ASSET BALANCE TOOL CALL')
-    response = test_client.get_account()
-    balances = response['balances']
-    return next((item for item in balances if item["asset"] == asset), None)
+    try:
+        response = await fetch_account_data(config)
+        balances = response['balances']
+        return next((item for item in balances if item["asset"] == asset.upper()), None)
+    except Exception as e:
+        return {"error": str(e)}
 
 
 @tool
-def get_latest_price(symbol: str):
+async def get_latest_price(symbol: str, config: RunnableConfig):
     """
     Retrieves the latest market price for a specified trading pair.
 
@@ -90,14 +120,35 @@ def get_latest_price(symbol: str):
         get_latest_price('BTCUSDT')
     """
     try:
-        response = test_client.get_symbol_ticker(symbol=symbol)
+        response = await fetch_symbol_ticker(config, symbol.upper())
         return response
     except Exception as e:
         return {"error": str(e)}
 
 
 @tool
-def get_open_orders(symbol: str = None):
+async def get_latest_prices(symbols: list[str], config: RunnableConfig):
+    """
+    Retrieves the latest market prices for several trading pairs with a single request.
+    Prefer it over repeated get_latest_price calls when more than one price is needed.
+
+    Args:
+        symbols (list[str]): The trading pair symbols (e.g., ['BTCUSDT', 'ETHUSDT']).
+
+    Returns:
+        list: Dictionaries with the symbol and its current market price.
+
+    Example:
+        get_latest_prices(['BTCUSDT', 'ETHUSDT', 'BNBUSDT'])
+    """
+    try:
+        return await fetch_symbol_tickers(config, tuple(sorted({symbol.upper() for symbol in symbols})))
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@tool
+async def get_open_orders(config: RunnableConfig, symbol: str = None):
     """
     Retrieves open orders for a specific symbol or all open orders if no symbol is provided.
 
@@ -112,14 +163,14 @@ def get_open_orders(symbol: str = None):
         get_open_orders()
     """
     try:
-        response = test_client.get_open_orders(symbol=symbol)
+        response = await fetch_open_orders(config, symbol.upper() if symbol else None)
         return response
     except Exception as e:
         return {"error": str(e)}
 
 
 @tool
-def cancel_order(symbol: str, order_id: int):
+async def cancel_order(symbol: str, order_id: int, config: RunnableConfig):
     """
     Cancels an open order by order ID for a specified trading pair.
 
@@ -134,14 +185,16 @@ def cancel_order(symbol: str, order_id: int):
         cancel_order('BTCUSDT', 12345)
     """
     try:
-        response = test_client.cancel_order(symbol=symbol, orderId=order_id)
+        response = await get_binance_service(config).cancel_order(symbol, order_id)
         return response
     except Exception as e:
         return {"error": str(e)}
+    finally:
+        tool_memo.invalidate(config)
 
 
 @tool
-def check_order_status(symbol: str, order_id: int):
+async def check_order_status(symbol: str, order_id: int, config: RunnableConfig):
     """
     Retrieves the status of a specific order by order ID for a given trading pair.
 
@@ -156,14 +209,14 @@ def check_order_status(symbol: str, order_id: int):
         check_order_status('BTCUSDT', 12345)
     """
     try:
-        response = test_client.get_order(symbol=symbol, orderId=order_id)
+        response = await fetch_order(config, symbol.upper(), order_id)
         return response
     except Exception as e:
         return {"error": str(e)}
 
 
 @tool
-def get_recent_trades(symbol: str, limit: int = 10):
+async def get_recent_trades(symbol: str, config: RunnableConfig, limit: int = 10):
     """
     Retrieves the most recent trades for a specific trading pair.
 
@@ -178,18 +231,84 @@ def get_recent_trades(symbol: str, limit: int = 10):
         get_recent_trades('BTCUSDT', limit=5)
     """
     try:
-        response = test_client.get_all_orders(symbol=symbol, limit=limit)
+        response = await fetch_all_orders(config, symbol.upper(), limit)
         return response
     except Exception as e:
         return {"error": str(e)}
 
 
+@tool
+async def cancel_orders(symbol: str, config: RunnableConfig, order_ids: list[int] = None):
+    """
+    Cancels several open orders of a trading pair at once.
+
+    Args:
+        symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+        order_ids (list[int], optional): IDs of the orders to cancel. Defaults to None, which cancels all open orders of the symbol.
+
+    Returns:
+        list: Details about each canceled order, or error messages for orders that could not be canceled.
+
+    Example:
+        cancel_orders('BTCUSDT', [12345, 12346])
+        cancel_orders('BTCUSDT')
+    """
+    try:
+        return await order_gateway.cancel_orders(get_binance_service(config), symbol, order_ids)
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        tool_memo.invalidate(config)
+
+
+@tool
+async def replace_order(symbol: str, order_id: int, side: str, order_type: str, quantity: float, config: RunnableConfig,
+                        price: float = None, time_in_force: str = 'GTC'):
+    """
+    Atomically cancels an open order and places a new one instead, e.g. to move a limit price.
+
+    Args:
+        symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
+        order_id (int): The ID of the order to replace.
+        side (str): The new order side, either 'BUY' or 'SELL'.
+        order_type (str): The type of the new order (e.g., 'LIMIT', 'MARKET').
+        quantity (float): The quantity of the new order.
+        price (float, optional): The price of the new limit order.
+        time_in_force (str, optional): Order time policy of the new order. Defaults to 'GTC'.
+
+    Returns:
+        dict: The cancel and new order responses from the Binance API, or an error message if it failed.
+
+    Example:
+        replace_order('BTCUSDT', 12345, 'BUY', 'LIMIT', 0.001, price=29000)
+    """
+    try:
+        return await order_gateway.replace_order(
+            get_binance_service(config),
+            symbol=symbol,
+            cancel_order_id=order_id,
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=price,
+            time_in_force=time_in_force,
+            idempotency_key=get_idempotency_key(config),
+        )
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        tool_memo.invalidate(config)
+
+
 toolkit = [
     place_order,
     check_balance,
     get_open_orders,
     get_latest_price,
+    get_latest_prices,
     cancel_order,
+    cancel_orders,
+    replace_order,
     check_order_status,
     get_recent_trades
 ]
@@ -0,0 +1,146 @@
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.serde.types import TASKS
+
+from app.models import AgentCheckpoint
+from app.utils.unitofwork import UnitOfWork
+
+
+class PostgresCheckpointSaver(BaseCheckpointSaver):
+    """
+    Async LangGraph checkpointer on the application database (asyncpg through SQLAlchemy),
+    so agents do not need a second driver and connection pool.
+    Only the latest checkpoint of a conversation and its parent are kept, older ones are pruned on write.
+    """
+
+    @staticmethod
+    def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+    async def _to_tuple(self, unit_of_work, row: AgentCheckpoint) -> CheckpointTuple:
+        writes = await unit_of_work.checkpoints.get_writes(row.thread_id, row.checkpoint_ns, row.checkpoint_id)
+        sends = []
+        if row.parent_checkpoint_id:
+            parent_writes = await unit_of_work.checkpoints.get_writes(
+                row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id
+            )
+            sends = [self.serde.loads_typed((write.type, write.value)) for write in parent_writes if write.channel == TASKS]
+
+        return CheckpointTuple(
+            config=self._config(row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+            checkpoint={**self.serde.loads_typed((row.type, row.checkpoint)), "pending_sends": sends},
+            metadata=self.serde.loads_typed((row.metadata_type, row.checkpoint_metadata)),
+            parent_config=(
+                self._config(row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id)
+                if row.parent_checkpoint_id else None
+            ),
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.type, write.value))) for write in writes
+            ],
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        async with UnitOfWork() as unit_of_work:
+            row = await unit_of_work.checkpoints.get_checkpoint(
+                configurable["thread_id"], configurable.get("checkpoint_ns", ""), get_checkpoint_id(config)
+            )
+            return await self._to_tuple(unit_of_work, row) if row else None
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        configurable = (config or {}).get("configurable", {})
+        async with UnitOfWork() as unit_of_work:
+            rows = await unit_of_work.checkpoints.list_checkpoints(
+                thread_id=configurable.get("thread_id"),
+                checkpoint_ns=configurable.get("checkpoint_ns"),
+                before=get_checkpoint_id(before) if before else None,
+                limit=None if filter else limit,
+            )
+            tuples = [await self._to_tuple(unit_of_work, row) for row in rows]
+
+        if filter:
+            tuples = [item for item in tuples if all(item.metadata.get(k) == v for k, v in filter.items())][:limit]
+        for item in tuples:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        parent_checkpoint_id = configurable.get("checkpoint_id")
+
+        checkpoint = {key: value for key, value in checkpoint.items() if key != "pending_sends"}
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(metadata)
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.checkpoints.upsert(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=parent_checkpoint_id,
+                type=checkpoint_type,
+                checkpoint=checkpoint_data,
+                metadata_type=metadata_type,
+                checkpoint_metadata=metadata_data,
+            )
+            if parent_checkpoint_id:
+                # The parent stays, its TASKS writes are the pending sends of the new checkpoint
+                await unit_of_work.checkpoints.prune(thread_id, checkpoint_ns, before=parent_checkpoint_id)
+        return self._config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+    ) -> None:
+        if not writes:
+            return
+        configurable = config["configurable"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, value_data = self.serde.dumps_typed(value)
+            rows.append({
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": configurable["checkpoint_id"],
+                "task_id": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+                "channel": channel,
+                "type": value_type,
+                "value": value_data,
+            })
+        async with UnitOfWork() as unit_of_work:
+            # Special writes (errors, interrupts) replace earlier ones, regular writes are written once
+            await unit_of_work.checkpoints.put_writes(rows, overwrite=all(channel in WRITES_IDX_MAP for channel, _ in writes))
+
+    @staticmethod
+    async def adelete_thread(thread_id: str):
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.checkpoints.delete_thread(thread_id)
+
+
+checkpointer = PostgresCheckpointSaver()
@@ -0,0 +1,33 @@
+from contextvars import ContextVar
+
+from langchain_core.runnables import RunnableConfig
+
+from app.services.binance import BinanceService
+
+# Tools whose calls place orders, numbered within a turn by `BoundedToolNode`
+ORDER_TOOLS = ('place_order', 'replace_order')
+order_sequence: ContextVar[int | None] = ContextVar('order_sequence', default=None)
+
+
+class NoBinanceAccount(Exception):
+    def __str__(self):
+        return 'No Binance account is connected. Ask the user to add one in the account settings.'
+
+
+def get_binance_service(config: RunnableConfig) -> BinanceService:
+    """Binance service of the account the agent acts on, passed in `configurable`."""
+    service = config.get('configurable', {}).get('binance_service')
+    if service is None:
+        raise NoBinanceAccount()
+    return service
+
+
+def get_idempotency_key(config: RunnableConfig) -> str | None:
+    """
+    Identifier of an order call: the key of the agent turn, which survives retries of the turn,
+    and the position of the call among order calls of the turn, so deliberately repeated orders stay distinct.
+    """
+    run_key, sequence = config.get('configurable', {}).get('run_key'), order_sequence.get()
+    if run_key is None or sequence is None:
+        return run_key
+    return f'{run_key}:{sequence}'
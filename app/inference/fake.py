@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+from typing import Any, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from app.inference.gateway import CHARS_PER_TOKEN, llm_gateway
+from app.utils.rate_limiter import RequestPriority
+
+# Arguments of tool calls, by parameter name and then by JSON schema type
+ARGUMENTS_BY_NAME = {
+    'symbol': 'BTCUSDT',
+    'symbols': ['BTCUSDT', 'ETHUSDT'],
+    'asset': 'BTC',
+    'side': 'BUY',
+    'order_type': 'MARKET',
+    'time_in_force': 'GTC',
+}
+ARGUMENTS_BY_TYPE = {'string': 'BTCUSDT', 'number': 0.001, 'integer': 1, 'boolean': False, 'array': ['BTCUSDT']}
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic offline chat model for benchmarks and development without OpenAI.
+    After a user message it calls `tool_calls` tools (those bound to the agent) in one step, then answers
+    with a text derived from the prompt. Calls still go through `llm_gateway`, with simulated latency and usage.
+    """
+
+    model_name: str = 'fake'
+    latency: float = 0
+    tool_calls: List[str] = []
+    priority: RequestPriority = RequestPriority.INTERACTIVE
+
+    @property
+    def _llm_type(self) -> str:
+        return 'fake-chat'
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    @staticmethod
+    def _arguments(parameters: dict) -> dict:
+        properties = parameters.get('properties', {})
+        return {
+            name: ARGUMENTS_BY_NAME.get(name, ARGUMENTS_BY_TYPE.get(properties[name].get('type'), ''))
+            for name in parameters.get('required', [])
+        }
+
+    def _respond(self, messages: List[BaseMessage], tools: list[dict]) -> AIMessage:
+        last_human = max((i for i, message in enumerate(messages) if isinstance(message, HumanMessage)), default=-1)
+        prompt = str(messages[last_human].content) if last_human >= 0 else ''
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        answered = messages[last_human + 1:]
+
+        functions = {tool['function']['name']: tool['function'] for tool in tools}
+        calls = [name for name in self.tool_calls if name in functions]
+        if calls and not any(isinstance(message, AIMessage) for message in answered):
+            response = AIMessage(content='', tool_calls=[
+                {'name': name, 'args': self._arguments(functions[name].get('parameters', {})), 'id': f'call_{digest[:12]}_{i}'}
+                for i, name in enumerate(calls)
+            ])
+        else:
+            results = sum(isinstance(message, ToolMessage) for message in answered)
+            content = f'Answer {digest[:8]} to "{prompt[:80]}"'
+            if results:
+                content += f', based on {results} tool results'
+            response = AIMessage(content=content + '.')
+
+        input_tokens = sum(len(str(message.content)) for message in messages) // CHARS_PER_TOKEN
+        output_tokens = max(len(str(response.content)) // CHARS_PER_TOKEN, 1)
+        response.usage_metadata = {
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'total_tokens': input_tokens + output_tokens,
+        }
+        return response
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._respond(messages, kwargs.get('tools', []))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        async def respond() -> AIMessage:
+            await asyncio.sleep(self.latency)
+            return self._respond(messages, kwargs.get('tools', []))
+
+        reserved = sum(len(str(message.content)) for message in messages) // CHARS_PER_TOKEN
+        message = await llm_gateway.call(respond, tokens=reserved, model=self.model_name, priority=self.priority)
+        llm_gateway.limiter.reconcile(reserved, message.usage_metadata['total_tokens'], self.model_name)
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,173 @@
+import functools
+import json
+from typing import Any, Awaitable, Callable, List, Optional
+
+import openai
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from langchain_openai import ChatOpenAI
+from loguru import logger
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from app.settings import settings
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpen
+from app.utils.rate_limiter import RequestPriority, TokenBudgetLimiter
+
+CHARS_PER_TOKEN = 4
+DEFAULT_COMPLETION_TOKENS = 1024
+
+# Failures that say nothing about the request itself, worth retrying and counted by the circuit breaker
+TRANSIENT_ERRORS = (openai.APIConnectionError, openai.InternalServerError)
+
+
+class LLMUnavailable(Exception):
+    """The provider kept rate limiting or failing, the call was given up and may be retried later."""
+
+    def __init__(self, retry_after: float):
+        super().__init__('Language model is temporarily unavailable')
+        self.retry_after = retry_after
+
+
+def _is_retryable(e: BaseException) -> bool:
+    if isinstance(e, openai.RateLimitError):
+        # Exhausted quota does not recover by waiting
+        return e.code != 'insufficient_quota'
+    return isinstance(e, TRANSIENT_ERRORS)
+
+
+def _retry_after(e: BaseException) -> float | None:
+    response = getattr(e, 'response', None)
+    if response is None:
+        return None
+    try:
+        if 'retry-after-ms' in response.headers:
+            return float(response.headers['retry-after-ms']) / 1000
+        if 'retry-after' in response.headers:
+            return float(response.headers['retry-after'])
+    except ValueError:
+        pass
+    return None
+
+
+class LLMGateway:
+    """
+    Single path of all chat completions of the process.
+    Calls wait for the tokens and requests per minute budget in priority order, so interactive chat is served
+    before bot analyses; transient failures are retried with jittered exponential backoff, and after repeated
+    provider errors the circuit opens and calls fail fast with `LLMUnavailable`.
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute: int,
+        requests_per_minute: int,
+        max_attempts: int,
+        max_backoff: float,
+        failure_threshold: int,
+        reset_timeout: float,
+    ):
+        self.limiter = TokenBudgetLimiter(tokens_per_minute, requests_per_minute)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.retries = 0
+        self.given_up = 0
+
+    def _before_sleep(self, retry_state: RetryCallState):
+        self.retries += 1
+        logger.warning(
+            'LLM call failed (attempt {attempt}), retrying in {sleep:.1f}s: {e}',
+            attempt=retry_state.attempt_number,
+            sleep=retry_state.next_action.sleep,
+            e=str(retry_state.outcome.exception()),
+        )
+
+    async def call(self, func: Callable[[], Awaitable[Any]], tokens: int, model: str, priority: RequestPriority) -> Any:
+        """Run `func` within the budget of `model`, reserving `tokens`; the caller reconciles them with the actual usage."""
+        retrying = AsyncRetrying(
+            retry=retry_if_exception(_is_retryable),
+            wait=wait_random_exponential(multiplier=0.5, max=self.max_backoff),
+            stop=stop_after_attempt(self.max_attempts),
+            before_sleep=self._before_sleep,
+            reraise=True,
+        )
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    return await self._attempt(func, tokens, model, priority)
+        except CircuitOpen as e:
+            self.given_up += 1
+            raise LLMUnavailable(e.retry_after) from e
+        except Exception as e:
+            if not _is_retryable(e):
+                raise
+            self.given_up += 1
+            raise LLMUnavailable(_retry_after(e) or self.breaker.reset_timeout) from e
+
+    async def _attempt(self, func: Callable[[], Awaitable[Any]], tokens: int, model: str, priority: RequestPriority) -> Any:
+        self.breaker.before_call()
+        await self.limiter.acquire(tokens, model, priority)
+        try:
+            result = await func()
+        except openai.RateLimitError as e:
+            self.limiter.penalize(_retry_after(e), model)
+            raise
+        except TRANSIENT_ERRORS:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def stats(self) -> dict:
+        return {
+            'limiter': self.limiter.stats(),
+            'circuit': self.breaker.stats(),
+            'retries': self.retries,
+            'given_up': self.given_up,
+        }
+
+
+llm_gateway = LLMGateway(
+    tokens_per_minute=settings.llm.TOKENS_PER_MINUTE,
+    requests_per_minute=settings.llm.REQUESTS_PER_MINUTE,
+    max_attempts=settings.llm.MAX_ATTEMPTS,
+    max_backoff=settings.llm.MAX_BACKOFF,
+    failure_threshold=settings.llm.CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.llm.CIRCUIT_RESET_TIMEOUT,
+)
+
+
+class GatewayChatOpenAI(ChatOpenAI):
+    """ChatOpenAI sending its requests through `llm_gateway`, which owns retries instead of the OpenAI client."""
+
+    priority: RequestPriority = RequestPriority.INTERACTIVE
+    max_retries: int = 0
+    include_response_headers: bool = True
+
+    def _estimate_tokens(self, messages: List[BaseMessage], **kwargs) -> int:
+        characters = sum(len(str(message.content)) + len(json.dumps(message.additional_kwargs, default=str)) for message in messages)
+        characters += len(json.dumps(kwargs.get('tools', []), default=str))
+        return characters // CHARS_PER_TOKEN + (self.max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        reserved = self._estimate_tokens(messages, **kwargs)
+        result: ChatResult = await llm_gateway.call(
+            functools.partial(super()._agenerate, messages, stop=stop, run_manager=run_manager, **kwargs),
+            tokens=reserved,
+            model=self.model_name,
+            priority=self.priority,
+        )
+
+        token_usage = (result.llm_output or {}).get('token_usage') or {}
+        llm_gateway.limiter.reconcile(reserved, token_usage.get('total_tokens', reserved), self.model_name)
+        for generation in result.generations:
+            # Headers feed the limiter, they are not kept in message metadata stored with checkpoints
+            llm_gateway.limiter.observe((generation.generation_info or {}).pop('headers', None), self.model_name)
+        return result
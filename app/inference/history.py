@@ -0,0 +1,55 @@
+import json
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from app.models import Message
+
+# Tool results are compacted once, when stored, so that replayed history is byte-identical on every turn
+# and stays within the provider's cached prompt prefix
+TOOL_RESULT_MAX_CHARS = 2000
+
+
+def compact_tool_result(content) -> str:
+    if not isinstance(content, str):
+        content = json.dumps(content, separators=(',', ':'), default=str)
+    else:
+        try:
+            content = json.dumps(json.loads(content), separators=(',', ':'))
+        except ValueError:
+            pass
+    if len(content) > TOOL_RESULT_MAX_CHARS:
+        content = content[:TOOL_RESULT_MAX_CHARS] + '...[truncated]'
+    return content
+
+
+def to_chat_messages(messages: list[Message]) -> list[BaseMessage]:
+    """Thread history as model input, including earlier tool calls and their results."""
+    history = []
+    for message in messages:
+        if message.role == 'tool':
+            history.append(ToolMessage(content=message.content, tool_call_id=message.tool_call_id))
+        elif message.role == 'assistant':
+            history.append(AIMessage(content=message.content, tool_calls=message.tool_calls or []))
+        else:
+            history.append(HumanMessage(content=message.content))
+    return history
+
+
+def from_chat_messages(messages: list[BaseMessage]) -> list[dict]:
+    """Rows of `message` for the questions, assistant and tool messages of agent runs."""
+    rows = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            rows.append({"role": 'user', "content": message.content})
+        elif isinstance(message, ToolMessage):
+            rows.append({
+                "role": 'tool',
+                "content": compact_tool_result(message.content),
+                "tool_call_id": message.tool_call_id,
+            })
+        elif isinstance(message, AIMessage):
+            tool_calls = [
+                {"id": call['id'], "name": call['name'], "args": call['args']} for call in message.tool_calls
+            ]
+            rows.append({"role": 'assistant', "content": message.content, "tool_calls": tool_calls or None})
+    return rows
@@ -0,0 +1,102 @@
+import asyncio
+import functools
+from collections import defaultdict
+from enum import Enum
+from typing import Awaitable, Callable, Hashable
+
+from langchain_core.runnables import RunnableConfig
+
+from app.settings import settings
+from app.utils.cache import TTLCache
+
+_MISSING = object()
+
+
+class MemoScope(Enum):
+    RUN = 'run'          # Shared by tool calls of one agent turn
+    ACCOUNT = 'account'  # Shared by all runs on the same Binance account
+    GLOBAL = 'global'    # Shared by everybody, for public market data
+
+
+class ToolMemo:
+    """
+    Memoization of read-only Binance calls made by agent tools.
+    Concurrent identical calls share one request, and the results are kept for a per-tool TTL within their scope.
+    Write tools call `invalidate`, which drops cached reads of the account.
+    """
+
+    def __init__(self, maxsize: int, enabled: bool = True):
+        self.enabled = enabled
+        self._results = TTLCache(maxsize, ttl=60)
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self._generations: dict[Hashable, int] = defaultdict(int)
+        self.shared = 0
+
+    @staticmethod
+    def _configurable(config: RunnableConfig) -> dict:
+        return config.get('configurable', {})
+
+    def _key(self, config: RunnableConfig, scope: MemoScope, name: str, args: tuple) -> Hashable:
+        service = self._configurable(config).get('binance_service')
+        if scope == MemoScope.GLOBAL:
+            # Testnet prices are unrelated to the live exchange
+            return scope, service.client.testnet if service else None, name, args
+        account_id = service.account_id if service else None
+        # Account generation changes after every write, so previously cached reads are never served again
+        key = (scope, account_id, self._generations[account_id], name, args)
+        if scope == MemoScope.RUN:
+            key = (self._configurable(config).get('run_key'), *key)
+        return key
+
+    def invalidate(self, config: RunnableConfig):
+        service = self._configurable(config).get('binance_service')
+        self._generations[service.account_id if service else None] += 1
+
+    async def call(
+        self,
+        config: RunnableConfig,
+        name: str,
+        args: tuple,
+        func: Callable[[], Awaitable],
+        ttl: float,
+        scope: MemoScope,
+    ):
+        if not self.enabled:
+            return await func()
+
+        key = self._key(config, scope, name, args)
+        result = self._results.get(key, _MISSING)
+        if result is not _MISSING:
+            return result
+        if key in self._pending:
+            self.shared += 1
+            return await asyncio.shield(self._pending[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await func()
+            self._results.set(key, result, ttl=ttl)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else awaits it
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    def memoize(self, ttl: float, scope: MemoScope = MemoScope.RUN):
+        """Decorate `async def fetch(config, *args)` so that its results are shared within `scope` for `ttl` seconds."""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(config: RunnableConfig, *args):
+                return await self.call(config, func.__name__, args, lambda: func(config, *args), ttl, scope)
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        return {**self._results.stats(), 'shared_in_flight': self.shared}
+
+
+tool_memo = ToolMemo(settings.cache.TOOL_CACHE_SIZE, enabled=settings.cache.TOOL_CACHE_ENABLED)
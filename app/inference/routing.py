@@ -0,0 +1,64 @@
+import re
+from enum import Enum
+
+from langchain_core.language_models import BaseChatModel
+
+from app.inference.fake import FakeChatModel
+from app.inference.gateway import GatewayChatOpenAI
+from app.settings import settings
+from app.utils.rate_limiter import RequestPriority
+
+LOOKUP_MAX_WORDS = 25
+
+LOOKUP_PATTERN = re.compile(
+    r'\b(balances?|prices?|worth|how much|how many|holdings?|portfolio|open orders?|order status|tickers?|rate)\b',
+    re.IGNORECASE,
+)
+# Advice, reasoning and anything that may place or cancel orders needs the stronger model
+REASONING_PATTERN = re.compile(
+    r'\b(why|should|analy[sz]\w*|strateg\w*|predict\w*|forecast\w*|recommend\w*|compare|explain|risk\w*|plan\w*'
+    r'|buy|sell|trade|cancel\w*|replace|place|order \w+ at)\b',
+    re.IGNORECASE,
+)
+
+
+class ModelRoute(str, Enum):
+    LOOKUP = 'lookup'      # Balance, price and order lookups, answered from a tool call or two
+    CHAT = 'chat'          # Conversation, advice and order placement
+    ANALYSIS = 'analysis'  # Trading bot analyses
+
+
+def route_prompt(content: str) -> ModelRoute:
+    """Short data lookups go to the fast model, everything else to the default one."""
+    if len(content.split()) <= LOOKUP_MAX_WORDS and LOOKUP_PATTERN.search(content) and not REASONING_PATTERN.search(content):
+        return ModelRoute.LOOKUP
+    return ModelRoute.CHAT
+
+
+def model_name(route: ModelRoute) -> str:
+    if not settings.llm.ROUTING_ENABLED:
+        return settings.llm.MODEL
+    return {
+        ModelRoute.LOOKUP: settings.llm.FAST_MODEL,
+        ModelRoute.CHAT: settings.llm.MODEL,
+        ModelRoute.ANALYSIS: settings.llm.ANALYSIS_MODEL or settings.llm.MODEL,
+    }[route]
+
+
+def create_chat_model(route: ModelRoute, priority: RequestPriority) -> BaseChatModel:
+    if settings.llm.PROVIDER == 'fake':
+        return FakeChatModel(
+            model_name=f'fake-{model_name(route)}',
+            latency=settings.llm.FAKE_LATENCY,
+            tool_calls=[name.strip() for name in settings.llm.FAKE_TOOL_CALLS.split(',') if name.strip()],
+            priority=priority,
+        )
+    return GatewayChatOpenAI(
+        model=model_name(route),
+        temperature=settings.llm.TEMPERATURE,
+        max_tokens=settings.llm.MAX_TOKENS,
+        top_p=settings.llm.TOP_P,
+        frequency_penalty=settings.llm.FREQUENCY_PENALTY,
+        presence_penalty=settings.llm.PRESENCE_PENALTY,
+        priority=priority,
+    )
@@ -0,0 +1,54 @@
+import asyncio
+from contextvars import ContextVar
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.prebuilt import ToolNode
+
+from app.inference.context import ORDER_TOOLS, order_sequence
+from app.settings import settings
+
+_step_semaphore: ContextVar[asyncio.Semaphore | None] = ContextVar('step_semaphore', default=None)
+_step_order_sequences: ContextVar[dict[str, int]] = ContextVar('step_order_sequences', default={})
+
+
+def _order_sequences(messages: list[BaseMessage]) -> dict[str, int]:
+    """Position of every order call among the order calls of the current turn, by tool call id."""
+    start = max((i for i, message in enumerate(messages) if isinstance(message, HumanMessage)), default=-1)
+    calls = [
+        call['id']
+        for message in messages[start + 1:] if isinstance(message, AIMessage)
+        for call in message.tool_calls if call['name'] in ORDER_TOOLS
+    ]
+    return {call_id: sequence for sequence, call_id in enumerate(calls, 1)}
+
+
+class BoundedToolNode(ToolNode):
+    """
+    ToolNode running the tool calls of one model step concurrently, at most `concurrency` at a time,
+    so a step asking for many symbols does not flood Binance.
+    Order calls are numbered in message order, which a retried or resumed turn reproduces, for their idempotency keys.
+    """
+
+    def __init__(self, tools, *, concurrency: int = settings.llm.TOOL_CONCURRENCY, **kwargs):
+        super().__init__(tools, **kwargs)
+        self.concurrency = concurrency
+
+    async def _afunc(self, input, config, *, store):
+        # The node is shared by concurrent agent runs, so the semaphore lives in the context of this step
+        token = _step_semaphore.set(asyncio.Semaphore(self.concurrency))
+        messages = input if isinstance(input, list) else input.get(self.messages_key, [])
+        sequences_token = _step_order_sequences.set(_order_sequences(messages))
+        try:
+            return await super()._afunc(input, config, store=store)
+        finally:
+            _step_order_sequences.reset(sequences_token)
+            _step_semaphore.reset(token)
+
+    async def _arun_one(self, call, input_type, config):
+        # Every call runs in its own task, so the sequence is visible to its tool only
+        order_sequence.set(_step_order_sequences.get().get(call['id']))
+        semaphore = _step_semaphore.get()
+        if semaphore is None:
+            return await super()._arun_one(call, input_type, config)
+        async with semaphore:
+            return await super()._arun_one(call, input_type, config)
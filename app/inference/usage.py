@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICES = {
+    'gpt-4o-mini': (Decimal('0.15'), Decimal('0.075'), Decimal('0.60')),
+    'gpt-4o': (Decimal('2.50'), Decimal('1.25'), Decimal('10.00')),
+}
+MILLION = Decimal(1_000_000)
+
+
+def estimate_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> Decimal:
+    prices = next((prices for name, prices in MODEL_PRICES.items() if model.startswith(name)), None)
+    if prices is None:
+        return Decimal(0)
+    input_price, cached_price, output_price = prices
+    cost = (prompt_tokens - cached_tokens) * input_price + cached_tokens * cached_price
+    return (cost + completion_tokens * output_price) / MILLION
+
+
+def summarize_usage(messages: list[BaseMessage], model: str, latency: float) -> dict:
+    """Token usage of the model calls of one agent run, summed from `usage_metadata` of generated messages."""
+    prompt_tokens = cached_tokens = completion_tokens = calls = tool_rounds = 0
+    for message in messages:
+        if not isinstance(message, AIMessage) or not message.usage_metadata:
+            continue
+        usage = message.usage_metadata
+        calls += 1
+        tool_rounds += bool(message.tool_calls)
+        prompt_tokens += usage.get('input_tokens', 0)
+        completion_tokens += usage.get('output_tokens', 0)
+        cached_tokens += usage.get('input_token_details', {}).get('cache_read', 0) or 0
+
+    return {
+        'model': model,
+        'calls': calls,
+        'tool_rounds': tool_rounds,
+        'prompt_tokens': prompt_tokens,
+        'cached_tokens': cached_tokens,
+        'completion_tokens': completion_tokens,
+        'latency_ms': int(latency * 1000),
+        'cost': estimate_cost(model, prompt_tokens, cached_tokens, completion_tokens),
+    }
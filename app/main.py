@@ -10,20 +10,42 @@ from fastapi_healthz import (
 from app.middlewares.context import RequestMiddleware
 from app.settings import settings
 from app.database import engine
-from app.events import register_events
+from app.services.binance import binance_clients
+from app.services.exchange_info import exchange_info
+from app.services.response_cache import response_cache_purger
+from app.services.trading_bots import bot_activity_recorder
+from app.services.usage import usage_recorder
+from app.tasks import balance_snapshotter
 from app.routers import (
     threads,
     auth,
     users,
-    binance, binance_accounts
+    binance, binance_accounts,
+    metrics,
+    jobs,
+    trading_bots,
+    usage,
 )
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     logger.info('Start application')
+    await exchange_info.start()
+    await usage_recorder.start()
+    await bot_activity_recorder.start()
+    if settings.binance.SNAPSHOT_ENABLED:
+        await balance_snapshotter.start()
+    if settings.CACHING_ENABLED and settings.cache.RESPONSE_CACHE_BACKEND == 'postgres':
+        await response_cache_purger.start()
     yield
     logger.info('Stop application')
+    await balance_snapshotter.stop()
+    await response_cache_purger.stop()
+    await bot_activity_recorder.stop()
+    await usage_recorder.stop()
+    await exchange_info.stop()
+    await binance_clients.close()
     await engine.dispose()
 
 
@@ -33,7 +55,6 @@ def create_application() -> FastAPI:
         title=settings.app_name,
         version=settings.version
     )
-    register_events()
     _healthChecks = HealthCheckRegistry()
     db_sync_uri = settings.database.url.replace("+asyncpg", "")
 
@@ -44,6 +65,10 @@ def create_application() -> FastAPI:
     app.include_router(threads)
     app.include_router(binance)
     app.include_router(binance_accounts)
+    app.include_router(jobs)
+    app.include_router(trading_bots)
+    app.include_router(usage)
+    app.include_router(metrics)
     app.add_api_route('/health', endpoint=health_check_route(registry=_healthChecks))
 
     app.add_middleware(
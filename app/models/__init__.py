@@ -1,7 +1,13 @@
 from .base import Base
-from .threads import Message, Thread
+from .threads import Message, Thread, ThreadArchive
 from .users import User, OAuthAccount, BinanceAccount
-from .trading_bots import TradingBot
+from .trading_bots import TradingBot, BotActivity
+from .balances import BalanceSnapshot
+from .jobs import Job, JobKind, JobStatus
+from .cache import CachedResponse
+from .usage import LLMUsage
+from .checkpoints import AgentCheckpoint, AgentCheckpointWrite
+from .performance import BotPerformance, BotPerformanceDaily
 
 __all__ = (
     'Base',
@@ -10,5 +16,17 @@ __all__ = (
     'BinanceAccount',
     'Thread',
     'Message',
-    'TradingBot'
+    'ThreadArchive',
+    'TradingBot',
+    'BotActivity',
+    'BalanceSnapshot',
+    'Job',
+    'JobKind',
+    'JobStatus',
+    'CachedResponse',
+    'LLMUsage',
+    'AgentCheckpoint',
+    'AgentCheckpointWrite',
+    'BotPerformance',
+    'BotPerformanceDaily',
 )
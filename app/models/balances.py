@@ -0,0 +1,53 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class BalanceSnapshot(Base):
+    __tablename__ = 'balance_snapshot'
+    __table_args__ = (
+        Index('ix_balance_snapshot_account_id_created_at', 'binance_account_id', 'created_at'),
+        Index('ix_balance_snapshot_created_at', 'created_at'),  # Retention deletes
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    binance_account_id: Mapped[UUID] = mapped_column(
+        ForeignKey('binance_account.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), default=func.now())
+    update_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)  # Binance `updateTime` in ms
+    balances: Mapped[dict] = mapped_column(JSONB, nullable=False)  # Non-zero balances only: {asset: [free, locked]}
+    prices: Mapped[dict | None] = mapped_column(JSONB, nullable=True)  # USDT price of held assets: {asset: price}
+    coin_names: Mapped[dict | None] = mapped_column(JSONB, nullable=True)  # {asset: name}
+
+    @staticmethod
+    def compact_balances(balances: list[dict]) -> dict:
+        """Keep only non-zero balances in `{asset: [free, locked]}` form."""
+        return {
+            item['asset']: [item['free'], item['locked']]
+            for item in balances
+            if float(item['free']) or float(item['locked'])
+        }
+
+    @staticmethod
+    def asset_prices(balances: dict, tickers: list[dict]) -> dict:
+        """USDT prices of the assets in compact `balances`, from `get_all_tickers`."""
+        prices = {ticker['symbol']: ticker['price'] for ticker in tickers}
+        return {asset: prices[f'{asset}USDT'] for asset in balances if f'{asset}USDT' in prices}
+
+    def as_account_data(self) -> dict:
+        """Expand snapshot into the shape returned by Binance `get_account`."""
+        return {
+            'updateTime': self.update_time,
+            'snapshotAt': self.created_at.isoformat() if self.created_at else None,
+            'balances': [
+                {'asset': asset, 'free': free, 'locked': locked}
+                for asset, (free, locked) in self.balances.items()
+            ],
+        }
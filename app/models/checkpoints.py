@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class AgentCheckpoint(Base):
+    """LangGraph checkpoint of an agent conversation: a chat thread or a trading bot."""
+
+    __tablename__ = 'agent_checkpoint'
+
+    thread_id: Mapped[str] = mapped_column(String, primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(String, primary_key=True, default='')
+    checkpoint_id: Mapped[str] = mapped_column(String, primary_key=True)  # uuid6, sortable by creation time
+    parent_checkpoint_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    type: Mapped[str] = mapped_column(String, nullable=False)
+    checkpoint: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    metadata_type: Mapped[str] = mapped_column(String, nullable=False)
+    checkpoint_metadata: Mapped[bytes] = mapped_column('metadata', LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), default=func.now())
+
+
+class AgentCheckpointWrite(Base):
+    """Pending write of a task, used to resume a run interrupted between checkpoints."""
+
+    __tablename__ = 'agent_checkpoint_write'
+
+    thread_id: Mapped[str] = mapped_column(String, primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(String, primary_key=True, default='')
+    checkpoint_id: Mapped[str] = mapped_column(String, primary_key=True)
+    task_id: Mapped[str] = mapped_column(String, primary_key=True)
+    idx: Mapped[int] = mapped_column(Integer, primary_key=True)
+    channel: Mapped[str] = mapped_column(String, nullable=False)
+    type: Mapped[str] = mapped_column(String, nullable=False)
+    value: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
@@ -0,0 +1,57 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+from uuid import UUID, uuid4
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class JobStatus(PyEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobKind(PyEnum):
+    CHAT_TURN = "chat_turn"
+    BOT_ANALYSIS = "bot_analysis"
+    THREAD_DELETE = "thread_delete"
+
+
+class Job(Base):
+    __tablename__ = 'job'
+    __table_args__ = (
+        # Only queued jobs are scanned by workers, keep that index small
+        Index('ix_job_queued', 'priority', 'run_after', postgresql_where=text("status = 'QUEUED'")),
+        # At most one pending job per dedupe key, e.g. one analysis per bot
+        Index(
+            'ix_job_dedupe_key',
+            'kind', 'dedupe_key',
+            unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING') AND dedupe_key IS NOT NULL"),
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    kind: Mapped[JobKind] = mapped_column(Enum(JobKind), nullable=False)
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Lower runs first
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    dedupe_key: Mapped[str | None] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    locked_by: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    user_id: Mapped[UUID | None] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), nullable=True, index=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), default=func.now())
+    run_after: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), default=func.now())
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # Refreshed while running
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
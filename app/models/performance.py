@@ -0,0 +1,106 @@
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+MONEY = Numeric(28, 8)
+
+
+class BotPerformance(Base):
+    """
+    Running performance of a bot, folded from its BUY and SELL activity, which is then flagged `folded`.
+    Amounts are in the quote asset of the traded symbols; P&L is realized against the average cost of the position.
+    """
+
+    __tablename__ = 'bot_performance'
+
+    bot_id: Mapped[UUID] = mapped_column(ForeignKey('trading_bot.id', ondelete='CASCADE'), primary_key=True)
+    positions: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)  # {symbol: [quantity, cost]}
+    trades: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    closed_trades: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Sells of a tracked position
+    winning_trades: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    volume: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    fees: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    realized_pnl: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    closed_cost: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)  # Cost of the quantity sold
+    peak_pnl: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    max_drawdown: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def apply_fill(self, side: str, symbol: str, quantity: Decimal, quote_quantity: Decimal, commission: Decimal) -> dict:
+        """Fold one executed order into the running totals and return its contribution to the daily rollup."""
+        positions = dict(self.positions or {})
+        held, cost = (Decimal(value) for value in positions.get(symbol, ('0', '0')))
+        pnl, closed_cost, closed = -commission, Decimal(0), False
+
+        if side == 'BUY':
+            held, cost = held + quantity, cost + quote_quantity
+        elif held > 0:
+            # Quantity sold beyond the tracked position was bought before the bot and has no known cost
+            sold = min(quantity, held)
+            closed_cost = cost * sold / held
+            pnl += quote_quantity * sold / quantity - closed_cost
+            held, cost, closed = held - sold, cost - closed_cost, True
+
+        if held > 0:
+            positions[symbol] = [str(held), str(cost)]
+        else:
+            positions.pop(symbol, None)
+        self.positions = positions
+
+        won = closed and pnl > 0
+        self.trades += 1
+        self.closed_trades += int(closed)
+        self.winning_trades += int(won)
+        self.volume += quote_quantity
+        self.fees += commission
+        self.realized_pnl += pnl
+        self.closed_cost += closed_cost
+        self.peak_pnl = max(self.peak_pnl, self.realized_pnl)
+        self.max_drawdown = max(self.max_drawdown, self.drawdown)
+        return {
+            'trades': 1,
+            'closed_trades': int(closed),
+            'winning_trades': int(won),
+            'volume': quote_quantity,
+            'fees': commission,
+            'realized_pnl': pnl,
+            'closed_cost': closed_cost,
+        }
+
+    @property
+    def drawdown(self) -> Decimal:
+        """Distance of the realized P&L below its peak."""
+        return self.peak_pnl - self.realized_pnl
+
+    @property
+    def win_rate(self) -> float | None:
+        return self.winning_trades / self.closed_trades if self.closed_trades else None
+
+    @property
+    def return_pct(self) -> float | None:
+        """Realized P&L relative to the cost of the positions it was realized on, comparable to `target_profit`."""
+        return float(self.realized_pnl / self.closed_cost * 100) if self.closed_cost else None
+
+
+class BotPerformanceDaily(Base):
+    """Daily rollup of a bot performance, incremented as fills are folded into `BotPerformance`."""
+
+    __tablename__ = 'bot_performance_daily'
+
+    bot_id: Mapped[UUID] = mapped_column(ForeignKey('trading_bot.id', ondelete='CASCADE'), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    trades: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    closed_trades: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    winning_trades: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    volume: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    fees: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    realized_pnl: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    closed_cost: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)
+    cumulative_pnl: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)  # At the end of the day
+    max_drawdown: Mapped[Decimal] = mapped_column(MONEY, nullable=False, default=0)  # Deepest below the peak that day
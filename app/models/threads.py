@@ -1,17 +1,28 @@
+import json
+import zlib
 from datetime import datetime
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    Computed,
     DateTime,
     ForeignKey,
+    Integer,
+    LargeBinary,
     Text,
     func,
     Enum,
+    String,
+    Index,
 )
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
 
+# Text search configuration of `Message.search_vector`, queries must use the same one to hit its index
+SEARCH_CONFIG = 'english'
+
 
 class Thread(Base):
     __tablename__ = 'thread'
@@ -19,6 +30,7 @@ class Thread(Base):
     id: Mapped[UUID] = mapped_column(primary_key=True, unique=True, default=uuid4, index=True)
     title: Mapped[str] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), default=func.now())
+    # Also set by the `message_touch_thread` trigger whenever messages are added
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
         server_default=func.now(),
@@ -26,26 +38,101 @@ class Thread(Base):
         onupdate=func.now(),
         index=True
     )
+    # Set while the messages are kept in `thread_archive`
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Set on threads hidden from their user while a job deletes their messages
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     user_id: Mapped[UUID] = mapped_column(ForeignKey('user.id'))
 
-    messages: Mapped[list['Message']] = relationship(back_populates='thread', order_by='asc(Message.created_at)')
+    messages: Mapped[list['Message']] = relationship(
+        back_populates='thread', order_by='asc(Message.created_at)', passive_deletes=True
+    )
     user: Mapped['User'] = relationship(back_populates='threads')
 
 
 class Message(Base):
     __tablename__ = 'message'
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, unique=True, default=uuid4, index=True)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     role: Mapped[str] = mapped_column(
         Enum("user", "assistant", "tool", name="chat_role_enum", create_type=False),
         default='user'
     )
     content: Mapped[str] = mapped_column(Text)
+    # Calls requested by an assistant message. None is stored as SQL NULL rather than JSON null,
+    # so that `tool_calls IS NULL` finds the messages shown to the user
+    tool_calls: Mapped[list | None] = mapped_column(JSONB(none_as_null=True), nullable=True)
+    tool_call_id: Mapped[str | None] = mapped_column(String, nullable=True)  # Call answered by a tool message
     created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), default=func.now(), index=True)
+    # Maintained by Postgres from `content`, deferred as only search queries read it
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', coalesce(content, ''))", persisted=True),
+        deferred=True,
+    )
 
-    thread_id: Mapped[UUID] = mapped_column(ForeignKey('thread.id'))
+    # Part of the primary key, as the table is partitioned by hash of the thread
+    thread_id: Mapped[UUID] = mapped_column(ForeignKey('thread.id', ondelete='CASCADE'), primary_key=True)
 
     thread: Mapped['Thread'] = relationship('Thread', back_populates='messages')
 
+    __table_args__ = (
+        # Serves reads of a thread's messages in order, including its latest one
+        Index('ix_message_thread_id_created_at', 'thread_id', 'created_at'),
+        Index('ix_message_search_vector', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_message_content_trgm', 'content',
+            postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'},
+        ),
+        {'postgresql_partition_by': 'HASH (thread_id)'},
+    )
+
+    def to_archive(self) -> dict:
+        return {
+            'id': str(self.id),
+            'role': self.role,
+            'content': self.content,
+            'tool_calls': self.tool_calls,
+            'tool_call_id': self.tool_call_id,
+            'created_at': self.created_at.isoformat(),
+        }
+
+    @classmethod
+    def from_archive(cls, data: dict, thread_id: UUID) -> 'Message':
+        return cls(
+            id=UUID(data['id']),
+            role=data['role'],
+            content=data['content'],
+            tool_calls=data['tool_calls'],
+            tool_call_id=data['tool_call_id'],
+            created_at=datetime.fromisoformat(data['created_at']),
+            thread_id=thread_id,
+        )
+
+
+class ThreadArchive(Base):
+    """
+    Messages of a thread inactive for a long time, moved out of `message` into one zlib compressed JSON document.
+    The last visible message and their count are kept uncompressed for thread previews.
+    """
+
+    __tablename__ = 'thread_archive'
+
+    thread_id: Mapped[UUID] = mapped_column(ForeignKey('thread.id', ondelete='CASCADE'), primary_key=True)
+    messages: Mapped[bytes] = mapped_column(LargeBinary, deferred=True)
+    message_count: Mapped[int] = mapped_column(Integer)  # User and assistant messages
+    last_message_content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_message_role: Mapped[str | None] = mapped_column(String, nullable=True)
+    last_message_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    @staticmethod
+    def compress(messages: list[Message]) -> bytes:
+        data = json.dumps([message.to_archive() for message in messages], separators=(',', ':'))
+        return zlib.compress(data.encode(), level=9)
+
+    def decompress(self) -> list[Message]:
+        return [Message.from_archive(data, self.thread_id) for data in json.loads(zlib.decompress(self.messages))]
+
 
@@ -1,12 +1,15 @@
 from uuid import UUID, uuid4
 
-from sqlalchemy import Integer, String, Boolean, ForeignKey, Text, DateTime
+from sqlalchemy import BigInteger, Integer, String, Boolean, ForeignKey, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from datetime import datetime
 from sqlalchemy.types import ARRAY
 
 from app.models.base import Base
 
+FILL_ACTIVITY_TYPES = ('BUY', 'SELL')
+
 
 class TradingBot(Base):
     __tablename__ = 'trading_bot'
@@ -26,16 +29,31 @@ class TradingBot(Base):
 
     user = relationship("User", back_populates="bots")
     binance_account = relationship("BinanceAccount", back_populates="bots")
-    activities = relationship("BotActivity", back_populates="bot", cascade="all, delete-orphan")
+    # Deleted with the bot by ON DELETE CASCADE, without loading the log
+    activities = relationship("BotActivity", back_populates="bot", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class BotActivity(Base):
-    __tablename__ = 'bot_activity'
+    """Append-only log of bot runs and decisions, written in batches by `bot_activity_recorder`; only `folded` changes."""
 
-    id = mapped_column(Integer, primary_key=True, index=True)
-    bot_id: Mapped[UUID] = mapped_column(ForeignKey('trading_bot.id'), nullable=False)
-    timestamp = mapped_column(DateTime, default=datetime.utcnow)
+    __tablename__ = 'bot_activity'
+    __table_args__ = (
+        # Activity of one bot in a time range, newest first
+        Index('ix_bot_activity_bot_id_timestamp', 'bot_id', 'timestamp'),
+        # Rows are appended in time order, so a tiny BRIN index serves time ranges across all bots
+        Index('ix_bot_activity_timestamp_brin', 'timestamp', postgresql_using='brin'),
+        # Fills not yet folded into `bot_performance`, the index shrinks as they are folded
+        Index(
+            'ix_bot_activity_bot_id_id_unfolded', 'bot_id', 'id',
+            postgresql_where=text("activity_type IN ('BUY', 'SELL') AND NOT folded"),
+        ),
+    )
+
+    id = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    bot_id: Mapped[UUID] = mapped_column(ForeignKey('trading_bot.id', ondelete='CASCADE'), nullable=False)
+    timestamp = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     activity_type = mapped_column(String, nullable=False)  # E.g., "BUY", "SELL", "ANALYSIS"
-    details = mapped_column(Text, nullable=True)  # Logs or additional details
+    details = mapped_column(JSONB, nullable=True)  # Structured decision, e.g. {"content": ..., "tool_calls": [...]}
+    folded = mapped_column(Boolean, default=False, server_default=text('false'), nullable=False)  # Into bot_performance
 
     bot = relationship("TradingBot", back_populates="activities")
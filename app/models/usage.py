@@ -0,0 +1,36 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LLMUsage(Base):
+    """Token usage of one agent run: a chat turn or a trading bot analysis."""
+
+    __tablename__ = 'llm_usage'
+    __table_args__ = (
+        Index('ix_llm_usage_user_id_created_at', 'user_id', 'created_at'),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[UUID] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    thread_id: Mapped[UUID | None] = mapped_column(ForeignKey('thread.id', ondelete='SET NULL'), nullable=True, index=True)
+    trading_bot_id: Mapped[UUID | None] = mapped_column(
+        ForeignKey('trading_bot.id', ondelete='SET NULL'),
+        nullable=True,
+        index=True
+    )
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    route: Mapped[str | None] = mapped_column(String, nullable=True)  # ModelRoute the model was picked for
+    calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tool_rounds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cached_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cost: Mapped[Decimal] = mapped_column(Numeric(12, 6), nullable=False, default=0)  # Estimated, USD
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), default=func.now())
@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTableUUID, SQLAlchemyBaseOAuthAccountTableUUID
 from uuid import UUID, uuid4
 
-from sqlalchemy import String, Enum, Boolean, ForeignKey
+from sqlalchemy import String, Enum, Boolean, ForeignKey, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from enum import Enum as PyEnum
 
@@ -37,8 +37,11 @@ class BinanceAccount(Base):
 class User(SQLAlchemyBaseUserTableUUID, Base):
     full_name: Mapped[str] = mapped_column(String(50), nullable=True)
     avatar: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    daily_token_budget: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Overrides the default budget
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')  # Bumped on password change
 
-    oauth_accounts: Mapped[list[OAuthAccount]] = relationship("OAuthAccount", lazy="joined")
+    # Only needed by OAuth login, authenticated requests do not load it
+    oauth_accounts: Mapped[list[OAuthAccount]] = relationship("OAuthAccount", lazy="selectin")
     binance_accounts: Mapped[list[BinanceAccount]] = relationship(back_populates='user')
     threads: Mapped[list['Thread']] = relationship(back_populates='user')
     bots: Mapped[list['TradingBot']] = relationship(back_populates='user')
@@ -1,11 +1,25 @@
-from .threads import MessageRepository, ThreadRepository
+from .threads import MessageRepository, ThreadRepository, ThreadArchiveRepository
 from .users import UserRepository, BinanceAccountRepository
-from .trading_bots import TradingBotRepository
+from .trading_bots import TradingBotRepository, BotActivityRepository
+from .balances import BalanceSnapshotRepository
+from .jobs import JobRepository
+from .cache import CachedResponseRepository
+from .usage import LLMUsageRepository
+from .checkpoints import AgentCheckpointRepository
+from .performance import BotPerformanceRepository
 
 __all__ = (
     'UserRepository',
     'BinanceAccountRepository',
     'ThreadRepository',
     'MessageRepository',
+    'ThreadArchiveRepository',
     'TradingBotRepository',
+    'BotActivityRepository',
+    'BalanceSnapshotRepository',
+    'JobRepository',
+    'CachedResponseRepository',
+    'LLMUsageRepository',
+    'AgentCheckpointRepository',
+    'BotPerformanceRepository',
 )
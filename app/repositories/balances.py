@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from sqlalchemy import Result, delete, func, insert, select
+
+from app.models import BalanceSnapshot
+from app.utils.repository import SQLAlchemyRepository
+
+
+class BalanceSnapshotRepository(SQLAlchemyRepository):
+    model = BalanceSnapshot
+    default_order_by = '-created_at'
+
+    async def bulk_create(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        await self.execute(insert(self.model), rows)
+
+    async def get_latest(self, binance_account_id, max_age: timedelta | None = None) -> BalanceSnapshot | None:
+        """Latest snapshot of the account, None if there is none taken within `max_age`."""
+        statement = select(self.model).where(self.model.binance_account_id == binance_account_id)
+        if max_age is not None:
+            statement = statement.where(self.model.created_at >= func.now() - max_age)
+        statement = statement.order_by(self.model.created_at.desc()).limit(1)
+        result: Result = await self.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def purge_older_than(self, age: timedelta) -> int:
+        result: Result = await self.execute(delete(self.model).where(self.model.created_at < func.now() - age))
+        return result.rowcount
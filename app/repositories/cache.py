@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from sqlalchemy import Result, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import CachedResponse
+from app.utils.repository import SQLAlchemyRepository
+
+
+class CachedResponseRepository(SQLAlchemyRepository):
+    model = CachedResponse
+    default_order_by = '-created_at'
+
+    async def get_response(self, key: str) -> str | None:
+        statement = select(self.model.response).where(self.model.key == key, self.model.expires_at > func.now())
+        result: Result = await self.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def upsert(self, key: str, scope: str, prompt: str, response: str, ttl: float):
+        expires_at = func.now() + timedelta(seconds=ttl)
+        statement = (
+            insert(self.model)
+            .values(key=key, scope=scope, prompt=prompt, response=response, expires_at=expires_at)
+            .on_conflict_do_update(
+                index_elements=[self.model.key],
+                set_={'response': response, 'created_at': func.now(), 'expires_at': expires_at},
+            )
+        )
+        await self.execute(statement)
+
+    async def purge_expired(self) -> int:
+        result: Result = await self.execute(delete(self.model).where(self.model.expires_at <= func.now()))
+        return result.rowcount
@@ -0,0 +1,100 @@
+from sqlalchemy import Result, String, any_, delete, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from app.models import AgentCheckpoint, AgentCheckpointWrite
+from app.utils.repository import SQLAlchemyRepository
+
+
+class AgentCheckpointRepository(SQLAlchemyRepository):
+    model = AgentCheckpoint
+    default_order_by = '-checkpoint_id'
+
+    async def get_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str | None = None):
+        """Given checkpoint, or the latest one of the thread."""
+        statement = select(self.model).where(
+            self.model.thread_id == thread_id,
+            self.model.checkpoint_ns == checkpoint_ns,
+        )
+        if checkpoint_id:
+            statement = statement.where(self.model.checkpoint_id == checkpoint_id)
+        statement = statement.order_by(self.model.checkpoint_id.desc()).limit(1)
+        result: Result = await self.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def list_checkpoints(
+        self,
+        thread_id: str | None = None,
+        checkpoint_ns: str | None = None,
+        before: str | None = None,
+        limit: int | None = None,
+    ) -> list[AgentCheckpoint]:
+        statement = select(self.model).order_by(self.model.checkpoint_id.desc())
+        if thread_id is not None:
+            statement = statement.where(self.model.thread_id == thread_id)
+        if checkpoint_ns is not None:
+            statement = statement.where(self.model.checkpoint_ns == checkpoint_ns)
+        if before:
+            statement = statement.where(self.model.checkpoint_id < before)
+        if limit:
+            statement = statement.limit(limit)
+        result: Result = await self.execute(statement)
+        return list(result.scalars())
+
+    async def upsert(self, **values):
+        statement = insert(self.model).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.model.thread_id, self.model.checkpoint_ns, self.model.checkpoint_id],
+            set_={
+                'type': statement.excluded.type,
+                'checkpoint': statement.excluded.checkpoint,
+                'metadata_type': statement.excluded.metadata_type,
+                'metadata': statement.excluded['metadata'],
+            },
+        )
+        await self.execute(statement)
+
+    async def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> list[AgentCheckpointWrite]:
+        statement = (
+            select(AgentCheckpointWrite)
+            .where(
+                AgentCheckpointWrite.thread_id == thread_id,
+                AgentCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                AgentCheckpointWrite.checkpoint_id == checkpoint_id,
+            )
+            .order_by(AgentCheckpointWrite.task_id, AgentCheckpointWrite.idx)
+        )
+        result: Result = await self.execute(statement)
+        return list(result.scalars())
+
+    async def put_writes(self, rows: list[dict], overwrite: bool):
+        statement = insert(AgentCheckpointWrite).values(rows)
+        if overwrite:
+            statement = statement.on_conflict_do_update(
+                index_elements=['thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'],
+                set_={
+                    'channel': statement.excluded.channel,
+                    'type': statement.excluded.type,
+                    'value': statement.excluded.value,
+                },
+            )
+        else:
+            statement = statement.on_conflict_do_nothing()
+        await self.execute(statement)
+
+    async def prune(self, thread_id: str, checkpoint_ns: str, before: str):
+        """Drop checkpoints and writes older than `before`."""
+        for model in (self.model, AgentCheckpointWrite):
+            await self.execute(
+                delete(model).where(
+                    model.thread_id == thread_id,
+                    model.checkpoint_ns == checkpoint_ns,
+                    model.checkpoint_id < before,
+                )
+            )
+
+    async def delete_thread(self, thread_id: str):
+        await self.delete_threads([thread_id])
+
+    async def delete_threads(self, thread_ids: list[str]):
+        for model in (self.model, AgentCheckpointWrite):
+            await self.execute(delete(model).where(model.thread_id == any_(literal(thread_ids, ARRAY(String)))))
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from sqlalchemy import Result, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import Job, JobKind, JobStatus
+from app.utils.repository import SQLAlchemyRepository
+
+
+class JobRepository(SQLAlchemyRepository):
+    model = Job
+    default_order_by = '-created_at'
+
+    async def enqueue(self, kind: JobKind, payload: dict, priority: int = 0, **kwargs) -> Job | None:
+        """Insert a queued job; returns None when a pending job with the same `dedupe_key` already exists."""
+        statement = (
+            insert(self.model)
+            .values(kind=kind, payload=payload, priority=priority, **kwargs)
+            .on_conflict_do_nothing()
+            .returning(self.model)
+        )
+        result: Result = await self.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def claim(self, worker_id: str, limit: int, kinds: list[JobKind] | None = None) -> list[Job]:
+        """Lock up to `limit` due jobs for this worker; rows locked by other workers are skipped, not awaited."""
+        candidates = (
+            select(self.model.id)
+            .where(self.model.status == JobStatus.QUEUED, self.model.run_after <= func.now())
+            .order_by(self.model.priority, self.model.run_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if kinds:
+            candidates = candidates.where(self.model.kind.in_(kinds))
+
+        statement = (
+            update(self.model)
+            .where(self.model.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                started_at=func.now(),
+                heartbeat_at=func.now(),
+                attempts=self.model.attempts + 1,
+                locked_by=worker_id,
+            )
+            .returning(self.model)
+        )
+        result: Result = await self.execute(statement)
+        return list(result.scalars())
+
+    async def complete(self, job_id, result: dict | None):
+        await self.update(
+            {'status': JobStatus.DONE, 'result': result, 'error': None, 'finished_at': func.now()},
+            pk=job_id,
+        )
+
+    async def fail(self, job: Job, error: str, retry_in: float):
+        """Requeue with a delay while attempts are left, otherwise mark as failed."""
+        if job.attempts < job.max_attempts:
+            data = {'status': JobStatus.QUEUED, 'error': error, 'run_after': func.now() + timedelta(seconds=retry_in)}
+        else:
+            data = {'status': JobStatus.FAILED, 'error': error, 'finished_at': func.now()}
+        await self.update(data, pk=job.id)
+
+    async def heartbeat(self, worker_id: str, job_ids: list) -> None:
+        """Mark jobs as still being worked on by this worker."""
+        if not job_ids:
+            return
+        statement = (
+            update(self.model)
+            .where(
+                self.model.id.in_(job_ids),
+                self.model.status == JobStatus.RUNNING,
+                self.model.locked_by == worker_id,
+            )
+            .values(heartbeat_at=func.now())
+        )
+        await self.execute(statement)
+
+    async def requeue_stale(self, timeout: float) -> tuple[int, int]:
+        """
+        Return jobs of crashed workers, without a heartbeat for `timeout` seconds, to the queue,
+        or mark them as failed when they have no attempts left. Returns the (requeued, failed) counts.
+        """
+        stale = [
+            self.model.status == JobStatus.RUNNING,
+            self.model.heartbeat_at < func.now() - timedelta(seconds=timeout),
+        ]
+        result: Result = await self.execute(
+            update(self.model)
+            .where(*stale, self.model.attempts >= self.model.max_attempts)
+            .values(status=JobStatus.FAILED, error='Worker stopped responding', locked_by=None, finished_at=func.now())
+        )
+        failed = result.rowcount
+        result = await self.execute(
+            update(self.model)
+            .where(*stale, self.model.attempts < self.model.max_attempts)
+            .values(status=JobStatus.QUEUED, locked_by=None)
+        )
+        return result.rowcount, failed
@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import Result, and_, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import BotActivity, BotPerformance, BotPerformanceDaily, TradingBot
+from app.models.trading_bots import FILL_ACTIVITY_TYPES
+from app.utils.repository import SQLAlchemyRepository
+
+ROLLUP_COLUMNS = ('trades', 'closed_trades', 'winning_trades', 'volume', 'fees', 'realized_pnl', 'closed_cost')
+
+
+def _fill(activity: BotActivity) -> dict | None:
+    """Arguments of `BotPerformance.apply_fill` recorded with a BUY or SELL activity, None for unusable entries."""
+    details = activity.details or {}
+    try:
+        fill = {
+            'symbol': details['symbol'],
+            'quantity': Decimal(details['quantity']),
+            'quote_quantity': Decimal(details['quote_quantity']),
+            'commission': Decimal(details.get('commission') or 0),
+        }
+    except (KeyError, TypeError, InvalidOperation):
+        return None
+    return fill if fill['quantity'] > 0 else None
+
+
+class BotPerformanceRepository(SQLAlchemyRepository):
+    model = BotPerformance
+    default_order_by = 'bot_id'
+
+    async def list_pending(self, limit: int) -> list:
+        """Bots with fills not folded yet, probed through the partial index of unfolded fills."""
+        statement = (
+            select(TradingBot.id)
+            .where(exists().where(
+                BotActivity.bot_id == TradingBot.id,
+                BotActivity.activity_type.in_(FILL_ACTIVITY_TYPES),
+                BotActivity.folded.is_(False),
+            ))
+            .limit(limit)
+        )
+        result: Result = await self.execute(statement)
+        return list(result.scalars())
+
+    async def refresh(self, bot_id, limit: int) -> int | None:
+        """
+        Fold up to `limit` new fills of a bot into its running totals and daily rollups and return their number.
+        Bots refreshed concurrently by another worker are skipped with None.
+        Folded fills are flagged rather than tracked by an id watermark: ids are taken at insert, so a fill
+        committed after one with a higher id would fall behind the watermark and never be counted.
+        """
+        await self.execute(insert(self.model).values(bot_id=bot_id).on_conflict_do_nothing())
+        result: Result = await self.execute(
+            select(self.model).where(self.model.bot_id == bot_id).with_for_update(skip_locked=True)
+        )
+        performance: BotPerformance | None = result.scalar_one_or_none()
+        if performance is None:
+            return None
+
+        result = await self.execute(
+            select(BotActivity)
+            .where(
+                BotActivity.bot_id == bot_id,
+                BotActivity.activity_type.in_(FILL_ACTIVITY_TYPES),
+                BotActivity.folded.is_(False),
+            )
+            .order_by(BotActivity.id)
+            .limit(limit)
+        )
+        activities = list(result.scalars())
+        if not activities:
+            return 0
+
+        days: dict[date, dict] = defaultdict(lambda: dict.fromkeys(ROLLUP_COLUMNS, 0))
+        for activity in activities:
+            fill = _fill(activity)
+            if fill is None:
+                continue
+            day = days[activity.timestamp.date()]
+            for column, value in performance.apply_fill(activity.activity_type, **fill).items():
+                day[column] += value
+            day['cumulative_pnl'] = performance.realized_pnl
+            day['max_drawdown'] = max(day.get('max_drawdown', 0), performance.drawdown)
+        await self.execute(
+            update(BotActivity).where(BotActivity.id.in_([activity.id for activity in activities])).values(folded=True)
+        )
+
+        if days:
+            await self._add_daily([{'bot_id': bot_id, 'day': day, **values} for day, values in days.items()])
+        return len(activities)
+
+    async def _add_daily(self, rows: list[dict]) -> None:
+        statement = insert(BotPerformanceDaily)
+        table = BotPerformanceDaily.__table__
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.bot_id, table.c.day],
+            set_={
+                **{column: table.c[column] + statement.excluded[column] for column in ROLLUP_COLUMNS},
+                'cumulative_pnl': statement.excluded.cumulative_pnl,
+                'max_drawdown': func.greatest(table.c.max_drawdown, statement.excluded.max_drawdown),
+            },
+        )
+        await self.execute(statement, rows)
+
+    async def list_daily(self, bot_id, since: date | None = None, until: date | None = None) -> list[BotPerformanceDaily]:
+        """Daily rollups of a bot in [since, until), oldest first."""
+        filters = [BotPerformanceDaily.bot_id == bot_id]
+        if since:
+            filters.append(BotPerformanceDaily.day >= since)
+        if until:
+            filters.append(BotPerformanceDaily.day < until)
+        result: Result = await self.execute(
+            select(BotPerformanceDaily).where(and_(*filters)).order_by(BotPerformanceDaily.day)
+        )
+        return list(result.scalars())
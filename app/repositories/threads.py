@@ -1,29 +1,351 @@
-from sqlalchemy import Result, select
-from sqlalchemy.orm import joinedload
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import List
+from uuid import UUID
 
-from app.models import Message, Thread
+from sqlalchemy import (
+    ColumnElement, Result, String, Uuid, any_, cast, delete, exists, func, literal, select, true, tuple_, update
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.exceptions.request_exceptions import InvalidCursorException
+from app.models import Message, Thread, ThreadArchive
+from app.models.threads import SEARCH_CONFIG
 from app.repositories import mixins
+from app.utils.paginator import ListPaginator, decode_cursor, encode_cursor, paginate
 from app.utils.repository import SQLAlchemyRepository
 
 
+# Characters of the last message returned with thread previews
+PREVIEW_LENGTH = 200
+
+# Up to two short fragments around the matched words
+HEADLINE_OPTIONS = 'MaxFragments=2, MaxWords=20, MinWords=5, StartSel=<b>, StopSel=</b>'
+
+
+async def _archived_messages(session: AsyncSession, thread_id) -> list[Message] | None:
+    """Messages of an archived thread as transient objects, None if the thread is not archived."""
+    archive = await session.scalar(
+        select(ThreadArchive).where(ThreadArchive.thread_id == thread_id).options(undefer(ThreadArchive.messages))
+    )
+    return archive.decompress() if archive else None
+
+
+def _any_of(thread_ids: list) -> ColumnElement:
+    """`= ANY(:ids)` operand, one array parameter whatever the number of ids."""
+    return any_(literal(list(thread_ids), ARRAY(Uuid)))
+
+
+def _is_visible(message: Message) -> bool:
+    return message.role != 'tool' and message.tool_calls is None
+
+
+class MessageLoading(str, Enum):
+    NONE = 'none'      # Thread row only, reading `messages` raises
+    ALL = 'all'        # Whole history in a second query
+    LATEST = 'latest'  # Only the latest messages, in order
+
+
 class ThreadRepository(mixins.PaginateListMixins, SQLAlchemyRepository):
     model = Thread
     default_order_by = '-updated_at'
 
-    async def get_thread_with_messages(self, **whereclauses) -> Thread:
+    async def get_thread(
+        self, *, messages: MessageLoading = MessageLoading.NONE, latest: int | None = None, **whereclauses
+    ) -> Thread:
+        """
+        Thread with its messages loaded as chosen. Messages are never joined to the thread row,
+        so reading the metadata of a long thread fetches one row.
+        With `LATEST`, `messages` holds the last `latest` ones, starting at a user message
+        so that no tool result is separated from the call requesting it.
+        Messages of an archived thread are read from its archive.
+        """
+        option = selectinload(self.model.messages) if messages == MessageLoading.ALL else raiseload(self.model.messages)
+        statement = select(self.model).where(*self.get_where_clauses(**whereclauses)).options(option)
+        result: Result = await self.execute(statement)
+        thread = await self.fetch_data(result.scalar_one)
+        if messages == MessageLoading.NONE:
+            return thread
+
+        if messages == MessageLoading.LATEST:
+            statement = (
+                select(Message)
+                .where(Message.thread_id == thread.id)
+                .order_by(Message.created_at.desc())
+                .limit(latest)
+            )
+            result = await self.execute(statement)
+            history = list(reversed(result.scalars().all()))
+        else:
+            history = list(thread.messages)
+
+        if thread.archived_at:
+            # Messages added while the thread was being archived stay in `message`
+            archived = await _archived_messages(self.session, thread.id) or []
+            history = sorted(archived + history, key=lambda message: message.created_at)
+
+        if messages == MessageLoading.LATEST:
+            history = history[-latest:] if latest else history
+            start = next((i for i, message in enumerate(history) if message.role == 'user'), len(history))
+            history = history[start:]
+        set_committed_value(thread, 'messages', history)
+        return thread
+
+    async def find_large(self, thread_ids: list, more_than: int, **whereclauses) -> list[UUID]:
+        """Threads among `thread_ids` with more than `more_than` messages, without counting all of them."""
+        beyond_limit = (
+            select(Message.id).where(Message.thread_id == self.model.id).offset(more_than).limit(1)
+        )
+        statement = select(self.model.id).where(
+            self.model.id == _any_of(thread_ids), *self.get_where_clauses(**whereclauses), exists(beyond_limit)
+        )
+        result: Result = await self.execute(statement)
+        return list(result.scalars().all())
+
+    async def delete_many(self, thread_ids: list, **whereclauses) -> list[UUID]:
+        """Delete threads in one statement, their messages and archives go with them by ON DELETE CASCADE."""
+        if not thread_ids:
+            return []
         statement = (
-            select(self.model)
-            .where(*self.get_where_clauses(**whereclauses))
-            .options(joinedload(self.model.messages))
+            delete(self.model)
+            .where(self.model.id == _any_of(thread_ids), *self.get_where_clauses(**whereclauses))
+            .returning(self.model.id)
         )
         result: Result = await self.execute(statement)
+        return list(result.scalars().all())
 
-        return await self.fetch_data(result.unique().scalar_one)
+    async def mark_deleted(self, thread_ids: list, **whereclauses) -> list[UUID]:
+        """Hide threads whose messages are deleted later, returns those not hidden yet."""
+        if not thread_ids:
+            return []
+        statement = (
+            update(self.model)
+            .where(
+                self.model.id == _any_of(thread_ids),
+                self.model.deleted_at.is_(None),
+                *self.get_where_clauses(**whereclauses),
+            )
+            .values(deleted_at=func.now(), updated_at=self.model.updated_at)
+            .returning(self.model.id)
+        )
+        result: Result = await self.execute(statement)
+        return list(result.scalars().all())
+
+    async def list_with_preview(self, *, page: int | None = 1, per_page: int | None = 10, user_id) -> dict:
+        """
+        Threads with their message count and last visible message, in one query.
+        Both are read per thread of the page through LATERAL subqueries on the (thread_id, created_at) index,
+        or from the archive for archived threads.
+        """
+        visible = (Message.thread_id == self.model.id, Message.role != 'tool', Message.tool_calls.is_(None))
+        last_message = (
+            select(
+                func.left(Message.content, PREVIEW_LENGTH).label('last_message_content'),
+                # Text like `ThreadArchive.last_message_role`, both are coalesced
+                cast(Message.role, String).label('last_message_role'),
+                Message.created_at.label('last_message_at'),
+            )
+            .where(*visible)
+            .order_by(Message.created_at.desc())
+            .limit(1)
+            .lateral('last_message')
+        )
+        counts = select(func.count().label('message_count')).where(*visible).lateral('counts')
+
+        threads = select(self.model).where(self.model.user_id == user_id, self.model.deleted_at.is_(None))
+        statement = (
+            select(
+                self.model.id,
+                self.model.title,
+                self.model.created_at,
+                self.model.updated_at,
+                (counts.c.message_count + func.coalesce(ThreadArchive.message_count, 0)).label('message_count'),
+                func.coalesce(last_message.c.last_message_content, ThreadArchive.last_message_content)
+                .label('last_message_content'),
+                func.coalesce(last_message.c.last_message_role, ThreadArchive.last_message_role)
+                .label('last_message_role'),
+                func.coalesce(last_message.c.last_message_at, ThreadArchive.last_message_at)
+                .label('last_message_at'),
+            )
+            .select_from(self.model)
+            .outerjoin(last_message, true())
+            .join(counts, true())
+            .outerjoin(ThreadArchive, ThreadArchive.thread_id == self.model.id)
+            .where(self.model.user_id == user_id, self.model.deleted_at.is_(None))
+            .order_by(*self.get_order_by_clauses(self.default_order_by))
+        )
+        return await paginate(
+            self.session, statement, page=page or 1, per_page=per_page or 10, fetch_method='all', count_query=threads
+        )
 
 
 class MessageRepository(mixins.PaginateListMixins, SQLAlchemyRepository):
     model = Message
     default_order_by = '-created_at'
 
-    async def list(self, *, page: int | None = 1, per_page: int | None = 10, **filter_by) -> dict:
-        return await super().list(page=page, per_page=per_page, is_reversed=True, **filter_by)
+    async def list(
+        self, *, page: int | None = 1, per_page: int | None = 10, include_tool_messages: bool = True, **filter_by
+    ) -> dict:
+        archived = await _archived_messages(self.session, filter_by['thread_id']) if 'thread_id' in filter_by else None
+        if archived is not None:
+            return await self._list_archived(archived, page, per_page, include_tool_messages, **filter_by)
+
+        if include_tool_messages:
+            return await super().list(page=page, per_page=per_page, is_reversed=True, **filter_by)
+
+        statement = (
+            select(self.model)
+            .filter_by(**filter_by)
+            .where(self.model.role != 'tool', self.model.tool_calls.is_(None))
+            .order_by(self.model.created_at)
+        )
+        return await paginate(self.session, statement, page=page or 1, per_page=per_page or 10, is_reversed=True)
+
+    async def _list_archived(
+        self, archived: List[Message], page: int | None, per_page: int | None, include_tool_messages: bool, **filter_by
+    ) -> dict:
+        result: Result = await self.execute(select(self.model).filter_by(**filter_by))
+        messages = sorted(archived + list(result.scalars().all()), key=lambda message: message.created_at)
+        if not include_tool_messages:
+            messages = [message for message in messages if _is_visible(message)]
+        return await ListPaginator(messages, page or 1, per_page or 10, is_reversed=True).get_response()
+
+    async def delete_chunk(self, thread_id, size: int) -> int:
+        """Delete up to `size` messages of a thread, returns how many were deleted."""
+        chunk = select(self.model.id).where(self.model.thread_id == thread_id).limit(size)
+        statement = delete(self.model).where(self.model.thread_id == thread_id, self.model.id.in_(chunk.scalar_subquery()))
+        result: Result = await self.execute(statement)
+        return result.rowcount
+
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    async def search(
+        self, *, user_id, text: str, limit: int = 20, cursor: str | None = None, fuzzy: bool = False
+    ) -> dict:
+        """
+        Messages of the user's threads matching `text`, best first, paginated by the (rank, created_at, id) keyset.
+        Full-text matches use the GIN index of `search_vector`, `fuzzy` matches substrings with the trigram index.
+        Messages of archived threads are not searched.
+        """
+        if fuzzy:
+            query = func.plainto_tsquery(SEARCH_CONFIG, text)
+            rank = func.similarity(self.model.content, text)
+            match = self.model.content.ilike(f'%{self._escape_like(text)}%', escape='\\')
+        else:
+            query = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+            rank = func.ts_rank_cd(self.model.search_vector, query)
+            match = self.model.search_vector.bool_op('@@')(query)
+
+        statement = (
+            select(
+                self.model.id,
+                self.model.thread_id,
+                Thread.title.label('thread_title'),
+                self.model.role,
+                self.model.created_at,
+                rank.label('rank'),
+                # Evaluated only for the returned page, after sorting and limiting
+                func.ts_headline(SEARCH_CONFIG, self.model.content, query, HEADLINE_OPTIONS).label('snippet'),
+            )
+            .join(Thread, Thread.id == self.model.thread_id)
+            .where(Thread.user_id == user_id, Thread.deleted_at.is_(None), self.model.role != 'tool', match)
+            .order_by(rank.desc(), self.model.created_at.desc(), self.model.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            after_rank, after_created_at, after_id = decode_cursor(cursor, 3)
+            try:
+                after = (float(after_rank), datetime.fromisoformat(after_created_at), UUID(after_id))
+            except (TypeError, ValueError):
+                raise InvalidCursorException()
+            statement = statement.where(tuple_(rank, self.model.created_at, self.model.id) < after)
+
+        result: Result = await self.execute(statement)
+        rows = result.mappings().all()
+        items, next_cursor = rows[:limit], None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(last['rank'], last['created_at'].isoformat(), last['id'])
+        return {'items': items, 'next_cursor': next_cursor}
+
+
+class ThreadArchiveRepository(SQLAlchemyRepository):
+    model = ThreadArchive
+    default_order_by = '-archived_at'
+
+    async def list_cold_threads(self, inactive_for: timedelta, limit: int) -> list[UUID]:
+        statement = (
+            select(Thread.id)
+            .where(
+                Thread.archived_at.is_(None),
+                Thread.deleted_at.is_(None),
+                Thread.updated_at < func.now() - inactive_for,
+            )
+            .order_by(Thread.updated_at)
+            .limit(limit)
+        )
+        result: Result = await self.execute(statement)
+        return list(result.scalars().all())
+
+    async def archive(self, thread_id, inactive_for: timedelta) -> int | None:
+        """
+        Move messages of a thread still inactive for `inactive_for` into its archive and return their number.
+        Threads being written to are skipped with None: the thread row is locked, which the message insert trigger waits for.
+        """
+        statement = (
+            select(Thread)
+            .where(
+                Thread.id == thread_id,
+                Thread.archived_at.is_(None),
+                Thread.deleted_at.is_(None),
+                Thread.updated_at < func.now() - inactive_for,
+            )
+            .with_for_update(skip_locked=True)
+        )
+        thread = await self.session.scalar(statement)
+        if thread is None:
+            return None
+
+        result: Result = await self.execute(
+            select(Message).where(Message.thread_id == thread_id).order_by(Message.created_at)
+        )
+        messages = list(result.scalars().all())
+        visible = [message for message in messages if _is_visible(message)]
+        last = visible[-1] if visible else None
+        self.session.add(ThreadArchive(
+            thread_id=thread_id,
+            messages=ThreadArchive.compress(messages),
+            message_count=len(visible),
+            last_message_content=last.content[:PREVIEW_LENGTH] if last else None,
+            last_message_role=last.role if last else None,
+            last_message_at=last.created_at if last else None,
+        ))
+        await self.execute(
+            delete(Message).where(Message.thread_id == thread_id).execution_options(synchronize_session=False)
+        )
+        # Keeping updated_at, which would be bumped by its onupdate default, leaves the thread in place in lists
+        await self.execute(
+            update(Thread).where(Thread.id == thread_id).values(archived_at=func.now(), updated_at=Thread.updated_at)
+        )
+        await self.session.flush()
+        return len(messages)
+
+    async def restore(self, thread_id) -> int:
+        """Move messages of an archived thread back into `message`, returns their number (0 if not archived)."""
+        result: Result = await self.execute(
+            delete(ThreadArchive).where(ThreadArchive.thread_id == thread_id).returning(ThreadArchive.messages)
+        )
+        data = result.scalar_one_or_none()
+        if data is None:
+            return 0
+
+        messages = ThreadArchive(thread_id=thread_id, messages=data).decompress()
+        self.session.add_all(messages)
+        await self.execute(update(Thread).where(Thread.id == thread_id).values(archived_at=None))
+        await self.session.flush()
+        return len(messages)
@@ -1,9 +1,69 @@
-from app.models import TradingBot
+from datetime import datetime
+
+from sqlalchemy import Result, insert, select, tuple_
+
+from app.exceptions.request_exceptions import InvalidCursorException
+from app.models import TradingBot, BotActivity
 from app.repositories import mixins
+from app.utils.paginator import decode_cursor, encode_cursor
 from app.utils.repository import SQLAlchemyRepository
 
 
 class TradingBotRepository(mixins.PaginateListMixins, SQLAlchemyRepository):
     model = TradingBot
-    default_order_by = '-updated_at'
+    default_order_by = '-created_at'
+
+    async def list_active(self) -> list[TradingBot]:
+        statement = select(self.model).where(self.model.is_active.is_(True))
+        result: Result = await self.execute(statement)
+        return list(result.scalars())
+
+
+class BotActivityRepository(SQLAlchemyRepository):
+    model = BotActivity
+    default_order_by = '-timestamp'
+
+    async def bulk_create(self, rows: list[dict]) -> None:
+        """Append rows in one statement; rows of bots deleted since they were recorded are dropped."""
+        if not rows:
+            return
+        result: Result = await self.execute(
+            select(TradingBot.id).where(TradingBot.id.in_({row['bot_id'] for row in rows}))
+        )
+        existing = set(result.scalars())
+        rows = [row for row in rows if row['bot_id'] in existing]
+        if rows:
+            await self.execute(insert(self.model), rows)
+
+    async def list_range(
+        self,
+        bot_id,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        activity_type: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict:
+        """Activity of a bot in [since, until), newest first, paginated by the (timestamp, id) keyset."""
+        statement = select(self.model).where(self.model.bot_id == bot_id)
+        if since:
+            statement = statement.where(self.model.timestamp >= since)
+        if until:
+            statement = statement.where(self.model.timestamp < until)
+        if activity_type:
+            statement = statement.where(self.model.activity_type == activity_type)
+        if cursor:
+            after_timestamp, after_id = decode_cursor(cursor, 2)
+            try:
+                after = (datetime.fromisoformat(after_timestamp), int(after_id))
+            except (TypeError, ValueError):
+                raise InvalidCursorException()
+            statement = statement.where(tuple_(self.model.timestamp, self.model.id) < after)
+        statement = statement.order_by(self.model.timestamp.desc(), self.model.id.desc()).limit(limit + 1)
 
+        result: Result = await self.execute(statement)
+        rows = list(result.scalars())
+        items, next_cursor = rows[:limit], None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(items[-1].timestamp.isoformat(), items[-1].id)
+        return {'items': items, 'next_cursor': next_cursor}
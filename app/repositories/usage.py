@@ -0,0 +1,117 @@
+from datetime import datetime
+
+from sqlalchemy import Result, func, insert, select
+
+from app.models import LLMUsage, Thread, TradingBot, User
+from app.utils.repository import SQLAlchemyRepository
+
+USAGE_COLUMNS = ('calls', 'tool_rounds', 'prompt_tokens', 'cached_tokens', 'completion_tokens', 'cost')
+
+
+class LLMUsageRepository(SQLAlchemyRepository):
+    model = LLMUsage
+    default_order_by = '-created_at'
+
+    async def _existing(self, column, ids: set) -> set:
+        ids.discard(None)
+        if not ids:
+            return set()
+        result: Result = await self.execute(select(column).where(column.in_(ids)))
+        return set(result.scalars())
+
+    async def bulk_create(self, rows: list[dict]) -> None:
+        """
+        Append rows in one statement. Rows of users deleted since they were recorded are dropped,
+        and references to deleted threads and bots are cleared, as ON DELETE SET NULL would have done.
+        """
+        if not rows:
+            return
+        users = await self._existing(User.id, {row['user_id'] for row in rows})
+        threads = await self._existing(Thread.id, {row.get('thread_id') for row in rows})
+        bots = await self._existing(TradingBot.id, {row.get('trading_bot_id') for row in rows})
+        rows = [
+            {
+                **row,
+                'thread_id': row.get('thread_id') if row.get('thread_id') in threads else None,
+                'trading_bot_id': row.get('trading_bot_id') if row.get('trading_bot_id') in bots else None,
+            }
+            for row in rows if row['user_id'] in users
+        ]
+        if rows:
+            await self.execute(insert(self.model), rows)
+
+    def _totals(self) -> list:
+        return [
+            *(func.coalesce(func.sum(getattr(self.model, column)), 0).label(column) for column in USAGE_COLUMNS),
+            func.count().label('runs'),
+            func.coalesce(func.avg(self.model.latency_ms), 0).label('avg_latency_ms'),
+        ]
+
+    def _filters(self, since: datetime | None, until: datetime | None, **filter_by) -> list:
+        filters = [getattr(self.model, key) == value for key, value in filter_by.items()]
+        if since:
+            filters.append(self.model.created_at >= since)
+        if until:
+            filters.append(self.model.created_at < until)
+        return filters
+
+    async def get_totals(self, since: datetime | None = None, until: datetime | None = None, **filter_by) -> dict:
+        statement = select(*self._totals()).where(*self._filters(since, until, **filter_by))
+        result: Result = await self.execute(statement)
+        return dict(result.one()._mapping)
+
+    async def get_totals_by_thread(
+        self,
+        user_id,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        """Most expensive threads of the user first."""
+        statement = (
+            select(self.model.thread_id, Thread.title, *self._totals())
+            .join(Thread, Thread.id == self.model.thread_id)
+            .where(*self._filters(since, until, user_id=user_id))
+            .group_by(self.model.thread_id, Thread.title)
+            .order_by(func.sum(self.model.cost).desc())
+            .limit(limit)
+        )
+        result: Result = await self.execute(statement)
+        return [dict(row._mapping) for row in result]
+
+    async def get_totals_by_user(self, since: datetime | None = None, until: datetime | None = None, limit: int = 50):
+        statement = (
+            select(self.model.user_id, *self._totals())
+            .where(*self._filters(since, until))
+            .group_by(self.model.user_id)
+            .order_by(func.sum(self.model.cost).desc())
+            .limit(limit)
+        )
+        result: Result = await self.execute(statement)
+        return [dict(row._mapping) for row in result]
+
+    async def get_totals_by_route(self, since: datetime | None = None, until: datetime | None = None) -> list[dict]:
+        """Usage per route and model with latency percentiles, for tuning the routing policy."""
+        statement = (
+            select(
+                self.model.route,
+                self.model.model,
+                *self._totals(),
+                func.percentile_cont(0.5).within_group(self.model.latency_ms).label('p50_latency_ms'),
+                func.percentile_cont(0.95).within_group(self.model.latency_ms).label('p95_latency_ms'),
+                func.avg(self.model.cost).label('avg_cost'),
+            )
+            .where(*self._filters(since, until))
+            .group_by(self.model.route, self.model.model)
+            .order_by(self.model.route, func.count().desc())
+        )
+        result: Result = await self.execute(statement)
+        return [dict(row._mapping) for row in result]
+
+    async def get_used_tokens(self, user_id, since: datetime) -> int:
+        statement = (
+            select(func.coalesce(func.sum(self.model.prompt_tokens + self.model.completion_tokens), 0))
+            .where(self.model.user_id == user_id, self.model.created_at >= since)
+        )
+        result: Result = await self.execute(statement)
+        return result.scalar_one()
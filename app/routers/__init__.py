@@ -3,11 +3,19 @@ from .users import router as users
 from .threads import router as threads
 from .binance import router as binance
 from .binance_accounts import router as binance_accounts
+from .metrics import router as metrics
+from .jobs import router as jobs
+from .trading_bots import router as trading_bots
+from .usage import router as usage
 
 __all__ = (
     'users',
     'auth',
     'threads',
     'binance',
-    'binance_accounts'
+    'binance_accounts',
+    'metrics',
+    'jobs',
+    'trading_bots',
+    'usage',
 )
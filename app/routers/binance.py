@@ -8,27 +8,43 @@ from fastapi import APIRouter, HTTPException, status
 from fastapi import APIRouter, Depends
 
 from app.services import BinanceService
-from app.routers.dependencies import get_binance_service
+from app.routers.dependencies import UnitOfWorkDep, get_binance_service, get_users_service
 
 router = APIRouter(tags=["Binance"], prefix="/binance")
 
 
 @router.get("/account")
-async def get_account(service: BinanceService = Depends(get_binance_service)):
-    account_data = await service.get_account_data()
+async def get_account(
+        unit_of_work: UnitOfWorkDep,
+        users_service: get_users_service,
+        service: BinanceService = Depends(get_binance_service),
+        fresh: bool = False,
+):
+    """
+    Account balances, served with their prices from the latest stored snapshot of the account unless `fresh`
+    is set or the snapshot is older than `SNAPSHOT_MAX_AGE`.
+    """
+    snapshot = None
+    if not fresh:
+        snapshot = await users_service.get_latest_balance_snapshot(unit_of_work, service.account_id)
+    if snapshot and snapshot.prices is not None:
+        account_data = snapshot.as_account_data()
+        prices = {f"{asset}USDT": price for asset, price in snapshot.prices.items()}
+        coins = {asset: {"coin": asset, "name": name} for asset, name in (snapshot.coin_names or {}).items()}
+    else:
+        account_data = await service.get_account_data()
+        tickers = await service.get_all_tickers()
+        prices = {ticker["symbol"]: ticker["price"] for ticker in tickers}
+        coins_info = await service.get_all_coins_info()
+        coins = {coin["coin"]: coin for coin in coins_info}
     balances = {asset["asset"]: asset for asset in account_data["balances"]}
 
-    tickers = await service.get_all_tickers()
-    prices = {ticker["symbol"]: ticker["price"] for ticker in tickers}
-
-    coins_info = await service.get_all_coins_info()
-    coins = {coin["coin"]: coin for coin in coins_info}
-
     def create_url(coin_data) -> str:
         coin_name = coin_data["name"].lower().replace(" ", "-")
         coin_symbol = coin_data["coin"].lower()
         return f"https://cryptologos.cc/logos/{coin_name}-{coin_symbol}-logo.svg"
 
+    balances.setdefault("USDT", {"asset": "USDT", "free": "0", "locked": "0"})
     balances["USDT"]["price"] = 1
     balances["USDT"]["logo_url"] = "https://cryptologos.cc/logos/tether-usdt-logo.svg"
     for symbol in balances:
@@ -55,16 +71,16 @@ async def get_orders(service: BinanceService = Depends(get_binance_service)):
         return {"error": str(e)}
 
 
-async def get_portfolio_value(client):
+async def get_portfolio_value(service: BinanceService):
     """Fetch the total portfolio value."""
 
     async def get_asset_prices():
         """Fetch current prices for all assets."""
-        prices = await client.get_all_tickers()
+        prices = await service.get_all_tickers()
         return {item['symbol']: float(item['price']) for item in prices}
 
     try:
-        account_info = await client.get_account()
+        account_info = await service.get_account_data()
         balances = account_info['balances']
 
         # Get current asset prices
@@ -114,9 +130,8 @@ async def get_card_data(service: BinanceService = Depends(get_binance_service)):
     Endpoint to fetch portfolio data formatted for StatCard.
     """
     try:
-        client = service.test_client
         # Fetch portfolio value and simulate data
-        portfolio_data = await get_portfolio_value(client)
+        portfolio_data = await get_portfolio_value(service)
 
         # Total portfolio value
         total_value = portfolio_data["total_value"]
@@ -1,26 +1,65 @@
 import uuid
-from typing import Optional
+from typing import Any, Optional
 
+import jwt
 from loguru import logger
 from httpx import AsyncClient
 from httpx_oauth.clients.google import GoogleOAuth2
 from typing import Annotated
 from fastapi import Depends, Request
-from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, models
+from pydantic import UUID4
+from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, exceptions, models
 from fastapi_users.authentication import (
     AuthenticationBackend,
     JWTStrategy, BearerTransport,
 )
-from app.database import User, get_user_db
+from fastapi_users.jwt import decode_jwt, generate_jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
+from app.database import User, get_async_session, get_user_db
+from app.exceptions.request_exceptions import NotFoundException
 from app.settings import settings
-from app.services import ThreadService, BinanceService, UserService, TradingBotService
+from app.services import ThreadService, BinanceService, UserService, TradingBotService, JobService, UsageService
+from app.services.user_cache import user_cache
 from app.utils.unitofwork import IUnitOfWork, UnitOfWork
 
 bearer_transport = BearerTransport(tokenUrl="auth/login")
 
 
+class CachedJWTStrategy(JWTStrategy[User, uuid.UUID]):
+    """
+    JWT strategy resolving users through the per-process `user_cache`; on a miss only the user row is loaded.
+    Tokens carry the user's `token_version`, so a password change rejects tokens issued before it.
+    """
+
+    async def read_token(self, token: Optional[str], user_manager: BaseUserManager[User, uuid.UUID]) -> Optional[User]:
+        if token is None:
+            return None
+        try:
+            data = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+            user_id = user_manager.parse_id(data["sub"])
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            return None
+        token_version = data.get("ver", 0)
+
+        session = user_manager.user_db.session
+        cached = user_cache.get(user_id, token_version)
+        if cached:
+            return await session.merge(cached, load=False)
+
+        user = await session.get(User, user_id, options=[noload(User.oauth_accounts)])
+        if user is None or user.token_version != token_version:
+            return None
+        user_cache.set(user)
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {"sub": str(user.id), "ver": user.token_version, "aud": self.token_audience}
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+
 def get_jwt_strategy() -> JWTStrategy[models.UP, models.ID]:
-    return JWTStrategy(secret=settings.auth.key, lifetime_seconds=3600)
+    return CachedJWTStrategy(secret=settings.auth.key, lifetime_seconds=3600)
 
 
 auth_backend = AuthenticationBackend(
@@ -61,6 +100,18 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
 
         logger.info(f"User {user.id} has registered.")
 
+    async def on_after_update(self, user: User, update_dict: dict[str, Any], request: Optional[Request] = None):
+        if "password" in update_dict:
+            await self.user_db.update(user, {"token_version": user.token_version + 1})
+        user_cache.invalidate(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None):
+        await self.user_db.update(user, {"token_version": user.token_version + 1})
+        user_cache.invalidate(user.id)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None):
+        user_cache.invalidate(user.id)
+
     async def on_after_forgot_password(
             self, user: User, token: str, request: Optional[Request] = None
     ):
@@ -81,29 +132,46 @@ fastapi_users = FastAPIUsers[User, uuid.UUID](get_user_manager, [auth_backend])
 current_active_user = fastapi_users.current_user(active=True)
 get_current_user = Annotated[User, Depends(current_active_user)]
 
+current_superuser = fastapi_users.current_user(active=True, superuser=True)
+get_current_superuser = Annotated[User, Depends(current_superuser)]
+
 google_oauth_client = GoogleOAuth2(
     client_id=settings.oauth.GOOGLE_CLIENT_ID,
     client_secret=settings.oauth.GOOGLE_CLIENT_SECRET,
     scopes=["openid", "email", "profile"]
 )
 
-UnitOfWorkDep = Annotated[IUnitOfWork, Depends(UnitOfWork)]
+async def get_unit_of_work(session: AsyncSession = Depends(get_async_session)) -> IUnitOfWork:
+    """Unit of work on the request session, which `get_user_db` uses as well."""
+    return UnitOfWork(session=session)
+
+
+UnitOfWorkDep = Annotated[IUnitOfWork, Depends(get_unit_of_work)]
 
 get_threads_service = Annotated[ThreadService, Depends(ThreadService)]
 get_trading_bots_service = Annotated[TradingBotService, Depends(TradingBotService)]
 get_users_service = Annotated[UserService, Depends(UserService)]
+get_jobs_service = Annotated[JobService, Depends(JobService)]
+get_usage_service = Annotated[UsageService, Depends(UsageService)]
+
 
+async def get_binance_service(
+        unit_of_work: UnitOfWorkDep,
+        current_user: get_current_user,
+        account_id: UUID4 | None = None,
+) -> BinanceService:
+    """Service bound to `account_id` or to the first active Binance account of the current user."""
+    account = await UserService.get_binance_account(unit_of_work, current_user.id, account_id)
+    return await BinanceService.for_account(account)
 
 
-async def get_binance_service() -> BinanceService:
-    service = BinanceService(
-        api_key=settings.binance.BINANCE_API_KEY,
-        api_secret=settings.binance.BINANCE_API_SECRET,
-        testnet_api_key=settings.binance.TESTNET_BINANCE_API_KEY,
-        testnet_api_secret=settings.binance.TESTNET_BINANCE_API_SECRET
-    )
-    await service.connect()
+async def get_optional_binance_service(
+        unit_of_work: UnitOfWorkDep,
+        current_user: get_current_user,
+) -> BinanceService | None:
+    """Service of the first active Binance account of the current user, if there is any."""
     try:
-        yield service
-    finally:
-        await service.close()
\ No newline at end of file
+        account = await UserService.get_binance_account(unit_of_work, current_user.id)
+    except NotFoundException:
+        return None
+    return await BinanceService.for_account(account)
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from fastapi import APIRouter
+from pydantic import UUID4
+from starlette import status
+from starlette.responses import StreamingResponse
+
+from app.models import JobStatus
+from app.routers.dependencies import UnitOfWorkDep, get_current_user, get_jobs_service
+from app.schemas.jobs import JobRead
+from app.settings import settings
+from app.utils.unitofwork import UnitOfWork
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+STREAM_TIMEOUT = 300
+FINAL_STATUSES = (JobStatus.DONE, JobStatus.FAILED)
+
+
+@router.get(
+    '/{job_id}',
+    name='Retrieve Job',
+    description='Poll status and result of a background job.',
+    status_code=status.HTTP_200_OK,
+    response_model=JobRead,
+)
+async def get_job(
+        job_id: UUID4,
+        unit_of_work: UnitOfWorkDep,
+        service: get_jobs_service,
+        current_user: get_current_user,
+):
+    return await service.retrieve(unit_of_work, job_id, user_id=current_user.id)
+
+
+@router.get(
+    '/{job_id}/stream',
+    name='Stream Job',
+    description='Server-sent events with every status change of a background job, until it finishes.',
+    status_code=status.HTTP_200_OK,
+)
+async def stream_job(
+        job_id: UUID4,
+        unit_of_work: UnitOfWorkDep,
+        service: get_jobs_service,
+        current_user: get_current_user,
+):
+    job = await service.retrieve(unit_of_work, job_id, user_id=current_user.id)
+    user_id = current_user.id
+
+    async def events():
+        nonlocal job
+        # The request session is closed before the body is streamed, and its identity map would keep returning
+        # the job as first loaded, so every poll reads it in a session of its own
+        deadline = time.monotonic() + STREAM_TIMEOUT
+        last_status = None
+        while True:
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: {job.status.value}\ndata: {JobRead.model_validate(job).model_dump_json()}\n\n"
+            if job.status in FINAL_STATUSES or time.monotonic() > deadline:
+                return
+            await asyncio.sleep(settings.jobs.WORKER_POLL_INTERVAL)
+            job = await service.retrieve(UnitOfWork(), job_id, user_id=user_id)
+
+    return StreamingResponse(events(), media_type='text/event-stream')
@@ -0,0 +1,46 @@
+from fastapi import APIRouter
+from starlette import status
+
+from app.routers.dependencies import get_current_superuser
+from app.inference.gateway import llm_gateway
+from app.inference.memo import tool_memo
+from app.services.binance import binance_clients, binance_limiter
+from app.services.response_cache import response_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get(
+    '/binance',
+    name='Binance Metrics',
+    description='Rate limiter queue depth and remaining request weight, per-account client pool usage.',
+    status_code=status.HTTP_200_OK,
+)
+async def binance_metrics(_: get_current_superuser):
+    return {
+        'limiter': binance_limiter.stats(),
+        'clients': binance_clients.stats(),
+    }
+
+
+@router.get(
+    '/chat-cache',
+    name='Chat Cache Metrics',
+    description='Exact and semantic hit counts of the chat response cache, reuse of tool call results.',
+    status_code=status.HTTP_200_OK,
+)
+async def chat_cache_metrics(_: get_current_superuser):
+    return {
+        'responses': response_cache.stats(),
+        'tools': tool_memo.stats(),
+    }
+
+
+@router.get(
+    '/llm',
+    name='LLM Gateway Metrics',
+    description='Queue depth per priority and remaining token budget, retries and circuit breaker state.',
+    status_code=status.HTTP_200_OK,
+)
+async def llm_metrics(_: get_current_superuser):
+    return llm_gateway.stats()
@@ -1,14 +1,35 @@
-import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, status, HTTPException
 from pydantic import UUID4, BaseModel
 from sqlalchemy.sql.functions import user
 from starlette.responses import JSONResponse
 
-from app.routers.dependencies import UnitOfWorkDep, get_current_user, get_threads_service
-from app.schemas.threads import ThreadCreateRequest, Thread, PaginatedMessagesResponse, MessageSchema
-from app.inference.chat.model import ChatModel
+from app.routers.dependencies import (
+    UnitOfWorkDep,
+    get_current_user,
+    get_jobs_service,
+    get_optional_binance_service,
+    get_threads_service,
+    get_usage_service,
+)
+from app.exceptions.request_exceptions import NotFoundException
+from app.inference.gateway import LLMUnavailable
+from app.models import JobKind
+from app.services import BinanceService
+from app.settings import settings
+from app.utils.rate_limiter import RequestPriority
+from app.schemas.threads import (
+    FilterQuery,
+    MessageSchema,
+    MessageSearchResponse,
+    PaginatedMessagesResponse,
+    Thread,
+    ThreadBulkDeleteRequest,
+    ThreadBulkDeleteResponse,
+    ThreadCreateRequest,
+    ThreadPreview,
+)
 
 router = APIRouter(prefix='/threads', tags=['Threads'])
 
@@ -41,12 +62,43 @@ async def get_threads(
         current_user: get_current_user,
         page: Annotated[int | None, Query(ge=1)] = 1,
         per_page: Annotated[int | None, Query(ge=1, le=30)] = 10,
+        preview: bool = False,
 ):
+    """With `preview`, each thread also has its message count and the beginning of its last message."""
+    if preview:
+        result = await service.list_with_preview(unit_of_work, user_id=current_user.id, page=page, per_page=per_page)
+        result['items'] = {row['id']: ThreadPreview.model_validate(dict(row)) for row in result['items']}
+        return result
+
     result = await service.list(unit_of_work, user_id=current_user.id, page=page, per_page=per_page)
     result['items'] = {thread.id: thread for thread in result['items']}
     return result
 
 
+@router.get(
+    '/search',
+    name='Search Messages',
+    description='Full-text search of messages across threads of the current user, best matches first.',
+    status_code=status.HTTP_200_OK,
+    response_model=MessageSearchResponse,
+)
+async def search_messages(
+        filters: Annotated[FilterQuery, Depends()],
+        unit_of_work: UnitOfWorkDep,
+        service: get_threads_service,
+        current_user: get_current_user,
+        limit: Annotated[int, Query(ge=1, le=50)] = 20,
+        cursor: str | None = None,
+        fuzzy: bool = False,
+):
+    """`text` takes web search syntax: "quoted phrases", OR and -excluded words; `fuzzy` matches substrings."""
+    if not filters.text or not filters.text.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search text is required.")
+    return await service.search(
+        unit_of_work, current_user.id, filters.text.strip(), limit=limit, cursor=cursor, fuzzy=fuzzy
+    )
+
+
 @router.get(
     '/{thread_id}',
     name='Retrieve Thread',
@@ -58,6 +110,22 @@ async def get_thread(thread_id: UUID4, unit_of_work: UnitOfWorkDep, service: get
     return await service.retrieve(unit_of_work, thread_id)
 
 
+@router.delete(
+    '',
+    name='Delete Threads',
+    description='Delete several threads of the current user, ids of other users\' threads are ignored.',
+    status_code=status.HTTP_200_OK,
+    response_model=ThreadBulkDeleteResponse,
+)
+async def delete_threads(
+        data: ThreadBulkDeleteRequest,
+        unit_of_work: UnitOfWorkDep,
+        service: get_threads_service,
+        current_user: get_current_user,
+):
+    return await service.delete(unit_of_work, current_user.id, data.thread_ids)
+
+
 @router.delete(
     '/{thread_id}',
     name='Delete Thread',
@@ -65,12 +133,14 @@ async def get_thread(thread_id: UUID4, unit_of_work: UnitOfWorkDep, service: get
     status_code=status.HTTP_204_NO_CONTENT,
 )
 async def delete_thread(
-        user_id: int,
+        thread_id: UUID4,
         unit_of_work: UnitOfWorkDep,
         service: get_threads_service,
         current_user: get_current_user,
 ):
-    return await service.delete(unit_of_work, user_id, current_user_id=current_user.id)
+    result = await service.delete(unit_of_work, current_user.id, [thread_id])
+    if not result['deleted'] and not result['scheduled']:
+        raise NotFoundException(class_name='Thread')
 
 
 @router.get(
@@ -87,8 +157,11 @@ async def get_messages(
         current_user: get_current_user,
         page: Annotated[int | None, Query(ge=1)] = 1,
         per_page: Annotated[int | None, Query(ge=1, le=30)] = 10,
+        include_tools: bool = False,
 ):
-    return await service.list_messages(unit_of_work, thread_id=thread_id, page=page, per_page=per_page)
+    return await service.list_messages(
+        unit_of_work, thread_id=thread_id, page=page, per_page=per_page, include_tool_messages=include_tools
+    )
 
 
 class MessageRequest(BaseModel):
@@ -108,21 +181,43 @@ async def send_message(
         unit_of_work: UnitOfWorkDep,
         service: get_threads_service,
         current_user: get_current_user,
+        jobs_service: get_jobs_service,
+        usage_service: get_usage_service,
+        binance_service: BinanceService | None = Depends(get_optional_binance_service),
+        idempotency_key: Annotated[str | None, Header(alias='Idempotency-Key', max_length=64)] = None,
 ):
-    message = message_request.message
-    thread = await service.retrieve(unit_of_work, thread_id)
-    messages = [{"role": message.role, "content": message.content} for message in thread.messages]
-    messages.append({"role": "user", "content": message})
+    """
+    Answer inline, or with 202 and a job id to poll at /jobs/{job_id} when chat turns run on workers.
+    Orders placed by a turn are keyed by `Idempotency-Key`, so a retried request does not place them again.
+    """
+    await usage_service.check_budget(unit_of_work, current_user)
+    run_key = f"{current_user.id}:{idempotency_key}" if idempotency_key else None
+    if settings.jobs.CHAT_OFFLOAD_ENABLED:
+        job = await jobs_service.enqueue(
+            unit_of_work,
+            JobKind.CHAT_TURN,
+            {"thread_id": thread_id, "message": message_request.message, "run_key": run_key},
+            user_id=current_user.id,
+            priority=RequestPriority.INTERACTIVE,
+            max_attempts=1,
+            dedupe_key=run_key,
+        )
+        if job is None:
+            return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": "Message is already queued."})
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"job_id": str(job.id), "status": job.status.value},
+        )
+
     try:
-        chat_model = ChatModel()
-        model_response = chat_model.run(messages)
+        return await service.reply(
+            unit_of_work, thread_id, message_request.message, binance_service=binance_service, run_key=run_key
+        )
+    except LLMUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Assistant is busy, please try again shortly.",
+            headers={"Retry-After": str(round(e.retry_after))},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating response: {str(e)}")
-    messages.append({"role": "assistant", "content": model_response})
-    add_messages = [
-        {"role": 'user', "content": message, "timestamp": datetime.datetime.utcnow().isoformat()},
-        {"role": 'assistant', "content": model_response, "timestamp": datetime.datetime.utcnow().isoformat()},
-    ]
-    for message in add_messages:
-        await service.add_message(unit_of_work, thread_id, message)
-    return {"role": 'assistant', "content": model_response, "created_at": datetime.datetime.utcnow().isoformat()}
@@ -1,8 +1,21 @@
-from fastapi import APIRouter
+from datetime import date, datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from pydantic import UUID4
 from starlette import status
+from starlette.responses import JSONResponse
 
-from app.routers.dependencies import UnitOfWorkDep, get_current_user, get_trading_bots_service
-from app.schemas.trading_bots import TradingBotCreate
+from app.models import JobKind
+from app.routers.dependencies import (
+    UnitOfWorkDep,
+    get_current_user,
+    get_jobs_service,
+    get_trading_bots_service,
+    get_usage_service,
+)
+from app.schemas.trading_bots import BotActivityPage, BotPerformanceRead, TradingBotCreate
+from app.utils.rate_limiter import RequestPriority
 
 router = APIRouter(prefix="/trading-bots", tags=["Trading Bots"])
 
@@ -30,19 +43,102 @@ async def list_trading_bots(
         unit_of_work: UnitOfWorkDep,
         service: get_trading_bots_service,
         current_user: get_current_user,
+        page: int = 1,
+        per_page: int = 10,
+):
+    return await service.list(unit_of_work, page=page, per_page=per_page, user_id=current_user.id)
+
+
+@router.post(
+    '/{trading_bot_id}/analysis',
+    name='Run Trading Bot Analysis',
+    description='Queue an analyzer run of the bot, its result is available via `/jobs/{job_id}`.',
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def analyze_trading_bot(
+        trading_bot_id: UUID4,
+        unit_of_work: UnitOfWorkDep,
+        service: get_trading_bots_service,
+        jobs_service: get_jobs_service,
+        usage_service: get_usage_service,
+        current_user: get_current_user,
+):
+    trading_bot = await service.retrieve(unit_of_work, trading_bot_id, user_id=current_user.id)
+    await usage_service.check_budget(unit_of_work, current_user)
+    job = await jobs_service.enqueue(
+        unit_of_work,
+        JobKind.BOT_ANALYSIS,
+        {"trading_bot_id": str(trading_bot.id)},
+        user_id=current_user.id,
+        priority=RequestPriority.BOT,
+        dedupe_key=str(trading_bot.id),
+    )
+    if job is None:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": "Analysis is already queued."})
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"job_id": str(job.id), "status": job.status.value},
+    )
+
+
+@router.get(
+    '/{trading_bot_id}/activity',
+    name='List Trading Bot Activity',
+    description='Activity log of the bot in [since, until), newest first. Pass `next_cursor` as `cursor` for older entries.',
+    status_code=status.HTTP_200_OK,
+    response_model=BotActivityPage,
+)
+async def list_trading_bot_activity(
+        trading_bot_id: UUID4,
+        unit_of_work: UnitOfWorkDep,
+        service: get_trading_bots_service,
+        current_user: get_current_user,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        activity_type: str | None = None,
+        limit: Annotated[int, Query(ge=1, le=200)] = 50,
+        cursor: str | None = None,
+):
+    return await service.list_activity(
+        unit_of_work,
+        trading_bot_id,
+        user_id=current_user.id,
+        since=since,
+        until=until,
+        activity_type=activity_type,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+@router.get(
+    '/{trading_bot_id}/performance',
+    name='Get Trading Bot Performance',
+    description='P&L, win rate and drawdown of the bot against its target profit, with daily rollups in [since, until). '
+                'Read from aggregates refreshed every `PERFORMANCE_INTERVAL` seconds, so the latest fills may be missing.',
+    status_code=status.HTTP_200_OK,
+    response_model=BotPerformanceRead,
+)
+async def get_trading_bot_performance(
+        trading_bot_id: UUID4,
+        unit_of_work: UnitOfWorkDep,
+        service: get_trading_bots_service,
+        current_user: get_current_user,
+        since: date | None = None,
+        until: date | None = None,
 ):
-    return await service.list(unit_of_work, user_id=current_user.id)
+    return await service.performance(unit_of_work, trading_bot_id, user_id=current_user.id, since=since, until=until)
 
 
 @router.delete(
-    '/{account_id}',
+    '/{trading_bot_id}',
     name='Delete Trading Bot',
     status_code=status.HTTP_204_NO_CONTENT,
 )
 async def delete_trading_bot(
-        account_id: int,
+        trading_bot_id: UUID4,
         unit_of_work: UnitOfWorkDep,
         service: get_trading_bots_service,
         current_user: get_current_user,
 ):
-    return await service.delete(unit_of_work, account_id, user_id=current_user.id)
+    return await service.delete(unit_of_work, trading_bot_id, user_id=current_user.id)
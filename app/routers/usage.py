@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from fastapi import APIRouter
+from pydantic import UUID4
+from starlette import status
+
+from app.routers.dependencies import UnitOfWorkDep, get_current_superuser, get_current_user, get_usage_service
+from app.schemas.usage import RouteUsage, UsageSummary, UsageTotals, UserUsage
+
+router = APIRouter(prefix="/usage", tags=["Usage"])
+
+
+@router.get(
+    '',
+    name='Usage Summary',
+    description='Token usage and estimated cost of the current user, with the most expensive threads.',
+    status_code=status.HTTP_200_OK,
+    response_model=UsageSummary,
+)
+async def get_usage(
+        unit_of_work: UnitOfWorkDep,
+        service: get_usage_service,
+        current_user: get_current_user,
+        since: datetime | None = None,
+        until: datetime | None = None,
+):
+    return await service.summary(unit_of_work, current_user.id, since=since, until=until)
+
+
+@router.get(
+    '/threads/{thread_id}',
+    name='Thread Usage',
+    status_code=status.HTTP_200_OK,
+    response_model=UsageTotals,
+)
+async def get_thread_usage(
+        thread_id: UUID4,
+        unit_of_work: UnitOfWorkDep,
+        service: get_usage_service,
+        current_user: get_current_user,
+):
+    return await service.thread_summary(unit_of_work, thread_id, user_id=current_user.id)
+
+
+@router.get(
+    '/users',
+    name='Usage By User',
+    description='Token usage of all users, most expensive first.',
+    status_code=status.HTTP_200_OK,
+    response_model=list[UserUsage],
+)
+async def get_usage_by_user(
+        unit_of_work: UnitOfWorkDep,
+        service: get_usage_service,
+        _: get_current_superuser,
+        since: datetime | None = None,
+        until: datetime | None = None,
+):
+    return await service.summary_by_user(unit_of_work, since=since, until=until)
+
+
+@router.get(
+    '/routes',
+    name='Usage By Route',
+    description='Latency and cost per model route, to tune which tasks go to which model.',
+    status_code=status.HTTP_200_OK,
+    response_model=list[RouteUsage],
+)
+async def get_usage_by_route(
+        unit_of_work: UnitOfWorkDep,
+        service: get_usage_service,
+        _: get_current_superuser,
+        since: datetime | None = None,
+        until: datetime | None = None,
+):
+    return await service.summary_by_route(unit_of_work, since=since, until=until)
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import UUID4, BaseModel, Field
+
+from app.models.jobs import JobKind, JobStatus
+
+
+class JobRead(BaseModel):
+    id: UUID4 = Field(description='Job ID')
+    kind: JobKind
+    status: JobStatus
+    result: dict | None = Field(default=None, description='Handler output once the job is done')
+    error: str | None = Field(default=None, description='Last error, kept while the job is retried')
+    attempts: int
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
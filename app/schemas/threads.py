@@ -13,6 +13,15 @@ class ThreadCreateResponse(BaseModel):
     thread_id: UUID4 = Field(description='Thread ID')
 
 
+class ThreadBulkDeleteRequest(BaseModel):
+    thread_ids: list[UUID4] = Field(description='IDs of threads to delete', min_length=1, max_length=100)
+
+
+class ThreadBulkDeleteResponse(BaseModel):
+    deleted: list[UUID4] = Field(description='Threads deleted with their messages')
+    scheduled: list[UUID4] = Field(description='Large threads hidden at once, their messages are deleted in background')
+
+
 class CreateQuestion(BaseModel):
     text: str = Field(
         description='User question. Must be at least 1 and no more than 500 characters.',
@@ -49,6 +58,21 @@ class FilterQuery(BaseModel):
     text: str | None = Field(description='Filter by text', default=None)
 
 
+class MessageSearchHit(BaseModel):
+    id: UUID4 = Field(description='Message ID')
+    thread_id: UUID4 = Field(description='Thread ID message belongs to')
+    thread_title: str | None = Field(description='Thread title')
+    role: str = Field(description='Message role', examples=['user', 'assistant'])
+    snippet: str = Field(description='Matched fragments, matched words are wrapped in <b></b>')
+    rank: float = Field(description='Relevance, higher is better')
+    created_at: datetime = Field(description='Message creation datetime')
+
+
+class MessageSearchResponse(BaseModel):
+    items: list[MessageSearchHit]
+    next_cursor: Optional[str] = Field(description='Cursor of the next page, absent on the last one', default=None)
+
+
 class Thread(BaseModel):
     id: UUID4 = Field(description='Thread ID')
     title: str = Field(description='Thread title')
@@ -69,6 +93,13 @@ class Thread(BaseModel):
         from_attributes = True
 
 
+class ThreadPreview(Thread):
+    message_count: int = Field(description='Number of user and assistant messages')
+    last_message_content: Optional[str] = Field(description='Beginning of the last message', default=None)
+    last_message_role: Optional[str] = Field(description='Role of the last message', default=None)
+    last_message_at: Optional[datetime] = Field(description='Last message creation datetime', default=None)
+
+
 class ThreadList(BaseModel):
     threads: list[Thread] = Field(description='List of threads')
 
@@ -94,6 +125,8 @@ class MessageSchema(BaseModel):
     role: str
     content: str
     created_at: datetime
+    tool_calls: Optional[list[dict]] = None
+    tool_call_id: Optional[str] = None
 
     class Config:
         orm_mode = True
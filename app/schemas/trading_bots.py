@@ -1,4 +1,6 @@
-from typing import List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, UUID4
 
 
@@ -28,3 +30,58 @@ class TradingBotList(TradingBotBase):
 
 class TradingBotUpdate(TradingBotBase):
     pass
+
+
+class BotActivityRead(BaseModel):
+    id: int
+    bot_id: UUID4
+    timestamp: datetime
+    activity_type: str = Field(description="E.g. ANALYSIS, BUY, SELL.")
+    details: Optional[dict] = Field(default=None, description="Structured decision, e.g. the answer and tool calls.")
+
+    class Config:
+        from_attributes = True
+
+
+class BotActivityPage(BaseModel):
+    items: List[BotActivityRead]
+    next_cursor: Optional[str] = Field(default=None, description="Cursor of the next (older) page, absent on the last one.")
+
+
+class BotPosition(BaseModel):
+    quantity: Decimal
+    cost: Decimal = Field(description="Average cost basis of the quantity held, in the quote asset.")
+
+
+class BotPerformanceDay(BaseModel):
+    day: date
+    trades: int
+    closed_trades: int
+    winning_trades: int
+    volume: Decimal
+    fees: Decimal
+    realized_pnl: Decimal
+    cumulative_pnl: Decimal = Field(description="Realized P&L since the first fill, at the end of the day.")
+    max_drawdown: Decimal = Field(description="Deepest realized P&L below its peak during the day.")
+
+    class Config:
+        from_attributes = True
+
+
+class BotPerformanceRead(BaseModel):
+    bot_id: UUID4
+    target_profit: int
+    return_pct: Optional[float] = Field(default=None, description="Realized P&L as a percentage of the cost of the positions closed.")
+    target_reached: bool
+    trades: int
+    closed_trades: int = Field(description="Sells of a position bought by the bot.")
+    winning_trades: int
+    win_rate: Optional[float] = Field(default=None, description="Share of closed trades with a positive P&L after fees.")
+    volume: Decimal
+    fees: Decimal
+    realized_pnl: Decimal
+    max_drawdown: Decimal
+    current_drawdown: Decimal
+    positions: Dict[str, BotPosition] = Field(default_factory=dict, description="Open positions by symbol.")
+    updated_at: Optional[datetime] = None
+    days: List[BotPerformanceDay] = Field(default_factory=list, description="Daily rollups in [since, until).")
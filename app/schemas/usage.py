@@ -0,0 +1,36 @@
+from decimal import Decimal
+
+from pydantic import UUID4, BaseModel, Field
+
+
+class UsageTotals(BaseModel):
+    runs: int = Field(description='Agent runs: chat turns and bot analyses')
+    calls: int = Field(description='Model calls, one per agent step')
+    tool_rounds: int
+    prompt_tokens: int
+    cached_tokens: int = Field(description='Prompt tokens served from the provider prompt cache')
+    completion_tokens: int
+    avg_latency_ms: float
+    cost: Decimal = Field(description='Estimated cost in USD')
+
+
+class ThreadUsage(UsageTotals):
+    thread_id: UUID4
+    title: str | None
+
+
+class UserUsage(UsageTotals):
+    user_id: UUID4
+
+
+class RouteUsage(UsageTotals):
+    route: str | None = Field(description='Task the model was picked for, empty for runs before routing')
+    model: str
+    p50_latency_ms: float
+    p95_latency_ms: float
+    avg_cost: Decimal = Field(description='Estimated cost of one run in USD')
+
+
+class UsageSummary(BaseModel):
+    total: UsageTotals
+    threads: list[ThreadUsage] = Field(description='Most expensive threads first')
@@ -2,10 +2,16 @@ from .threads import ThreadService
 from .binance import BinanceService
 from .users import UserService
 from .trading_bots import TradingBotService
+from .orders import OrderGateway
+from .jobs import JobService
+from .usage import UsageService
 
 __all__ = [
     'ThreadService',
     'BinanceService',
     'UserService',
     'TradingBotService',
+    'OrderGateway',
+    'JobService',
+    'UsageService',
 ]
\ No newline at end of file
@@ -1,58 +1,241 @@
-from binance import AsyncClient, BinanceSocketManager
+import asyncio
+import json
+from typing import Hashable
+from uuid import UUID
+
+from binance import AsyncClient
+from binance.exceptions import BinanceAPIException
+
+from app.models import BinanceAccount
+from app.models.users import BinanceAccountType
+from app.services.fake_binance import FakeAsyncClient
+from app.settings import settings
+from app.utils.cache import TTLCache
+from app.utils.crypto import decrypt_secret
+from app.utils.rate_limiter import PriorityRateLimiter, RequestPriority
+
+# Request weights of the REST endpoints in use, see Binance spot API docs
+ENDPOINT_WEIGHTS = {
+    'get_account': 20,
+    'get_all_tickers': 4,
+    'get_all_orders': 20,
+    'get_all_coins_info': 10,
+    'get_exchange_info': 20,
+    'get_symbol_ticker': 2,
+    'get_symbol_tickers': 4,
+    'get_order': 4,
+    'get_open_orders': 6,
+    'create_order': 1,
+    'cancel_order': 1,
+    'cancel_all_open_orders': 1,
+    'cancel_replace_order': 1,
+}
+ALL_OPEN_ORDERS_WEIGHT = 80
+
+DEFAULT_CLIENT_KEY = 'default'
+EVICTED_CLIENT_GRACE_PERIOD = 30  # Let in-flight requests of an evicted client finish before closing it
+
+def create_client(api_key: str | None = None, api_secret: str | None = None, testnet: bool = False) -> AsyncClient:
+    """Binance client, or its in-process stand-in when `BINANCE_FAKE` is set."""
+    if settings.binance.BINANCE_FAKE:
+        return FakeAsyncClient(api_key, api_secret, testnet=testnet, latency=settings.binance.BINANCE_FAKE_LATENCY)
+    return AsyncClient(api_key=api_key, api_secret=api_secret, testnet=testnet)
+
+
+binance_limiter = PriorityRateLimiter(
+    weight_per_minute=settings.binance.BINANCE_WEIGHT_PER_MINUTE,
+    orders_per_10s=settings.binance.BINANCE_ORDERS_PER_10S,
+)
+
+
+async def limited_call(
+    client: AsyncClient,
+    method: str,
+    priority: RequestPriority = RequestPriority.INTERACTIVE,
+    account: str | None = None,
+    orders: int = 0,
+    weight: int | None = None,
+    **params
+):
+    """Call `client.<method>` once the process-wide limiter admits it and feed back the used-weight headers."""
+    weight = weight or ENDPOINT_WEIGHTS.get(method, 1)
+    await binance_limiter.acquire(weight, priority, account=account, orders=orders)
+    try:
+        result = await getattr(client, method)(**params)
+    except BinanceAPIException as e:
+        # Headers of this very response; after network errors `client.response` still holds the previous one
+        if e.response is not None:
+            binance_limiter.observe(e.response.headers, account=account)
+        if e.status_code in (418, 429):
+            retry_after = e.response.headers.get('Retry-After') if e.response is not None else None
+            binance_limiter.penalize(float(retry_after) if retry_after else None)
+        raise
+    if client.response is not None:
+        binance_limiter.observe(client.response.headers, account=account)
+    return result
+
+
+class BinanceClientPool:
+    """
+    Per-account AsyncClient cache. Clients are kept while used and closed after
+    `idle_timeout` seconds of inactivity or when pushed out by more recently used accounts.
+    """
+
+    def __init__(self, maxsize: int, idle_timeout: float):
+        self._clients = TTLCache(maxsize, idle_timeout, sliding=True, on_evict=self._on_evict)
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    async def get(self, account: BinanceAccount) -> AsyncClient:
+        self._clients.evict_expired()
+        credentials = self._credentials(account)
+        cached = self._clients.get(account.id)
+        if cached and cached[0] == credentials:
+            return cached[1]
+
+        lock = self._locks.setdefault(account.id, asyncio.Lock())
+        async with lock:
+            cached = self._clients.get(account.id) if account.id in self._clients else None
+            if cached and cached[0] == credentials:
+                return cached[1]
+            client = create_client(
+                api_key=account.api_key,
+                api_secret=decrypt_secret(account.secret_key),
+                testnet=account.account_type == BinanceAccountType.TESTNET,
+            )
+            # Replaces, and closes, the client built with credentials the account no longer has
+            self._clients.set(account.id, (credentials, client))
+        self._locks.pop(account.id, None)
+        return client
+
+    async def get_default(self) -> AsyncClient:
+        """Client with the application keys, used for endpoints not tied to a user account."""
+        cached = self._clients.get(DEFAULT_CLIENT_KEY)
+        if cached:
+            return cached[1]
+        client = create_client(api_key=settings.binance.BINANCE_API_KEY, api_secret=settings.binance.BINANCE_API_SECRET)
+        self._clients.set(DEFAULT_CLIENT_KEY, (settings.binance.BINANCE_API_KEY, client))
+        return client
+
+    def discard(self, account_id: Hashable):
+        cached = self._clients.pop(account_id)
+        if cached:
+            self._on_evict(account_id, cached)
+
+    async def close(self):
+        clients = [client for _, client in self._clients.values()]
+        self._clients.on_evict = None
+        self._clients.clear()
+        self._clients.on_evict = self._on_evict
+        await asyncio.gather(*(client.close_connection() for client in clients), return_exceptions=True)
+
+    @staticmethod
+    def _credentials(account: BinanceAccount) -> int:
+        """Fingerprint of what a client is built from, so a rotated secret or key gets a new client."""
+        return hash((account.api_key, account.secret_key, account.account_type))
+
+    @staticmethod
+    def _on_evict(_, cached: tuple[Hashable, AsyncClient]):
+        loop = asyncio.get_running_loop()
+        loop.call_later(EVICTED_CLIENT_GRACE_PERIOD, lambda: loop.create_task(cached[1].close_connection()))
+
+    def stats(self) -> dict:
+        return self._clients.stats()
+
+
+binance_clients = BinanceClientPool(
+    maxsize=settings.binance.BINANCE_CLIENT_POOL_SIZE,
+    idle_timeout=settings.binance.BINANCE_CLIENT_IDLE_TIMEOUT,
+)
 
 
 class BinanceService:
-    def __init__(self,
-                 api_key: str,
-                 api_secret: str,
-                 testnet_api_key: str,
-                 testnet_api_secret: str,
-                 testnet: bool = True):
-        self.api_key = api_key
-        self.api_secret = api_secret
-        self.testnet_api_key = testnet_api_key
-        self.testnet_api_secret = testnet_api_secret
-        self.testnet = testnet
-
-        self.client = None
-        self.test_client = None
-        self.socket_manager = None
-        self.test_socket_manager = None
-
-    async def connect(self):
-        """Initialize the AsyncClient and SocketManager."""
-        self.client = await AsyncClient.create(
-            api_key=self.api_key,
-            api_secret=self.api_secret,
-        )
-        self.test_client = await AsyncClient.create(
-            api_key=self.testnet_api_key,
-            api_secret=self.testnet_api_secret,
-            testnet=self.testnet,
+    def __init__(
+        self,
+        client: AsyncClient,
+        default_client: AsyncClient | None = None,
+        account_id: UUID | None = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ):
+        self.client = client
+        self.default_client = default_client or client
+        self.account_id = account_id
+        self.priority = priority
+
+    @classmethod
+    async def for_account(
+        cls,
+        account: BinanceAccount,
+        priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> 'BinanceService':
+        return cls(
+            client=await binance_clients.get(account),
+            default_client=await binance_clients.get_default(),
+            account_id=account.id,
+            priority=priority,
         )
-        self.socket_manager = BinanceSocketManager(self.client)
-        self.test_socket_manager = BinanceSocketManager(self.test_client)
 
-    async def close(self):
-        """Properly close clients."""
-        if self.client:
-            await self.client.close_connection()
-        if self.test_client:
-            await self.test_client.close_connection()
+    async def _call(self, client: AsyncClient, method: str, orders: int = 0, weight: int | None = None, **params):
+        return await limited_call(
+            client, method, self.priority, account=client.API_KEY, orders=orders, weight=weight, **params
+        )
 
     async def get_account_data(self):
         """Fetch account data including balances."""
-        return await self.test_client.get_account()
+        return await self._call(self.client, 'get_account')
 
     async def get_all_tickers(self):
         """Fetch all ticker prices."""
-        return await self.test_client.get_all_tickers()
+        return await self._call(self.client, 'get_all_tickers')
 
-    async def get_all_orders(self, symbol: str):
+    async def get_all_orders(self, symbol: str, **params):
         """Fetch all orders for a specific symbol."""
-        return await self.test_client.get_all_orders(symbol=symbol)
+        return await self._call(self.client, 'get_all_orders', symbol=symbol, **params)
 
     async def get_all_coins_info(self):
         """Fetch all coin information."""
-        return await self.client.get_all_coins_info()
+        return await self._call(self.default_client, 'get_all_coins_info')
+
+    async def get_exchange_info(self):
+        """Fetch trading rules and symbol filters."""
+        return await self._call(self.client, 'get_exchange_info')
+
+    async def get_symbol_ticker(self, symbol: str):
+        """Fetch the latest price of a symbol."""
+        return await self._call(self.client, 'get_symbol_ticker', symbol=symbol)
+
+    async def get_symbol_tickers(self, symbols: list[str]):
+        """Fetch the latest prices of several symbols in one request."""
+        return await self._call(
+            self.client,
+            'get_symbol_ticker',
+            weight=ENDPOINT_WEIGHTS['get_symbol_tickers'],
+            symbols=json.dumps(symbols, separators=(',', ':')),
+        )
+
+    async def get_open_orders(self, symbol: str | None = None):
+        """Fetch open orders of a symbol or of the whole account."""
+        if symbol:
+            return await self._call(self.client, 'get_open_orders', symbol=symbol)
+        return await self._call(self.client, 'get_open_orders', weight=ALL_OPEN_ORDERS_WEIGHT)
+
+    async def get_order(self, symbol: str, order_id: int | None = None, client_order_id: str | None = None):
+        """Fetch a single order by exchange or client order id."""
+        if client_order_id:
+            return await self._call(self.client, 'get_order', symbol=symbol, origClientOrderId=client_order_id)
+        return await self._call(self.client, 'get_order', symbol=symbol, orderId=order_id)
+
+    async def create_order(self, **params):
+        """Submit a new order."""
+        return await self._call(self.client, 'create_order', orders=1, **params)
+
+    async def cancel_order(self, symbol: str, order_id: int):
+        """Cancel an open order."""
+        return await self._call(self.client, 'cancel_order', symbol=symbol, orderId=order_id)
+
+    async def cancel_all_open_orders(self, symbol: str):
+        """Cancel all open orders of a symbol in one request."""
+        return await self._call(self.client, 'cancel_all_open_orders', symbol=symbol)
 
+    async def cancel_replace_order(self, **params):
+        """Cancel an order and place a new one in one request."""
+        return await self._call(self.client, 'cancel_replace_order', orders=1, **params)
@@ -0,0 +1,155 @@
+import asyncio
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+
+from binance import AsyncClient
+from loguru import logger
+
+from app.services.binance import create_client, limited_call
+from app.settings import settings
+from app.tasks.base import PeriodicTask
+from app.utils.rate_limiter import RequestPriority
+
+ZERO = Decimal(0)
+
+
+class OrderRejected(Exception):
+    """Order failed pre-trade validation and was not sent to Binance."""
+
+
+def _decimal(value) -> Decimal:
+    return Decimal(str(value))
+
+
+def _quantum(step: Decimal) -> Decimal:
+    """Smallest unit with the precision of `step`, used to drop float noise after rounding."""
+    return Decimal(1).scaleb(step.normalize().as_tuple().exponent) if step else Decimal(1)
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolRules:
+    """Trading filters of one symbol, parsed once so that order checks are plain Decimal arithmetic."""
+
+    symbol: str
+    is_trading: bool
+    min_qty: Decimal
+    max_qty: Decimal
+    step_size: Decimal
+    qty_quantum: Decimal
+    market_min_qty: Decimal
+    market_max_qty: Decimal
+    min_price: Decimal
+    max_price: Decimal
+    tick_size: Decimal
+    price_quantum: Decimal
+    min_notional: Decimal
+    max_notional: Decimal
+
+    @classmethod
+    def from_symbol_info(cls, info: dict) -> 'SymbolRules':
+        filters = {item['filterType']: item for item in info['filters']}
+        lot_size = filters.get('LOT_SIZE', {})
+        market_lot_size = filters.get('MARKET_LOT_SIZE', {})
+        price_filter = filters.get('PRICE_FILTER', {})
+        notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+
+        step_size = _decimal(lot_size.get('stepSize', 0))
+        tick_size = _decimal(price_filter.get('tickSize', 0))
+        return cls(
+            symbol=info['symbol'],
+            is_trading=info.get('status') == 'TRADING',
+            min_qty=_decimal(lot_size.get('minQty', 0)),
+            max_qty=_decimal(lot_size.get('maxQty', 0)),
+            step_size=step_size,
+            qty_quantum=_quantum(step_size),
+            market_min_qty=_decimal(market_lot_size.get('minQty', 0)),
+            market_max_qty=_decimal(market_lot_size.get('maxQty', 0)),
+            min_price=_decimal(price_filter.get('minPrice', 0)),
+            max_price=_decimal(price_filter.get('maxPrice', 0)),
+            tick_size=tick_size,
+            price_quantum=_quantum(tick_size),
+            min_notional=_decimal(notional.get('minNotional', 0)),
+            max_notional=_decimal(notional.get('maxNotional', 0)),
+        )
+
+    def round_quantity(self, quantity) -> Decimal:
+        """Round down to the lot step, so that the order never exceeds the requested amount."""
+        quantity = _decimal(quantity)
+        if self.step_size:
+            quantity = (quantity // self.step_size) * self.step_size
+        return quantity.quantize(self.qty_quantum)
+
+    def round_price(self, price) -> Decimal:
+        price = _decimal(price)
+        if self.tick_size:
+            price = (price / self.tick_size).to_integral_value(ROUND_HALF_UP) * self.tick_size
+        return price.quantize(self.price_quantum)
+
+    def validate(self, quantity: Decimal, price: Decimal | None = None, market: bool = False):
+        if not self.is_trading:
+            raise OrderRejected(f'{self.symbol} is not trading at the moment')
+
+        min_qty = max(self.market_min_qty, self.min_qty) if market else self.min_qty
+        max_qty = (self.market_max_qty or self.max_qty) if market else self.max_qty
+        if quantity <= ZERO or quantity < min_qty or (max_qty and quantity > max_qty):
+            raise OrderRejected(f'Quantity {quantity} of {self.symbol} is outside [{min_qty}, {max_qty}]')
+
+        if price is None:
+            return
+        if price <= ZERO or price < self.min_price or (self.max_price and price > self.max_price):
+            raise OrderRejected(f'Price {price} of {self.symbol} is outside [{self.min_price}, {self.max_price}]')
+        notional = quantity * price
+        if notional < self.min_notional:
+            raise OrderRejected(f'Order value {notional} of {self.symbol} is below minimal notional {self.min_notional}')
+        if self.max_notional and notional > self.max_notional:
+            raise OrderRejected(f'Order value {notional} of {self.symbol} is above maximal notional {self.max_notional}')
+
+
+class ExchangeInfoCache(PeriodicTask):
+    """Symbol rules of the live and testnet exchanges, loaded at startup and refreshed periodically."""
+
+    name = 'exchange info refresh'
+
+    def __init__(self, interval: float = settings.binance.EXCHANGE_INFO_REFRESH_INTERVAL):
+        super().__init__(interval)
+        self._rules: dict[bool, dict[str, SymbolRules]] = {}
+        self._clients: dict[bool, AsyncClient] = {}
+        self._locks = {True: asyncio.Lock(), False: asyncio.Lock()}
+
+    async def run_once(self):
+        await asyncio.gather(self.refresh(testnet=False), self.refresh(testnet=True))
+
+    async def refresh(self, testnet: bool):
+        # exchangeInfo is public, so one unauthenticated client per network is enough
+        if testnet not in self._clients:
+            self._clients[testnet] = create_client(testnet=testnet)
+        try:
+            exchange_info = await limited_call(self._clients[testnet], 'get_exchange_info', RequestPriority.BACKGROUND)
+        except Exception as e:
+            logger.warning('Exchange info refresh failed (testnet={testnet}): {e}', testnet=testnet, e=e)
+            return
+        self._rules[testnet] = {
+            info['symbol']: SymbolRules.from_symbol_info(info) for info in exchange_info['symbols']
+        }
+        logger.info('Loaded rules of {count} symbols (testnet={testnet})', count=len(self._rules[testnet]), testnet=testnet)
+
+    async def get(self, symbol: str, testnet: bool) -> SymbolRules | None:
+        """Rules of the symbol, None when exchange info could not be loaded and Binance has to validate."""
+        if testnet not in self._rules:
+            async with self._locks[testnet]:
+                if testnet not in self._rules:
+                    await self.refresh(testnet)
+        if testnet not in self._rules:
+            return None
+        rules = self._rules[testnet].get(symbol.upper())
+        if rules is None:
+            raise OrderRejected(f'Unknown symbol {symbol}')
+        return rules
+
+    async def stop(self):
+        await super().stop()
+        await asyncio.gather(*(client.close_connection() for client in self._clients.values()), return_exceptions=True)
+        self._clients.clear()
+
+
+exchange_info = ExchangeInfoCache()
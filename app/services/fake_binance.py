@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import time
+
+from binance.exceptions import BinanceAPIException
+
+# Fixed USDT prices, so that balances, portfolio values and order checks are reproducible
+PRICES = {
+    'BTCUSDT': '67250.10',
+    'ETHUSDT': '3120.45',
+    'BNBUSDT': '585.20',
+    'SOLUSDT': '152.37',
+    'XRPUSDT': '0.5231',
+    'ADAUSDT': '0.4512',
+}
+COIN_NAMES = {'BTC': 'Bitcoin', 'ETH': 'Ethereum', 'BNB': 'BNB', 'SOL': 'Solana', 'XRP': 'XRP', 'ADA': 'Cardano'}
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+
+
+class FakeAsyncClient:
+    """
+    In-process stand-in of `binance.AsyncClient` for benchmarks and offline development.
+    Answers the endpoints used by `BinanceService` after `latency` seconds with data derived from the API key,
+    orders are kept in memory and market orders fill immediately at the fixed price.
+    """
+
+    _order_ids = itertools.count(1)
+
+    def __init__(self, api_key: str | None = None, api_secret: str | None = None, testnet: bool = False, latency: float = 0):
+        self.API_KEY = api_key
+        self.API_SECRET = api_secret
+        self.testnet = testnet
+        self.latency = latency
+        self.response = None
+        self._orders: dict[int, dict] = {}
+
+    async def _respond(self, result):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return result
+
+    def _seed(self) -> int:
+        return int(hashlib.sha256((self.API_KEY or '').encode()).hexdigest()[:8], 16)
+
+    @staticmethod
+    def _error(code: int, message: str) -> BinanceAPIException:
+        text = json.dumps({'code': code, 'msg': message})
+        return BinanceAPIException(_FakeResponse(400, text), 400, text)
+
+    async def get_account(self, **params):
+        seed = self._seed()
+        balances = [
+            {'asset': 'USDT', 'free': f'{1000 + seed % 9000}.00', 'locked': '0.00'},
+            {'asset': 'BTC', 'free': f'{(seed % 1000) / 10000:.8f}', 'locked': '0.00000000'},
+            {'asset': 'ETH', 'free': f'{(seed % 5000) / 1000:.8f}', 'locked': '0.00000000'},
+            {'asset': 'BNB', 'free': f'{(seed % 300) / 10:.8f}', 'locked': '0.00000000'},
+        ]
+        return await self._respond({
+            'makerCommission': 10,
+            'takerCommission': 10,
+            'canTrade': True,
+            'canWithdraw': True,
+            'canDeposit': True,
+            'updateTime': int(time.time() * 1000),
+            'accountType': 'SPOT',
+            'balances': balances,
+            'permissions': ['SPOT'],
+        })
+
+    async def get_all_tickers(self, **params):
+        return await self._respond([{'symbol': symbol, 'price': price} for symbol, price in PRICES.items()])
+
+    async def get_symbol_ticker(self, symbol: str | None = None, symbols: str | None = None, **params):
+        if symbols:
+            return await self._respond([
+                {'symbol': name, 'price': PRICES[name]} for name in json.loads(symbols) if name in PRICES
+            ])
+        if symbol not in PRICES:
+            raise self._error(-1121, 'Invalid symbol.')
+        return await self._respond({'symbol': symbol, 'price': PRICES[symbol]})
+
+    async def get_all_coins_info(self, **params):
+        return await self._respond([
+            {'coin': coin, 'name': name, 'free': '0', 'locked': '0', 'trading': True}
+            for coin, name in COIN_NAMES.items()
+        ])
+
+    async def get_exchange_info(self, **params):
+        symbols = [
+            {
+                'symbol': symbol,
+                'status': 'TRADING',
+                'baseAsset': symbol.removesuffix('USDT'),
+                'quoteAsset': 'USDT',
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'minPrice': '0.00010000', 'maxPrice': '1000000.00', 'tickSize': '0.0001'},
+                    {'filterType': 'LOT_SIZE', 'minQty': '0.00001000', 'maxQty': '9000.00', 'stepSize': '0.00001000'},
+                    {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'maxNotional': '9000000.00'},
+                ],
+            }
+            for symbol in PRICES
+        ]
+        return await self._respond({'timezone': 'UTC', 'serverTime': int(time.time() * 1000), 'symbols': symbols})
+
+    async def create_order(self, symbol: str, side: str, type: str, quantity, price=None, newClientOrderId=None, **params):
+        if symbol not in PRICES:
+            raise self._error(-1121, 'Invalid symbol.')
+        if newClientOrderId and any(order['clientOrderId'] == newClientOrderId for order in self._orders.values()):
+            raise self._error(-2010, 'Duplicate order sent.')
+        order_id = next(self._order_ids)
+        filled = type == 'MARKET'
+        order = {
+            'symbol': symbol,
+            'orderId': order_id,
+            'clientOrderId': newClientOrderId or f'fake-{order_id}',
+            'transactTime': int(time.time() * 1000),
+            'price': str(price or 0),
+            'origQty': str(quantity),
+            'executedQty': str(quantity) if filled else '0',
+            'cummulativeQuoteQty': str(float(quantity) * float(PRICES[symbol])) if filled else '0',
+            'status': 'FILLED' if filled else 'NEW',
+            'type': type,
+            'side': side,
+        }
+        self._orders[order_id] = order
+        return await self._respond(dict(order))
+
+    def _find(self, symbol: str, orderId: int | None = None, origClientOrderId: str | None = None) -> dict:
+        for order in self._orders.values():
+            if order['symbol'] == symbol and (order['orderId'] == orderId or order['clientOrderId'] == origClientOrderId):
+                return order
+        raise self._error(-2013, 'Order does not exist.')
+
+    async def get_order(self, symbol: str, orderId: int | None = None, origClientOrderId: str | None = None, **params):
+        return await self._respond(dict(self._find(symbol, orderId, origClientOrderId)))
+
+    async def get_all_orders(self, symbol: str, **params):
+        return await self._respond([dict(order) for order in self._orders.values() if order['symbol'] == symbol])
+
+    async def get_open_orders(self, symbol: str | None = None, **params):
+        return await self._respond([
+            dict(order) for order in self._orders.values()
+            if order['status'] == 'NEW' and (symbol is None or order['symbol'] == symbol)
+        ])
+
+    async def cancel_order(self, symbol: str, orderId: int | None = None, origClientOrderId: str | None = None, **params):
+        order = self._find(symbol, orderId, origClientOrderId)
+        if order['status'] != 'NEW':
+            raise self._error(-2011, 'Unknown order sent.')
+        order['status'] = 'CANCELED'
+        return await self._respond(dict(order))
+
+    async def cancel_all_open_orders(self, symbol: str, **params):
+        canceled = []
+        for order in self._orders.values():
+            if order['symbol'] == symbol and order['status'] == 'NEW':
+                order['status'] = 'CANCELED'
+                canceled.append(dict(order))
+        return await self._respond(canceled)
+
+    async def cancel_replace_order(self, symbol: str, cancelOrderId: int, cancelReplaceMode: str = 'STOP_ON_FAILURE', **params):
+        canceled = await self.cancel_order(symbol, cancelOrderId)
+        created = await self.create_order(symbol=symbol, **params)
+        return {'cancelResult': 'SUCCESS', 'newOrderResult': 'SUCCESS', 'cancelResponse': canceled, 'newOrderResponse': created}
+
+    async def close_connection(self):
+        pass
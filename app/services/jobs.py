@@ -0,0 +1,28 @@
+from fastapi import HTTPException
+from pydantic import UUID4
+
+from app.models import Job, JobKind
+from app.utils.unitofwork import IUnitOfWork
+
+
+class JobService:
+
+    @staticmethod
+    async def enqueue(
+        unit_of_work: IUnitOfWork,
+        kind: JobKind,
+        payload: dict,
+        user_id: UUID4 | None = None,
+        priority: int = 0,
+        **kwargs
+    ) -> Job | None:
+        async with unit_of_work:
+            return await unit_of_work.jobs.enqueue(kind, payload, priority=priority, user_id=user_id, **kwargs)
+
+    @staticmethod
+    async def retrieve(unit_of_work: IUnitOfWork, job_id: UUID4, user_id: UUID4) -> Job:
+        async with unit_of_work:
+            job = await unit_of_work.jobs.retrieve(pk=job_id)
+            if job.user_id != user_id:
+                raise HTTPException(status_code=403, detail="Access Denied.")
+            return job
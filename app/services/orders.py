@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import json
+
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from loguru import logger
+
+from app.services.binance import BinanceService
+from app.services.exchange_info import OrderRejected, exchange_info
+from app.utils.cache import TTLCache
+
+IDEMPOTENCY_TTL = 15 * 60
+ORDER_SIDES = ('BUY', 'SELL')
+ORDER_TYPES = ('LIMIT', 'MARKET', 'STOP_LOSS', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT', 'TAKE_PROFIT_LIMIT', 'LIMIT_MAKER')
+
+class OrderGateway:
+    """
+    Single entry point for order submission of both chat and analyzer agents.
+    Orders are rounded and validated locally against exchange filters and deduplicated by idempotency key,
+    so a retried tool call returns the first result instead of filling twice.
+    """
+
+    def __init__(self):
+        self._results = TTLCache(maxsize=10_000, ttl=IDEMPOTENCY_TTL)
+        self._pending: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def client_order_id(*parts) -> str:
+        """Deterministic `newClientOrderId` (max 36 chars of `[.A-Z:/a-z0-9_-]`)."""
+        digest = hashlib.sha256(json.dumps(parts, default=str, sort_keys=True).encode()).hexdigest()
+        return f'cm-{digest[:32]}'
+
+    async def place_order(
+        self,
+        service: BinanceService,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: float | None = None,
+        stop_price: float | None = None,
+        time_in_force: str = 'GTC',
+        idempotency_key: str | None = None,
+    ) -> dict:
+        params = {
+            'symbol': symbol.upper(),
+            'side': side.upper(),
+            'type': order_type.upper(),
+            'quantity': quantity,
+            'price': price,
+            'stopPrice': stop_price,
+            'timeInForce': time_in_force if order_type.upper() != 'MARKET' and price is not None else None,
+        }
+        params = await self.prepare(service, {key: value for key, value in params.items() if value is not None})
+
+        client_order_id = self.client_order_id(service.account_id, idempotency_key, params) if idempotency_key else None
+        if not client_order_id:
+            return await service.create_order(**params)
+
+        if client_order_id in self._results:
+            logger.info('Duplicate order {id} suppressed', id=client_order_id)
+            return self._results.get(client_order_id)
+        if client_order_id in self._pending:
+            return await asyncio.shield(self._pending[client_order_id])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[client_order_id] = future
+        try:
+            result = await self._submit(service, params, client_order_id)
+            self._results.set(client_order_id, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else awaits it
+            raise
+        finally:
+            self._pending.pop(client_order_id, None)
+
+    async def _submit(self, service: BinanceService, params: dict, client_order_id: str) -> dict:
+        try:
+            return await service.create_order(newClientOrderId=client_order_id, **params)
+        except (BinanceRequestException, asyncio.TimeoutError, OSError):
+            # The request may have reached the exchange, look it up before reporting a failure
+            existing = await self._find_order(service, params['symbol'], client_order_id)
+            if existing:
+                return existing
+            raise
+        except BinanceAPIException as e:
+            if e.code == -2010 and 'Duplicate' in (e.message or ''):
+                existing = await self._find_order(service, params['symbol'], client_order_id)
+                if existing:
+                    return existing
+            raise
+
+    @staticmethod
+    async def _find_order(service: BinanceService, symbol: str, client_order_id: str) -> dict | None:
+        try:
+            return await service.get_order(symbol, client_order_id=client_order_id)
+        except BinanceAPIException:
+            return None
+
+    async def replace_order(
+        self,
+        service: BinanceService,
+        symbol: str,
+        cancel_order_id: int,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: float | None = None,
+        time_in_force: str = 'GTC',
+        idempotency_key: str | None = None,
+    ) -> dict:
+        """Cancel an order and place its replacement with a single `order/cancelReplace` request."""
+        params = {
+            'symbol': symbol.upper(),
+            'side': side.upper(),
+            'type': order_type.upper(),
+            'quantity': quantity,
+            'price': price,
+            'timeInForce': time_in_force if order_type.upper() != 'MARKET' and price is not None else None,
+        }
+        params = await self.prepare(service, {key: value for key, value in params.items() if value is not None})
+        if idempotency_key:
+            params['newClientOrderId'] = self.client_order_id(service.account_id, idempotency_key, cancel_order_id, params)
+        return await service.cancel_replace_order(
+            cancelReplaceMode='STOP_ON_FAILURE',
+            cancelOrderId=cancel_order_id,
+            **params
+        )
+
+    @staticmethod
+    async def cancel_orders(service: BinanceService, symbol: str, order_ids: list[int] | None = None) -> list[dict]:
+        """Cancel given orders concurrently, or all open orders of the symbol with one request."""
+        if not order_ids:
+            return await service.cancel_all_open_orders(symbol.upper())
+        results = await asyncio.gather(
+            *(service.cancel_order(symbol.upper(), order_id) for order_id in order_ids),
+            return_exceptions=True
+        )
+        return [
+            {'orderId': order_id, 'error': str(result)} if isinstance(result, Exception) else result
+            for order_id, result in zip(order_ids, results)
+        ]
+
+    @staticmethod
+    async def prepare(service: BinanceService, params: dict) -> dict:
+        """Check side and type, round quantity and prices to the symbol precision and check them against its filters."""
+        if params['side'] not in ORDER_SIDES:
+            raise OrderRejected(f"Side {params['side']} is not one of {', '.join(ORDER_SIDES)}")
+        if params['type'] not in ORDER_TYPES:
+            raise OrderRejected(f"Order type {params['type']} is not one of {', '.join(ORDER_TYPES)}")
+
+        rules = await exchange_info.get(params['symbol'], testnet=service.client.testnet)
+        if rules is None:
+            return params
+
+        quantity = rules.round_quantity(params['quantity'])
+        price = rules.round_price(params['price']) if 'price' in params else None
+        rules.validate(quantity, price, market=params['type'] == 'MARKET')
+
+        params = {**params, 'quantity': format(quantity, 'f')}
+        if price is not None:
+            params['price'] = format(price, 'f')
+        if 'stopPrice' in params:
+            params['stopPrice'] = format(rules.round_price(params['stopPrice']), 'f')
+        return params
+
+
+order_gateway = OrderGateway()
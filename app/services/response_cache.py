@@ -0,0 +1,232 @@
+import hashlib
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+from loguru import logger
+
+from app.settings import settings
+from app.tasks.base import PeriodicTask
+from app.utils.cache import TTLCache
+from app.utils.unitofwork import UnitOfWork
+
+PURGE_INTERVAL = 600
+
+# Tools that only read data; answers of turns that ran any other tool, e.g. placed an order, are never cached
+READ_ONLY_TOOLS = frozenset({
+    'check_balance',
+    'get_latest_price',
+    'get_latest_prices',
+    'get_open_orders',
+    'check_order_status',
+    'get_recent_trades',
+})
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class ResponseCacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        raise NotImplemented
+
+    @abstractmethod
+    async def set(self, key: str, scope: str, prompt: str, response: str, ttl: float):
+        raise NotImplemented
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryResponseBackend(ResponseCacheBackend):
+    """Per-process LRU, answers are not shared between API workers."""
+
+    def __init__(self, maxsize: int):
+        self._responses = TTLCache(maxsize, ttl=settings.cache.RESPONSE_CACHE_TTL)
+
+    async def get(self, key: str) -> str | None:
+        return self._responses.get(key)
+
+    async def set(self, key: str, scope: str, prompt: str, response: str, ttl: float):
+        self._responses.set(key, response, ttl=ttl)
+
+    def stats(self) -> dict:
+        return {'size': len(self._responses), 'maxsize': self._responses.maxsize}
+
+
+class PostgresResponseBackend(ResponseCacheBackend):
+    """Answers shared by all processes through the `cached_response` table."""
+
+    async def get(self, key: str) -> str | None:
+        async with UnitOfWork() as unit_of_work:
+            return await unit_of_work.cached_responses.get_response(key)
+
+    async def set(self, key: str, scope: str, prompt: str, response: str, ttl: float):
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.cached_responses.upsert(key, scope, prompt, response, ttl)
+
+
+class SemanticIndex:
+    """
+    In-process embedding index of cached prompts, searched by cosine similarity.
+    It only points to backend keys, so it is rebuilt per process while answers may live in Postgres.
+    """
+
+    def __init__(self, maxsize: int, threshold: float, model: str):
+        self.threshold = threshold
+        self.model = model
+        self._vectors = TTLCache(maxsize, ttl=settings.cache.RESPONSE_CACHE_TTL)
+        self._recent = TTLCache(1000, ttl=60)  # Embeddings of missed prompts, reused when the answer is stored
+        self._embeddings: OpenAIEmbeddings | None = None
+
+    async def embed(self, text: str) -> np.ndarray:
+        vector = self._recent.get(text)
+        if vector is None:
+            if self._embeddings is None:
+                self._embeddings = OpenAIEmbeddings(model=self.model)
+            vector = np.asarray(await self._embeddings.aembed_query(text), dtype=np.float32)
+            vector /= np.linalg.norm(vector)
+            self._recent.set(text, vector)
+        return vector
+
+    async def search(self, text: str, scope: str) -> str | None:
+        self._vectors.evict_expired()
+        entries = [(key, vector) for key, entry_scope, vector in self._vectors.values() if entry_scope == scope]
+        if not entries:
+            return None
+        vector = await self.embed(text)
+        similarities = np.stack([entry_vector for _, entry_vector in entries]) @ vector
+        best = int(np.argmax(similarities))
+        return entries[best][0] if similarities[best] >= self.threshold else None
+
+    async def add(self, text: str, key: str, scope: str, ttl: float):
+        self._vectors.set(key, (key, scope, await self.embed(text)), ttl=ttl)
+
+
+class ResponseCache:
+    """
+    Cache of complete chat answers for standalone prompts, never shared between users.
+
+    Answers produced without tool calls are kept with a long TTL. Answers built from account or market data
+    by read-only tools are scoped to the Binance account as well and expire quickly; turns that ran any other tool
+    are not cached, so a repeated order prompt always reaches the agent.
+    Exact matches on the normalised prompt are tried first, then the optional embedding similarity tier,
+    which only covers tool-free answers, as "BTC balance" and "ETH balance" are close but not interchangeable.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, semantic_index: SemanticIndex | None = None):
+        self.backend = backend
+        self.semantic_index = semantic_index
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        prompt = unicodedata.normalize('NFKC', prompt).casefold()
+        return _WHITESPACE.sub(' ', prompt).strip().rstrip('?!. ')
+
+    @staticmethod
+    def key(scope: str, normalized: str) -> str:
+        return hashlib.sha256(f'{scope}:{normalized}'.encode()).hexdigest()
+
+    @staticmethod
+    def user_scope(user_id: UUID) -> str:
+        return f'user:{user_id}'
+
+    @staticmethod
+    def account_scope(user_id: UUID, account_id: UUID | None) -> str | None:
+        return f'user:{user_id}:account:{account_id}' if account_id else None
+
+    async def get(self, prompt: str, user_id: UUID, account_id: UUID | None = None) -> str | None:
+        normalized = self.normalize(prompt)
+        for scope in filter(None, (self.user_scope(user_id), self.account_scope(user_id, account_id))):
+            response = await self.backend.get(self.key(scope, normalized))
+            if response is not None:
+                self.exact_hits += 1
+                return response
+
+        if self.semantic_index:
+            try:
+                key = await self.semantic_index.search(normalized, self.user_scope(user_id))
+            except Exception as e:
+                logger.warning('Semantic cache lookup failed: {e}', e=e)
+                key = None
+            response = await self.backend.get(key) if key else None
+            if response is not None:
+                self.semantic_hits += 1
+                return response
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        prompt: str,
+        response: str,
+        user_id: UUID,
+        account_id: UUID | None = None,
+        tools: set[str] = frozenset(),
+    ):
+        """Store the answer of a turn that ran `tools`, unless one of them is not read-only."""
+        if not response or not tools <= READ_ONLY_TOOLS:
+            return
+        scope = self.account_scope(user_id, account_id) if tools else self.user_scope(user_id)
+        if scope is None:
+            return
+        ttl = settings.cache.RESPONSE_CACHE_MARKET_TTL if tools else settings.cache.RESPONSE_CACHE_TTL
+
+        normalized = self.normalize(prompt)
+        key = self.key(scope, normalized)
+        await self.backend.set(key, scope, normalized, response, ttl)
+        if self.semantic_index and not tools:
+            try:
+                await self.semantic_index.add(normalized, key, scope, ttl)
+            except Exception as e:
+                logger.warning('Semantic cache indexing failed: {e}', e=e)
+
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            'enabled': settings.CACHING_ENABLED,
+            'backend': type(self.backend).__name__,
+            'exact_hits': self.exact_hits,
+            'semantic_hits': self.semantic_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.exact_hits + self.semantic_hits) / lookups, 3) if lookups else None,
+            **self.backend.stats(),
+        }
+
+
+class ResponseCachePurger(PeriodicTask):
+    """Deletes expired rows of the Postgres backend."""
+
+    name = 'response cache purger'
+
+    def __init__(self, interval: float = PURGE_INTERVAL):
+        super().__init__(interval)
+
+    async def run_once(self):
+        async with UnitOfWork() as unit_of_work:
+            count = await unit_of_work.cached_responses.purge_expired()
+        logger.debug('Purged {count} expired cached responses', count=count)
+
+
+def _create_response_cache() -> ResponseCache:
+    if settings.cache.RESPONSE_CACHE_BACKEND == 'postgres':
+        backend = PostgresResponseBackend()
+    else:
+        backend = MemoryResponseBackend(settings.cache.RESPONSE_CACHE_SIZE)
+    semantic_index = SemanticIndex(
+        maxsize=settings.cache.RESPONSE_CACHE_SIZE,
+        threshold=settings.cache.RESPONSE_CACHE_SIMILARITY,
+        model=settings.cache.RESPONSE_CACHE_EMBEDDING_MODEL,
+    ) if settings.cache.RESPONSE_CACHE_SEMANTIC_ENABLED else None
+    return ResponseCache(backend, semantic_index)
+
+
+response_cache = _create_response_cache()
+response_cache_purger = ResponseCachePurger()
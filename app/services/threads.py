@@ -1,8 +1,25 @@
+import datetime
+import time
+from typing import List
+
+from langchain_core.messages import AIMessage, HumanMessage
 from pydantic import UUID4
+from sqlalchemy import func
 
+from app.inference.agent import split_turns
+from app.inference.chat.model import ChatModel
+from app.inference.history import from_chat_messages, to_chat_messages
+from app.inference.routing import route_prompt
+from app.inference.usage import summarize_usage
+from app.repositories.threads import MessageLoading
 from app.schemas.threads import ThreadMessagesByIdResponse, ThreadCreateRequest
+from app.services.binance import BinanceService
+from app.services.response_cache import response_cache
+from app.services.usage import usage_recorder
+from app.settings import settings
+from app.utils.rate_limiter import RequestPriority
 from app.utils.unitofwork import IUnitOfWork
-from app.models import Thread
+from app.models import JobKind, Message, Thread
 from uuid import uuid4
 
 
@@ -19,20 +36,80 @@ class ThreadService:
             return new_thread
 
     @staticmethod
-    async def retrieve(unit_of_work: IUnitOfWork, thread_id: UUID4):
+    async def retrieve(
+        unit_of_work: IUnitOfWork,
+        thread_id: UUID4,
+        messages: MessageLoading = MessageLoading.NONE,
+        latest: int | None = None,
+        **filter_by,
+    ):
         async with unit_of_work:
-            return await unit_of_work.threads.get_thread_with_messages(pk=thread_id)
+            return await unit_of_work.threads.get_thread(
+                messages=messages, latest=latest, pk=thread_id, deleted_at=None, **filter_by
+            )
 
     @staticmethod
     async def list(unit_of_work: IUnitOfWork, page: int, per_page: int, **filter_by) -> dict:
         async with unit_of_work:
-            return await unit_of_work.threads.list(page=page, per_page=per_page, **filter_by)
+            return await unit_of_work.threads.list(page=page, per_page=per_page, deleted_at=None, **filter_by)
+
+    @staticmethod
+    async def delete(unit_of_work: IUnitOfWork, user_id: int, thread_ids: List[UUID4]) -> dict:
+        """
+        Delete threads of the user with their messages and agent checkpoints, in set-based statements.
+        Threads with more than THREAD_DELETE_INLINE_LIMIT messages are hidden at once and deleted by a job.
+        """
+        async with unit_of_work:
+            large = await unit_of_work.threads.find_large(
+                thread_ids, settings.jobs.THREAD_DELETE_INLINE_LIMIT, user_id=user_id, deleted_at=None
+            )
+            deleted = await unit_of_work.threads.delete_many(
+                [thread_id for thread_id in thread_ids if thread_id not in large], user_id=user_id, deleted_at=None
+            )
+            scheduled = await unit_of_work.threads.mark_deleted(large, user_id=user_id)
+            await unit_of_work.checkpoints.delete_threads([str(thread_id) for thread_id in deleted + scheduled])
+            if scheduled:
+                await unit_of_work.jobs.enqueue(
+                    JobKind.THREAD_DELETE,
+                    {"thread_ids": [str(thread_id) for thread_id in scheduled]},
+                    priority=RequestPriority.BACKGROUND,
+                    user_id=user_id,
+                )
+        return {"deleted": deleted, "scheduled": scheduled}
+
+    @staticmethod
+    async def purge(unit_of_work: IUnitOfWork, thread_ids: List[str], chunk_size: int) -> dict:
+        """Delete hidden threads `chunk_size` messages per transaction, so that no statement holds locks for long."""
+        messages = 0
+        for thread_id in thread_ids:
+            deleted = chunk_size
+            while deleted == chunk_size:
+                async with unit_of_work:
+                    deleted = await unit_of_work.messages.delete_chunk(thread_id, chunk_size)
+                messages += deleted
+            async with unit_of_work:
+                await unit_of_work.threads.delete_many([thread_id])
+        return {"threads": len(thread_ids), "messages": messages}
+
+    @staticmethod
+    async def list_with_preview(unit_of_work: IUnitOfWork, page: int, per_page: int, user_id: int) -> dict:
+        async with unit_of_work:
+            return await unit_of_work.threads.list_with_preview(page=page, per_page=per_page, user_id=user_id)
 
     @staticmethod
     async def list_messages(unit_of_work: IUnitOfWork, page: int, per_page: int, **filter_by) -> dict:
         async with unit_of_work:
             return await unit_of_work.messages.list(page=page, per_page=per_page, **filter_by)
 
+    @staticmethod
+    async def search(
+        unit_of_work: IUnitOfWork, user_id: int, text: str, limit: int, cursor: str | None = None, fuzzy: bool = False
+    ) -> dict:
+        async with unit_of_work:
+            return await unit_of_work.messages.search(
+                user_id=user_id, text=text, limit=limit, cursor=cursor, fuzzy=fuzzy
+            )
+
     @staticmethod
     async def add_message(unit_of_work: IUnitOfWork, thread_id: UUID4, message):
         async with unit_of_work:
@@ -43,8 +120,75 @@ class ThreadService:
                 role=message["role"]
             )
 
+    @staticmethod
+    async def add_messages(unit_of_work: IUnitOfWork, thread_id: UUID4, messages: List[dict]):
+        """Store messages of one turn in a single transaction, keeping their order."""
+        async with unit_of_work:
+            # A reply to an archived thread brings its history back first
+            await unit_of_work.thread_archives.restore(thread_id)
+            for message in messages:
+                # now() is fixed within a transaction, clock_timestamp() keeps the messages ordered
+                await unit_of_work.add(
+                    Message(id=uuid4(), thread_id=thread_id, created_at=func.clock_timestamp(), **message)
+                )
+
     @staticmethod
     async def get_messages(unit_of_work: IUnitOfWork, user_id: int, thread_id: str) -> ThreadMessagesByIdResponse:
         async with unit_of_work:
-            thread = await unit_of_work.threads.get_thread_with_messages(pk=thread_id, user_id=user_id)
+            thread = await unit_of_work.threads.get_thread(
+                messages=MessageLoading.ALL, pk=thread_id, user_id=user_id, deleted_at=None
+            )
             return ThreadMessagesByIdResponse.model_validate(thread)
+
+    @staticmethod
+    async def reply(
+        unit_of_work: IUnitOfWork,
+        thread_id: UUID4,
+        content: str,
+        binance_service: BinanceService | None = None,
+        run_key: str | None = None,
+    ) -> dict:
+        """
+        Answer `content` with the chat agent in context of the thread history.
+        The question, tool calls with their results and the answer are stored, so later turns can reuse them.
+        A turn of the thread interrupted before its answer is finished and stored ahead of this one.
+        """
+        thread = await ThreadService.retrieve(
+            unit_of_work, thread_id, messages=MessageLoading.LATEST, latest=settings.llm.CHAT_HISTORY_MESSAGES
+        )
+        # Only standalone prompts are cached, follow-ups depend on the thread history
+        use_cache = settings.CACHING_ENABLED and not thread.messages
+        account_id = binance_service.account_id if binance_service else None
+
+        model_response = await response_cache.get(content, thread.user_id, account_id) if use_cache else None
+        if model_response is None:
+            chat_model = ChatModel(route=route_prompt(content))
+            started_at = time.monotonic()
+            conversation = await chat_model.complete(
+                [HumanMessage(content=content)],
+                binance_service=binance_service,
+                run_key=run_key,
+                thread_id=thread.id,
+                history=to_chat_messages(thread.messages),
+            )
+            usage_recorder.record(
+                user_id=thread.user_id,
+                thread_id=thread.id,
+                route=chat_model.route.value,
+                **summarize_usage(conversation, chat_model.model.model_name, time.monotonic() - started_at)
+            )
+            model_response = conversation[-1].content
+            new_messages = from_chat_messages(conversation)
+            # Not cached when an interrupted turn was finished first, the answer then follows from it
+            if use_cache and len(split_turns(conversation)) == 1:
+                tools = {
+                    call['name']
+                    for message in conversation if isinstance(message, AIMessage)
+                    for call in message.tool_calls
+                }
+                await response_cache.set(content, model_response, thread.user_id, account_id, tools=tools)
+        else:
+            new_messages = [{"role": 'user', "content": content}, {"role": 'assistant', "content": model_response}]
+
+        await ThreadService.add_messages(unit_of_work, thread_id, new_messages)
+        return {"role": 'assistant', "content": model_response, "created_at": datetime.datetime.utcnow().isoformat()}
@@ -1,28 +1,186 @@
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import HTTPException
+from langchain_core.messages import AIMessage, ToolMessage
 from pydantic import UUID4
 
+from app.inference.agent import split_turns
+from app.inference.analyzer.model import AnalyzerModel
+from app.inference.analyzer.prompts import bot_prompt
+from app.inference.usage import summarize_usage
+from app.models import BotPerformance, TradingBot
 from app.schemas.trading_bots import TradingBotCreate
-from app.utils.unitofwork import IUnitOfWork
+from app.services.binance import BinanceService
+from app.services.usage import usage_recorder
+from app.settings import settings
+from app.tasks.base import BufferedRecorder
+from app.utils.rate_limiter import RequestPriority
+from app.utils.unitofwork import IUnitOfWork, UnitOfWork
+
+MAX_PENDING_ACTIVITIES = 10_000
+
+
+def _order_fill(order: dict) -> dict | None:
+    """Executed part of a Binance order response as BUY or SELL activity details, None if nothing was filled."""
+    symbol, fills = order['symbol'], order.get('fills') or []
+    quantity = Decimal(order.get('executedQty') or 0)
+    if quantity <= 0:
+        return None
+    quote_quantity = Decimal(order.get('cummulativeQuoteQty') or 0)
+    if quote_quantity <= 0:
+        quote_quantity = sum((Decimal(fill['price']) * Decimal(fill['qty']) for fill in fills), Decimal(0))
+    if quote_quantity <= 0:
+        quote_quantity = quantity * Decimal(order.get('price') or 0)
+    # Commission in the quote asset is taken as is, in the base asset at the fill price; other assets (BNB) are left out
+    commission = Decimal(0)
+    for fill in fills:
+        asset = fill.get('commissionAsset') or ''
+        if asset and symbol.endswith(asset):
+            commission += Decimal(fill['commission'])
+        elif asset and symbol.startswith(asset):
+            commission += Decimal(fill['commission']) * Decimal(fill['price'])
+    return {
+        "symbol": symbol,
+        "side": order['side'],
+        "quantity": str(quantity),
+        "quote_quantity": str(quote_quantity),
+        "price": format(quote_quantity / quantity, 'f'),
+        "commission": str(commission),
+        "order_id": order.get('orderId'),
+    }
+
+
+def _fills(conversation: list) -> list[dict]:
+    """Fills of the orders placed during an agent run, read from the results of its `place_order` calls."""
+    fills = {}
+    for message in conversation:
+        if not isinstance(message, ToolMessage) or message.name != 'place_order':
+            continue
+        try:
+            order = json.loads(message.content)
+            fill = _order_fill(order) if isinstance(order, dict) and 'error' not in order else None
+        except (TypeError, ValueError, KeyError, ArithmeticError):
+            continue
+        if fill:
+            # Orders repeated within the run are suppressed and answered with the same response
+            fills[fill['order_id'] or len(fills)] = fill
+    return list(fills.values())
+
+
+async def store_activities(rows: list[dict]):
+    async with UnitOfWork() as unit_of_work:
+        await unit_of_work.bot_activities.bulk_create(rows)
+
+
+class BotActivityRecorder(BufferedRecorder):
+    """Buffers bot activity and appends it to the log with one bulk insert per interval."""
+
+    name = 'bot activity recorder'
+
+    def __init__(self, interval: float = settings.jobs.ACTIVITY_FLUSH_INTERVAL):
+        super().__init__(store_activities, interval, max_pending=MAX_PENDING_ACTIVITIES)
+
+    def record(self, bot_id: UUID4, activity_type: str, details: dict | None = None):
+        # Timestamped when it happens rather than when flushed
+        super().record(bot_id=bot_id, activity_type=activity_type, details=details, timestamp=datetime.utcnow())
+
+
+bot_activity_recorder = BotActivityRecorder()
 
 
 class TradingBotService:
 
     @staticmethod
     async def create(unit_of_work: IUnitOfWork, data: TradingBotCreate, user_id: UUID4):
-        """Create a new thread with the first message."""
-        model_dict = data.model_dump()
+        """Create a new trading bot of the user."""
+        model_dict = data.model_dump(exclude={'user_id'})
         async with unit_of_work:
             return await unit_of_work.trading_bots.create(user_id=user_id, **model_dict)
 
     @staticmethod
-    async def retrieve(unit_of_work: IUnitOfWork, trading_bot_id: UUID4):
+    async def retrieve(unit_of_work: IUnitOfWork, trading_bot_id: UUID4, user_id: UUID4 | None = None) -> TradingBot:
         async with unit_of_work:
-            return await unit_of_work.trading_bots.retrieve(pk=trading_bot_id)
+            trading_bot = await unit_of_work.trading_bots.retrieve(pk=trading_bot_id)
+            if user_id and trading_bot.user_id != user_id:
+                raise HTTPException(status_code=403, detail="Access Denied.")
+            return trading_bot
 
     @staticmethod
     async def list(unit_of_work: IUnitOfWork, page: int, per_page: int, **filter_by):
         async with unit_of_work:
             return await unit_of_work.trading_bots.list(page=page, per_page=per_page, **filter_by)
 
+    @staticmethod
+    async def list_activity(
+        unit_of_work: IUnitOfWork,
+        trading_bot_id: UUID4,
+        user_id: UUID4,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        activity_type: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict:
+        async with unit_of_work:
+            trading_bot = await unit_of_work.trading_bots.retrieve(pk=trading_bot_id)
+            if trading_bot.user_id != user_id:
+                raise HTTPException(status_code=403, detail="Access Denied.")
+            return await unit_of_work.bot_activities.list_range(
+                trading_bot_id, since=since, until=until, activity_type=activity_type, limit=limit, cursor=cursor
+            )
+
+    @staticmethod
+    async def performance(
+        unit_of_work: IUnitOfWork,
+        trading_bot_id: UUID4,
+        user_id: UUID4,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> dict:
+        """Running performance of the bot against its target profit, with its daily rollups in [since, until)."""
+        async with unit_of_work:
+            trading_bot = await unit_of_work.trading_bots.retrieve(pk=trading_bot_id)
+            if trading_bot.user_id != user_id:
+                raise HTTPException(status_code=403, detail="Access Denied.")
+            performance = await unit_of_work.bot_performance.get_object_or_none(bot_id=trading_bot_id)
+            days = await unit_of_work.bot_performance.list_daily(trading_bot_id, since=since, until=until)
+
+        if performance is None:
+            # No fills aggregated yet
+            performance = BotPerformance(
+                bot_id=trading_bot.id, positions={}, trades=0, closed_trades=0, winning_trades=0,
+                volume=0, fees=0, realized_pnl=0, closed_cost=0, peak_pnl=0, max_drawdown=0,
+            )
+        return_pct = performance.return_pct
+        return {
+            "bot_id": trading_bot.id,
+            "target_profit": trading_bot.target_profit,
+            "return_pct": return_pct,
+            "target_reached": return_pct is not None and return_pct >= trading_bot.target_profit,
+            "trades": performance.trades,
+            "closed_trades": performance.closed_trades,
+            "winning_trades": performance.winning_trades,
+            "win_rate": performance.win_rate,
+            "volume": performance.volume,
+            "fees": performance.fees,
+            "realized_pnl": performance.realized_pnl,
+            "max_drawdown": performance.max_drawdown,
+            "current_drawdown": performance.drawdown,
+            "positions": {
+                symbol: {"quantity": quantity, "cost": cost} for symbol, (quantity, cost) in performance.positions.items()
+            },
+            "updated_at": performance.updated_at,
+            "days": days,
+        }
+
+    @staticmethod
+    async def list_active(unit_of_work: IUnitOfWork):
+        async with unit_of_work:
+            return await unit_of_work.trading_bots.list_active()
+
     @staticmethod
     async def update(unit_of_work: IUnitOfWork, data):
         model_dict = data.model_dump()
@@ -30,6 +188,57 @@ class TradingBotService:
             return await unit_of_work.trading_bots.update(model_dict)
 
     @staticmethod
-    async def delete(unit_of_work: IUnitOfWork, trading_bot_id: UUID4):
+    async def delete(unit_of_work: IUnitOfWork, trading_bot_id: UUID4, user_id: UUID4):
         async with unit_of_work:
-            return await unit_of_work.trading_bots.delete(pk=trading_bot_id)
\ No newline at end of file
+            trading_bot = await unit_of_work.trading_bots.retrieve(pk=trading_bot_id)
+            if trading_bot.user_id != user_id:
+                raise HTTPException(status_code=403, detail="Access Denied.")
+            await unit_of_work.trading_bots.delete(pk=trading_bot_id)
+
+    @staticmethod
+    async def analyze(unit_of_work: IUnitOfWork, trading_bot_id: UUID4, run_key: str | None = None) -> dict:
+        """Run one analyzer pass of the bot on its Binance account and log it as bot activity."""
+        async with unit_of_work:
+            trading_bot = await unit_of_work.trading_bots.retrieve(pk=trading_bot_id)
+            account = await unit_of_work.binance_accounts.retrieve(pk=trading_bot.binance_account_id)
+
+        binance_service = await BinanceService.for_account(account, priority=RequestPriority.BOT)
+        task = bot_prompt.format(
+            tickers=', '.join(trading_bot.tickers),
+            risk_tolerance=trading_bot.risk_tolerance,
+            target_profit=trading_bot.target_profit,
+        )
+        messages = [
+            {"role": 'user', "content": '\n'.join(filter(None, [trading_bot.base_prompt, task, trading_bot.additional_notes]))},
+        ]
+        analyzer = AnalyzerModel()
+        started_at = time.monotonic()
+        conversation = await analyzer.complete(
+            messages,
+            binance_service=binance_service,
+            run_key=run_key,
+            thread_id=f'bot:{trading_bot.id}',
+        )
+        usage_recorder.record(
+            user_id=trading_bot.user_id,
+            trading_bot_id=trading_bot.id,
+            route=analyzer.route.value,
+            **summarize_usage(conversation, analyzer.model.model_name, time.monotonic() - started_at)
+        )
+        response = conversation[-1].content
+
+        # An analysis interrupted earlier is finished first and logged as its own entry
+        for turn in split_turns(conversation):
+            bot_activity_recorder.record(trading_bot.id, 'ANALYSIS', {
+                "content": turn[-1].content,
+                "tool_calls": [
+                    {"name": call['name'], "args": call['args']}
+                    for message in turn if isinstance(message, AIMessage)
+                    for call in message.tool_calls
+                ],
+                "model": analyzer.model.model_name,
+                "run_key": run_key,
+            })
+            for fill in _fills(turn):
+                bot_activity_recorder.record(trading_bot.id, fill['side'], {**fill, "run_key": run_key})
+        return {"bot_id": str(trading_bot.id), "content": response}
@@ -0,0 +1,87 @@
+from datetime import datetime, time
+
+from fastapi import HTTPException
+from pydantic import UUID4
+
+from app.models import User
+from app.settings import settings
+from app.tasks.base import BufferedRecorder
+from app.utils.unitofwork import IUnitOfWork, UnitOfWork
+
+MAX_PENDING_ROWS = 10_000
+
+
+async def store_usage(rows: list[dict]):
+    async with UnitOfWork() as unit_of_work:
+        await unit_of_work.llm_usage.bulk_create(rows)
+
+
+class UsageRecorder(BufferedRecorder):
+    """Buffers usage rows of agent runs and stores them with one bulk insert per interval."""
+
+    name = 'usage recorder'
+
+    def __init__(self, interval: float = settings.llm.USAGE_FLUSH_INTERVAL):
+        super().__init__(store_usage, interval, max_pending=MAX_PENDING_ROWS)
+
+    def pending_tokens(self, user_id) -> int:
+        return sum(
+            row['prompt_tokens'] + row['completion_tokens'] for row in self._rows if row['user_id'] == user_id
+        )
+
+
+usage_recorder = UsageRecorder()
+
+
+class UsageService:
+
+    @staticmethod
+    async def summary(
+        unit_of_work: IUnitOfWork,
+        user_id: UUID4,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> dict:
+        async with unit_of_work:
+            return {
+                "total": await unit_of_work.llm_usage.get_totals(since, until, user_id=user_id),
+                "threads": await unit_of_work.llm_usage.get_totals_by_thread(user_id, since, until),
+            }
+
+    @staticmethod
+    async def thread_summary(unit_of_work: IUnitOfWork, thread_id: UUID4, user_id: UUID4) -> dict:
+        async with unit_of_work:
+            thread = await unit_of_work.threads.retrieve(pk=thread_id)
+            if thread.user_id != user_id:
+                raise HTTPException(status_code=403, detail="Access Denied.")
+            return await unit_of_work.llm_usage.get_totals(thread_id=thread_id)
+
+    @staticmethod
+    async def summary_by_user(
+        unit_of_work: IUnitOfWork,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[dict]:
+        async with unit_of_work:
+            return await unit_of_work.llm_usage.get_totals_by_user(since, until)
+
+    @staticmethod
+    async def summary_by_route(
+        unit_of_work: IUnitOfWork,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[dict]:
+        async with unit_of_work:
+            return await unit_of_work.llm_usage.get_totals_by_route(since, until)
+
+    @staticmethod
+    async def check_budget(unit_of_work: IUnitOfWork, user: User):
+        """Reject new agent runs once the user spent the daily token budget."""
+        budget = user.daily_token_budget or settings.llm.DAILY_TOKEN_BUDGET
+        if not budget:
+            return
+        since = datetime.combine(datetime.utcnow().date(), time.min)
+        async with unit_of_work:
+            used = await unit_of_work.llm_usage.get_used_tokens(user.id, since)
+        if used + usage_recorder.pending_tokens(user.id) >= budget:
+            raise HTTPException(status_code=429, detail="Daily token budget exceeded.")
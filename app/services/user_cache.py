@@ -0,0 +1,40 @@
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.models import User
+from app.settings import settings
+from app.utils.cache import TTLCache
+
+
+class UserCache:
+    """
+    Per-process cache of authenticated users, so that JWT requests do not query the user table.
+    Entries are detached copies of the column values, keyed by user id and checked against the token version.
+    Updates invalidate the entry of this process, other processes pick them up after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._users = TTLCache(maxsize, ttl)
+
+    def get(self, user_id: UUID, token_version: int) -> User | None:
+        user = self._users.get(user_id)
+        if user is None or user.token_version != token_version:
+            return None
+        return user
+
+    def set(self, user: User):
+        # Cache a copy, the loaded instance belongs to the request session and may still be modified there
+        snapshot = User(**{attribute.key: getattr(user, attribute.key) for attribute in inspect(User).column_attrs})
+        make_transient_to_detached(snapshot)
+        self._users.set(user.id, snapshot)
+
+    def invalidate(self, user_id: UUID):
+        self._users.pop(user_id)
+
+    def stats(self) -> dict:
+        return self._users.stats()
+
+
+user_cache = UserCache(settings.auth.user_cache_size, ttl=settings.auth.user_cache_ttl)
@@ -1,6 +1,14 @@
+from datetime import timedelta
+
 from fastapi import HTTPException
+from pydantic import UUID4
 
+from app.exceptions.request_exceptions import NotFoundException
+from app.models import BinanceAccount
 from app.schemas.binance import AddBinanceAccountRequest
+from app.services.binance import binance_clients
+from app.settings import settings
+from app.utils.crypto import encrypt_secret
 from app.utils.unitofwork import IUnitOfWork
 
 
@@ -9,6 +17,7 @@ class UserService:
     @staticmethod
     async def add_binance_account(unit_of_work: IUnitOfWork, data: AddBinanceAccountRequest, user_id: str):
         binance_account = data.model_dump()
+        binance_account['secret_key'] = encrypt_secret(binance_account['secret_key'])
         async with unit_of_work:
             return await unit_of_work.binance_accounts.create(user_id=user_id, **binance_account)
 
@@ -17,10 +26,37 @@ class UserService:
         async with unit_of_work:
             return await unit_of_work.binance_accounts.list(user_id=user_id)
 
+    @staticmethod
+    async def get_binance_account(
+        unit_of_work: IUnitOfWork,
+        user_id: str,
+        account_id: UUID4 | None = None
+    ) -> BinanceAccount:
+        """Given account of the user, or the first active one when `account_id` is omitted."""
+        async with unit_of_work:
+            if account_id:
+                account = await unit_of_work.binance_accounts.retrieve(pk=account_id)
+                if account.user_id != user_id:
+                    raise HTTPException(status_code=403, detail="Access Denied.")
+                return account
+            account = await unit_of_work.binance_accounts.get_first_object(user_id=user_id, is_active=True)
+            if not account:
+                raise NotFoundException(class_name=BinanceAccount.__name__)
+            return account
+
     @staticmethod
     async def delete_binance_account(unit_of_work: IUnitOfWork, account_id: str, user_id: str):
         async with unit_of_work:
             account = await unit_of_work.binance_accounts.retrieve(pk=account_id)
             if account.user_id != user_id:
                 raise HTTPException(status_code=403, detail="Access Denied.")
-            return await unit_of_work.binance_accounts.delete(pk=account_id)
+            await unit_of_work.binance_accounts.delete(pk=account_id)
+        binance_clients.discard(account.id)
+
+    @staticmethod
+    async def get_latest_balance_snapshot(unit_of_work: IUnitOfWork, account_id: UUID4):
+        """Latest balance snapshot of the account, None if it is older than `SNAPSHOT_MAX_AGE`."""
+        async with unit_of_work:
+            return await unit_of_work.balance_snapshots.get_latest(
+                account_id, max_age=timedelta(seconds=settings.binance.SNAPSHOT_MAX_AGE)
+            )
@@ -26,6 +26,9 @@ class LLMSettings(BaseSettings):
 
     OPENAI_API_KEY: str
     MODEL: str
+    FAST_MODEL: str = Field(default='gpt-4o-mini', description='Model of simple balance and price lookups')
+    ANALYSIS_MODEL: str | None = Field(default=None, description='Model of trading bot analyses, MODEL if not set')
+    ROUTING_ENABLED: bool = Field(default=True, description='Pick the model by task, otherwise always use MODEL')
 
     MAX_RESPONSES: int
     TEMPERATURE: float
@@ -34,6 +37,23 @@ class LLMSettings(BaseSettings):
     FREQUENCY_PENALTY: int
     PRESENCE_PENALTY: int
 
+    PROVIDER: str = Field(default='openai', description='`openai` or `fake`, a deterministic offline model')
+    FAKE_LATENCY: float = Field(default=0.5, description='Seconds of simulated latency per fake model call')
+    FAKE_TOOL_CALLS: str = Field(default='', description='Comma separated tools the fake model calls before answering')
+
+    TOOL_CONCURRENCY: int = Field(default=4, description='Tool calls of one agent step executed in parallel')
+    CHAT_HISTORY_MESSAGES: int = Field(default=50, description='Latest thread messages sent to the chat model')
+
+    TOKENS_PER_MINUTE: int = Field(default=150_000, description='Token budget of the process per model, below the org limit')
+    REQUESTS_PER_MINUTE: int = Field(default=450, description='Request budget of the process per model, below the org limit')
+    MAX_ATTEMPTS: int = Field(default=4, description='Attempts of a rate limited or failed completion')
+    MAX_BACKOFF: float = Field(default=20, description='Upper bound of the jittered delay between attempts')
+    CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, description='Consecutive provider errors opening the circuit')
+    CIRCUIT_RESET_TIMEOUT: float = Field(default=30, description='Seconds before a trial call on an open circuit')
+
+    DAILY_TOKEN_BUDGET: int | None = Field(default=None, description='Tokens per user and day, unlimited if not set')
+    USAGE_FLUSH_INTERVAL: float = Field(default=5, description='Seconds between bulk inserts of usage rows')
+
 
 class BinanceSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=env_file, extra='ignore')
@@ -43,6 +63,59 @@ class BinanceSettings(BaseSettings):
     TESTNET_BINANCE_API_KEY: str | None
     TESTNET_BINANCE_API_SECRET: str | None
 
+    BINANCE_WEIGHT_PER_MINUTE: int = Field(default=5000, description='Request weight budget, below the 6000 IP limit')
+    BINANCE_ORDERS_PER_10S: int = Field(default=90, description='Order budget per account, below the 100 limit')
+
+    BINANCE_CLIENT_POOL_SIZE: int = Field(default=256)
+    BINANCE_CLIENT_IDLE_TIMEOUT: int = Field(default=600, description='Seconds before an unused client is closed')
+    BINANCE_SECRET_ENCRYPTION_KEY: str | None = Field(default=None, description='Fernet key for stored secrets')
+
+    BINANCE_FAKE: bool = Field(default=False, description='Serve Binance calls from an in-process stand-in')
+    BINANCE_FAKE_LATENCY: float = Field(default=0.05, description='Seconds of simulated latency per fake call')
+
+    EXCHANGE_INFO_REFRESH_INTERVAL: int = Field(default=3600, description='Seconds between symbol rules reloads')
+
+    SNAPSHOT_ENABLED: bool = Field(default=False)
+    SNAPSHOT_INTERVAL: int = Field(default=300, description='Seconds between balance snapshot rounds')
+    SNAPSHOT_CONCURRENCY: int = Field(default=4, description='Accounts fetched in parallel per round')
+    SNAPSHOT_MAX_AGE: int = Field(default=900, description='Older snapshots are not served, balances are fetched live')
+    SNAPSHOT_RETENTION_DAYS: int = Field(default=30, description='Older snapshots are deleted every round')
+
+
+class JobSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=env_file, extra='ignore')
+
+    CHAT_OFFLOAD_ENABLED: bool = Field(default=False, description='Run chat turns on workers instead of the API')
+    WORKER_CONCURRENCY: int = Field(default=4, description='Jobs executed in parallel by one worker process')
+    WORKER_POLL_INTERVAL: float = Field(default=0.5)
+    JOB_HEARTBEAT_INTERVAL: float = Field(default=30, description='Seconds between heartbeats of running jobs')
+    JOB_STALE_TIMEOUT: int = Field(default=120, description='Running jobs without a heartbeat for this long are requeued')
+    JOB_RETRY_DELAY: int = Field(default=10)
+    BOT_ANALYSIS_INTERVAL: int = Field(default=900, description='Seconds between analyses of an active bot')
+    ACTIVITY_FLUSH_INTERVAL: float = Field(default=5, description='Seconds between bulk inserts of bot activity')
+    PERFORMANCE_INTERVAL: int = Field(default=60, description='Seconds between updates of bot performance rollups')
+    PERFORMANCE_BATCH_SIZE: int = Field(default=1000, description='Bots, and fills per bot, aggregated per round')
+    ARCHIVE_AFTER_DAYS: int = Field(default=90, description='Days without messages before a thread is archived')
+    ARCHIVE_INTERVAL: int = Field(default=3600, description='Seconds between archival rounds')
+    ARCHIVE_BATCH_SIZE: int = Field(default=200, description='Threads archived per round')
+    THREAD_DELETE_INLINE_LIMIT: int = Field(default=1000, description='Threads with more messages are deleted by a job')
+    THREAD_DELETE_CHUNK_SIZE: int = Field(default=5000, description='Messages deleted per transaction by that job')
+
+
+class CacheSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=env_file, extra='ignore')
+
+    RESPONSE_CACHE_BACKEND: str = Field(default='memory', description='`memory` (per process) or `postgres` (shared)')
+    RESPONSE_CACHE_SIZE: int = Field(default=10_000)
+    RESPONSE_CACHE_TTL: int = Field(default=3600, description='Lifetime of answers given without tool calls')
+    RESPONSE_CACHE_MARKET_TTL: int = Field(default=30, description='Lifetime of answers based on account or market data')
+    RESPONSE_CACHE_SEMANTIC_ENABLED: bool = Field(default=False)
+    RESPONSE_CACHE_SIMILARITY: float = Field(default=0.95, description='Minimal cosine similarity of a semantic hit')
+    RESPONSE_CACHE_EMBEDDING_MODEL: str = Field(default='text-embedding-3-small')
+
+    TOOL_CACHE_ENABLED: bool = Field(default=True, description='Share Binance reads between agent tool calls')
+    TOOL_CACHE_SIZE: int = Field(default=5000)
+
 
 class AuthSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=env_file, extra='ignore')
@@ -51,6 +124,8 @@ class AuthSettings(BaseSettings):
     key: str = Field(alias='PASSWORD_SECRET_KEY')
     access_expire: int = Field(alias='ACCESS_TOKEN_EXPIRE_MINUTES')
     refresh_expire: int = Field(alias='REFRESH_TOKEN_EXPIRE_MINUTES')
+    user_cache_size: int = Field(alias='USER_CACHE_SIZE', default=10_000)
+    user_cache_ttl: int = Field(alias='USER_CACHE_TTL', default=30, description='Seconds an authenticated user is reused')
 
 
 class OAuthSettings(BaseSettings):
@@ -89,6 +164,8 @@ class Settings(BaseSettings):
     database: DBSettings = DBSettings()
     llm: LLMSettings = LLMSettings()
     binance: BinanceSettings = BinanceSettings()
+    jobs: JobSettings = JobSettings()
+    cache: CacheSettings = CacheSettings()
     auth: AuthSettings = AuthSettings()
     oauth: OAuthSettings = OAuthSettings()
 
@@ -0,0 +1,5 @@
+from .snapshots import balance_snapshotter
+
+__all__ = (
+    'balance_snapshotter',
+)
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from loguru import logger
+
+from app.settings import settings
+from app.tasks.base import PeriodicTask
+from app.utils.unitofwork import UnitOfWork
+
+
+class ThreadArchiver(PeriodicTask):
+    """
+    Moves messages of threads inactive for `after_days` into compressed archives, keeping `message` small.
+    Each thread is archived in its own transaction; archived threads are still read transparently.
+    """
+
+    name = 'thread archiver'
+
+    def __init__(
+        self,
+        interval: float = settings.jobs.ARCHIVE_INTERVAL,
+        after_days: int = settings.jobs.ARCHIVE_AFTER_DAYS,
+        batch_size: int = settings.jobs.ARCHIVE_BATCH_SIZE,
+    ):
+        super().__init__(interval)
+        self.inactive_for = timedelta(days=after_days)
+        self.batch_size = batch_size
+
+    async def run_once(self):
+        async with UnitOfWork() as unit_of_work:
+            thread_ids = await unit_of_work.thread_archives.list_cold_threads(self.inactive_for, self.batch_size)
+
+        threads = messages = 0
+        for thread_id in thread_ids:
+            async with UnitOfWork() as unit_of_work:
+                count = await unit_of_work.thread_archives.archive(thread_id, self.inactive_for)
+            if count is not None:
+                threads += 1
+                messages += count
+        if threads:
+            logger.info('Archived {messages} messages of {threads} threads', messages=messages, threads=threads)
@@ -0,0 +1,84 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+
+class PeriodicTask(ABC):
+    """Background coroutine executed every `interval` seconds inside the application event loop."""
+
+    name: str = 'periodic task'
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if self.is_running:
+            return
+        logger.info('Starting {name}', name=self.name)
+        self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self):
+        if not self.is_running:
+            return
+        logger.info('Stopping {name}', name=self.name)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception('{name} failed: {e}', name=self.name, e=e)
+            await asyncio.sleep(self.interval)
+
+    @abstractmethod
+    async def run_once(self):
+        raise NotImplemented
+
+
+class BufferedRecorder(PeriodicTask):
+    """
+    Buffers rows recorded on hot paths and hands them to `flush` in one batch per interval.
+    Rows of a failed flush are kept for the next round, up to `max_pending`; the buffer is flushed once more on stop.
+    """
+
+    def __init__(self, flush: Callable[[list[dict]], Awaitable[None]], interval: float, max_pending: int = 10_000):
+        super().__init__(interval)
+        self.flush = flush
+        self.max_pending = max_pending
+        self._rows: list[dict] = []
+
+    def record(self, **row):
+        self._rows.append(row)
+
+    async def run_once(self):
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        try:
+            await self.flush(rows)
+        except Exception:
+            # Keep the rows for the next round unless the database is down for too long
+            self._rows = (rows + self._rows)[-self.max_pending:]
+            raise
+
+    async def stop(self):
+        await super().stop()
+        try:
+            await self.run_once()
+        except Exception as e:
+            logger.error('{name} lost {count} rows on shutdown: {e}', name=self.name, count=len(self._rows), e=e)
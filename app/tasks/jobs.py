@@ -0,0 +1,92 @@
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from app.exceptions.request_exceptions import NotFoundException
+from app.models import Job, JobKind
+from app.services.binance import BinanceService
+from app.services.threads import ThreadService
+from app.services.trading_bots import TradingBotService
+from app.services.users import UserService
+from app.settings import settings
+from app.tasks.base import PeriodicTask
+from app.utils.rate_limiter import RequestPriority
+from app.utils.unitofwork import UnitOfWork
+
+HANDLERS: dict[JobKind, Callable[[Job], Awaitable[dict | None]]] = {}
+
+
+def handles(kind: JobKind):
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+@handles(JobKind.CHAT_TURN)
+async def run_chat_turn(job: Job) -> dict:
+    try:
+        account = await UserService.get_binance_account(UnitOfWork(), user_id=job.user_id)
+        binance_service = await BinanceService.for_account(account, priority=RequestPriority.INTERACTIVE)
+    except NotFoundException:
+        binance_service = None
+    return await ThreadService.reply(
+        UnitOfWork(),
+        job.payload['thread_id'],
+        job.payload['message'],
+        binance_service=binance_service,
+        # Job ids survive retries of the job, a client key also retries of the request
+        run_key=job.payload.get('run_key') or str(job.id),
+    )
+
+
+@handles(JobKind.BOT_ANALYSIS)
+async def run_bot_analysis(job: Job) -> dict:
+    return await TradingBotService.analyze(UnitOfWork(), job.payload['trading_bot_id'], run_key=str(job.id))
+
+
+@handles(JobKind.THREAD_DELETE)
+async def run_thread_delete(job: Job) -> dict:
+    return await ThreadService.purge(
+        UnitOfWork(), job.payload['thread_ids'], chunk_size=settings.jobs.THREAD_DELETE_CHUNK_SIZE
+    )
+
+
+class StaleJobReaper(PeriodicTask):
+    """Returns jobs of crashed or killed workers to the queue, or fails them when they are out of attempts."""
+
+    name = 'stale job reaper'
+
+    def __init__(self, interval: float = 60, timeout: float = settings.jobs.JOB_STALE_TIMEOUT):
+        super().__init__(interval)
+        self.timeout = timeout
+
+    async def run_once(self):
+        async with UnitOfWork() as unit_of_work:
+            requeued, failed = await unit_of_work.jobs.requeue_stale(self.timeout)
+        if requeued or failed:
+            logger.warning('Requeued {requeued} and failed {failed} stale jobs', requeued=requeued, failed=failed)
+
+
+class BotAnalysisScheduler(PeriodicTask):
+    """Queues an analysis of every active trading bot, skipping bots whose previous one is still pending."""
+
+    name = 'bot analysis scheduler'
+
+    def __init__(self, interval: float = settings.jobs.BOT_ANALYSIS_INTERVAL):
+        super().__init__(interval)
+
+    async def run_once(self):
+        bots = await TradingBotService.list_active(UnitOfWork())
+        queued = 0
+        for bot in bots:
+            async with UnitOfWork() as unit_of_work:
+                job = await unit_of_work.jobs.enqueue(
+                    JobKind.BOT_ANALYSIS,
+                    {"trading_bot_id": str(bot.id)},
+                    priority=RequestPriority.BOT,
+                    user_id=bot.user_id,
+                    dedupe_key=str(bot.id),
+                )
+            queued += job is not None
+        logger.info('Queued analysis of {queued} out of {total} active bots', queued=queued, total=len(bots))
@@ -0,0 +1,37 @@
+from loguru import logger
+
+from app.settings import settings
+from app.tasks.base import PeriodicTask
+from app.utils.unitofwork import UnitOfWork
+
+
+class BotPerformanceAggregator(PeriodicTask):
+    """
+    Folds new BUY and SELL activity of every bot into its running performance and daily rollups,
+    so that performance is read from `bot_performance` instead of scanning the activity log.
+    Each bot is refreshed in its own transaction, up to `batch_size` fills per round.
+    """
+
+    name = 'bot performance aggregator'
+
+    def __init__(
+        self,
+        interval: float = settings.jobs.PERFORMANCE_INTERVAL,
+        batch_size: int = settings.jobs.PERFORMANCE_BATCH_SIZE,
+    ):
+        super().__init__(interval)
+        self.batch_size = batch_size
+
+    async def run_once(self):
+        async with UnitOfWork() as unit_of_work:
+            bot_ids = await unit_of_work.bot_performance.list_pending(self.batch_size)
+
+        bots = fills = 0
+        for bot_id in bot_ids:
+            async with UnitOfWork() as unit_of_work:
+                count = await unit_of_work.bot_performance.refresh(bot_id, self.batch_size)
+            if count:
+                bots += 1
+                fills += count
+        if bots:
+            logger.info('Aggregated {fills} fills of {bots} bots', fills=fills, bots=bots)
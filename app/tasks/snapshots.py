@@ -0,0 +1,81 @@
+import asyncio
+from datetime import timedelta
+
+from loguru import logger
+
+from app.models import BinanceAccount, BalanceSnapshot
+from app.services.binance import binance_clients, limited_call
+from app.settings import settings
+from app.tasks.base import PeriodicTask
+from app.utils.rate_limiter import RequestPriority
+from app.utils.unitofwork import UnitOfWork
+
+
+class BalanceSnapshotter(PeriodicTask):
+    """Periodically stores balances of all active Binance accounts, deleting snapshots past retention."""
+
+    name = 'balance snapshotter'
+
+    def __init__(
+        self,
+        interval: float = settings.binance.SNAPSHOT_INTERVAL,
+        concurrency: int = settings.binance.SNAPSHOT_CONCURRENCY,
+        retention_days: int = settings.binance.SNAPSHOT_RETENTION_DAYS,
+    ):
+        super().__init__(interval)
+        self.concurrency = concurrency
+        self.retention = timedelta(days=retention_days)
+
+    async def run_once(self):
+        async with UnitOfWork() as unit_of_work:
+            purged = await unit_of_work.balance_snapshots.purge_older_than(self.retention)
+        if purged:
+            logger.info('Deleted {count} balance snapshots older than {retention}', count=purged, retention=self.retention)
+
+        async with UnitOfWork() as unit_of_work:
+            accounts = await unit_of_work.binance_accounts.list(is_active=True)
+        if not accounts:
+            return
+
+        # Prices and coin names are shared by all accounts, fetched once per round
+        try:
+            client = await binance_clients.get_default()
+            tickers = await limited_call(client, 'get_all_tickers', RequestPriority.BACKGROUND)
+            coins_info = await limited_call(client, 'get_all_coins_info', RequestPriority.BACKGROUND)
+        except Exception as e:
+            logger.warning('Prices for balance snapshots failed: {e}', e=e)
+            tickers = coins_info = None
+        coin_names = {coin['coin']: coin['name'] for coin in coins_info} if coins_info is not None else None
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._snapshot(account, semaphore) for account in accounts))
+        rows = [row for row in results if row]
+        for row in rows:
+            if tickers is not None:
+                row['prices'] = BalanceSnapshot.asset_prices(row['balances'], tickers)
+                row['coin_names'] = {asset: coin_names[asset] for asset in row['balances'] if asset in coin_names}
+
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.balance_snapshots.bulk_create(rows)
+        logger.info('Stored {count} balance snapshots out of {total} accounts', count=len(rows), total=len(accounts))
+
+    async def _snapshot(self, account: BinanceAccount, semaphore: asyncio.Semaphore) -> dict | None:
+        async with semaphore:
+            try:
+                client = await binance_clients.get(account)
+                # Lowest priority, so snapshots only consume weight left over by users and bots
+                account_data = await limited_call(client, 'get_account', RequestPriority.BACKGROUND)
+            except Exception as e:
+                logger.warning('Balance snapshot failed for account {id}: {e}', id=account.id, e=e)
+                return None
+
+        return {
+            'binance_account_id': account.id,
+            'update_time': account_data.get('updateTime'),
+            'balances': BalanceSnapshot.compact_balances(account_data['balances']),
+            'prices': None,
+            'coin_names': None,
+        }
+
+
+balance_snapshotter = BalanceSnapshotter()
@@ -0,0 +1,137 @@
+"""
+Job worker process, run with `python -m app.tasks.worker`.
+Any number of workers can run side by side, jobs are claimed with `FOR UPDATE SKIP LOCKED`.
+"""
+import asyncio
+import os
+import signal
+import socket
+
+from loguru import logger
+
+from app.database import engine
+from app.inference.gateway import LLMUnavailable
+from app.models import Job, JobKind
+from app.services.binance import binance_clients
+from app.services.exchange_info import exchange_info
+from app.services.trading_bots import bot_activity_recorder
+from app.services.usage import usage_recorder
+from app.settings import settings
+from app.tasks.archive import ThreadArchiver
+from app.tasks.jobs import HANDLERS, BotAnalysisScheduler, StaleJobReaper
+from app.tasks.performance import BotPerformanceAggregator
+from app.utils.unitofwork import UnitOfWork
+
+
+class Worker:
+    def __init__(
+        self,
+        concurrency: int = settings.jobs.WORKER_CONCURRENCY,
+        poll_interval: float = settings.jobs.WORKER_POLL_INTERVAL,
+        heartbeat_interval: float = settings.jobs.JOB_HEARTBEAT_INTERVAL,
+        kinds: list[JobKind] | None = None,
+    ):
+        self.id = f'{socket.gethostname()}:{os.getpid()}'
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.kinds = kinds
+        self._tasks: set[asyncio.Task] = set()
+        self._running: set = set()  # Ids of jobs being executed
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        logger.info('Worker {id} stopping, waiting for {count} running jobs', id=self.id, count=len(self._tasks))
+        self._stopping.set()
+
+    async def run(self):
+        logger.info('Worker {id} started with concurrency {concurrency}', id=self.id, concurrency=self.concurrency)
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            await self._run()
+        finally:
+            heartbeat.cancel()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            free_slots = self.concurrency - len(self._tasks)
+            jobs = await self._claim(free_slots) if free_slots else []
+            for job in jobs:
+                task = asyncio.create_task(self._execute(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            if len(jobs) < free_slots or not free_slots:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _heartbeat(self):
+        """Refresh heartbeats of the running jobs, so slow jobs are not mistaken for jobs of a dead worker."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with UnitOfWork() as unit_of_work:
+                    await unit_of_work.jobs.heartbeat(self.id, list(self._running))
+            except Exception as e:
+                logger.warning('Job heartbeat failed: {e}', e=e)
+
+    async def _claim(self, limit: int) -> list[Job]:
+        try:
+            async with UnitOfWork() as unit_of_work:
+                return await unit_of_work.jobs.claim(self.id, limit, kinds=self.kinds)
+        except Exception as e:
+            logger.warning('Claiming jobs failed: {e}', e=e)
+            return []
+
+    async def _execute(self, job: Job):
+        logger.info('Running {kind} job {id} (attempt {attempt})', kind=job.kind.value, id=job.id, attempt=job.attempts)
+        self._running.add(job.id)
+        try:
+            result = await HANDLERS[job.kind](job)
+        except Exception as e:
+            logger.exception('{kind} job {id} failed: {e}', kind=job.kind.value, id=job.id, e=e)
+            retry_in = settings.jobs.JOB_RETRY_DELAY * job.attempts
+            if isinstance(e, LLMUnavailable):
+                retry_in = max(retry_in, e.retry_after)
+            async with UnitOfWork() as unit_of_work:
+                await unit_of_work.jobs.fail(job, str(e), retry_in=retry_in)
+            return
+        finally:
+            self._running.discard(job.id)
+        async with UnitOfWork() as unit_of_work:
+            await unit_of_work.jobs.complete(job.id, result)
+
+
+async def main():
+    worker = Worker()
+    periodic_tasks = [
+        StaleJobReaper(),
+        BotAnalysisScheduler(),
+        ThreadArchiver(),
+        BotPerformanceAggregator(),
+        usage_recorder,
+        bot_activity_recorder,
+    ]
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    await exchange_info.start()
+    for task in periodic_tasks:
+        await task.start()
+    try:
+        await worker.run()
+    finally:
+        for task in periodic_tasks:
+            await task.stop()
+        await exchange_info.stop()
+        await binance_clients.close()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    In-process LRU cache with per-entry expiry.
+    With `sliding=True` every hit extends the entry lifetime, which turns the TTL into an idle timeout.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        sliding: bool = False,
+        on_evict: Callable[[Hashable, Any], None] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sliding = sliding
+        self.on_evict = on_evict
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[0] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        now = time.monotonic()
+        if expires_at <= now:
+            self._evict(key)
+            self.misses += 1
+            return default
+        if self.sliding:
+            self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        if key in self._data:
+            self._evict(key)
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        while len(self._data) > self.maxsize:
+            self._evict(next(iter(self._data)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def evict_expired(self):
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._data.items() if expires_at <= now]:
+            self._evict(key)
+
+    def clear(self):
+        for key in list(self._data):
+            self._evict(key)
+
+    def values(self) -> list:
+        return [value for _, value in self._data.values()]
+
+    def _evict(self, key: Hashable):
+        _, value = self._data.pop(key)
+        self.evictions += 1
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / requests, 3) if requests else None,
+        }
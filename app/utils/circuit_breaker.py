@@ -0,0 +1,56 @@
+import time
+from enum import Enum
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'        # Calls pass through
+    OPEN = 'open'            # Calls fail fast until the reset timeout elapses
+    HALF_OPEN = 'half_open'  # One trial call decides whether to close again
+
+
+class CircuitOpen(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f'Circuit is open, retry in {retry_after:.0f}s')
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `failure_threshold` consecutive failures, so callers stop waiting on a provider that is down.
+    After `reset_timeout` seconds a single trial call is let through, its outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def before_call(self):
+        """Raise `CircuitOpen` unless the call may proceed."""
+        if self.state == CircuitState.CLOSED:
+            return
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if remaining <= 0:
+            # Restarting the timer lets another trial through if this one never reports back
+            self.state = CircuitState.HALF_OPEN
+            self.opened_at = time.monotonic()
+            return
+        raise CircuitOpen(max(remaining, 1))
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                self.trips += 1
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {'state': self.state.value, 'consecutive_failures': self.failures, 'trips': self.trips}
@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+from cryptography.fernet import Fernet, InvalidToken
+from loguru import logger
+
+from app.settings import settings
+
+_fernet = Fernet(settings.binance.BINANCE_SECRET_ENCRYPTION_KEY) if settings.binance.BINANCE_SECRET_ENCRYPTION_KEY else None
+
+
+def encrypt_secret(value: str) -> str:
+    if not _fernet:
+        return value
+    return _fernet.encrypt(value.encode()).decode()
+
+
+@lru_cache(maxsize=1024)
+def decrypt_secret(value: str) -> str:
+    """Decrypt stored secret; results are cached as decryption runs on every client (re)build."""
+    if not _fernet:
+        return value
+    try:
+        return _fernet.decrypt(value.encode()).decode()
+    except InvalidToken:
+        logger.warning('Binance secret is not encrypted, consider re-adding the account')
+        return value
@@ -1,8 +1,12 @@
+import base64
+import binascii
+import json
 from typing import Callable
 
 from sqlalchemy import Result, Row, SelectBase, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.exceptions.request_exceptions import InvalidCursorException
 from app.middlewares.context import request_object
 
 
@@ -15,11 +19,13 @@ class Paginator:
         per_page: int,
         fetch_method: str = 'scalars',
         add_extra_page: bool = False,
-        is_reversed: bool = False  # New attribute for reversed pagination
+        is_reversed: bool = False,  # New attribute for reversed pagination
+        count_query: SelectBase | None = None,  # Cheaper query with the same rows, used to count them
     ):
         self.session = session
         self.fetch_method = fetch_method
         self.query = query
+        self.count_query = count_query if count_query is not None else query
         self.page = page
         self.per_page = self.limit = per_page
         self.offset = 0
@@ -81,7 +87,23 @@ class Paginator:
         return quotient if not rest else quotient + 1
 
     async def _get_total_count(self) -> int:
-        count = await self.session.scalar(select(func.count()).select_from(self.query.subquery()))
+        count = await self.session.scalar(select(func.count()).select_from(self.count_query.subquery()))
+        self.number_of_pages = self._get_number_of_pages(count)
+        return count
+
+
+class ListPaginator(Paginator):
+    """Paginates rows already in memory, in the same format as queries."""
+
+    def __init__(self, items: list, page: int, per_page: int, is_reversed: bool = False):
+        super().__init__(None, None, page, per_page, is_reversed=is_reversed)
+        self.items = items
+
+    async def _get_items(self) -> list:
+        return self.items[self.offset:self.offset + self.limit]
+
+    async def _get_total_count(self) -> int:
+        count = len(self.items)
         self.number_of_pages = self._get_number_of_pages(count)
         return count
 
@@ -93,7 +115,8 @@ async def paginate(
     per_page: int,
     fetch_method: str = 'scalars',
     add_extra_page: bool = False,
-    is_reversed: bool = False
+    is_reversed: bool = False,
+    count_query: SelectBase | None = None,
 ) -> dict:
     paginator = Paginator(
         session,
@@ -102,6 +125,22 @@ async def paginate(
         per_page,
         fetch_method=fetch_method,
         add_extra_page=add_extra_page,
-        is_reversed=is_reversed
+        is_reversed=is_reversed,
+        count_query=count_query,
     )
     return await paginator.get_response()
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset pagination cursor holding the sort key of the last returned row."""
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursorException()
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorException()
+    return values
@@ -0,0 +1,312 @@
+import asyncio
+import bisect
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from app.utils.cache import TTLCache
+
+# An order bucket idle for longer than its 10s period is full again, so dropping it loses nothing
+ORDER_BUCKET_IDLE_TIMEOUT = 60
+MAX_ORDER_BUCKETS = 10_000
+
+
+class RequestPriority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0
+    BOT = 1
+    BACKGROUND = 2
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill(time.monotonic())
+        self.tokens -= amount
+
+    def sync(self, used: float):
+        """Align with the usage reported by the server, which also counts other processes on the same IP."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, self.capacity - used)
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    weight: int = field(compare=False)
+    orders: int = field(compare=False)
+    account: str | None = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class PriorityRateLimiter:
+    """
+    Process-wide limiter for request weight shared by the whole IP and order counts kept per account.
+    Waiters are dispatched in priority order; a waiter blocked only by its own account's order limit
+    does not hold back requests of other accounts.
+    """
+
+    def __init__(self, weight_per_minute: int, orders_per_10s: int):
+        self.weight = TokenBucket(weight_per_minute, 60)
+        self.orders_per_10s = orders_per_10s
+        self.order_buckets = TTLCache(MAX_ORDER_BUCKETS, ORDER_BUCKET_IDLE_TIMEOUT, sliding=True)
+
+        self._queue: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatched = Counter()
+        self._wait_time = Counter()
+
+    def _order_bucket(self, account: str) -> TokenBucket:
+        bucket = self.order_buckets.get(account)
+        if bucket is None:
+            bucket = TokenBucket(self.orders_per_10s, 10)
+            self.order_buckets.set(account, bucket)
+        return bucket
+
+    async def acquire(
+        self,
+        weight: int,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        account: str | None = None,
+        orders: int = 0,
+    ):
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, next(self._sequence), weight, orders, account, loop.create_future())
+        bisect.insort(self._queue, waiter)
+        started_at = time.monotonic()
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                self._dispatch()
+            raise
+        self._wait_time[RequestPriority(priority).name] += time.monotonic() - started_at
+
+    def _dispatch(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        next_check = None
+        for waiter in list(self._queue):
+            if waiter.future.done():
+                self._queue.remove(waiter)
+                continue
+
+            order_delay = 0.0
+            if waiter.orders and waiter.account:
+                order_delay = self._order_bucket(waiter.account).delay(waiter.orders)
+            weight_delay = self.weight.delay(waiter.weight)
+
+            if weight_delay:
+                # Weight is shared, so nobody behind the first blocked waiter may jump the queue
+                next_check = min(next_check or weight_delay, weight_delay)
+                break
+            if order_delay:
+                next_check = min(next_check or order_delay, order_delay)
+                continue
+
+            self.weight.consume(waiter.weight)
+            if waiter.orders and waiter.account:
+                self._order_bucket(waiter.account).consume(waiter.orders)
+            self._queue.remove(waiter)
+            self._dispatched[RequestPriority(waiter.priority).name] += 1
+            waiter.future.set_result(None)
+
+        if next_check is not None:
+            self._timer = asyncio.get_running_loop().call_later(next_check, self._dispatch)
+
+    def observe(self, headers, account: str | None = None):
+        """Update buckets from `X-MBX-USED-WEIGHT-1M` / `X-MBX-ORDER-COUNT-10S` response headers."""
+        if not headers:
+            return
+        used_weight = headers.get('X-MBX-USED-WEIGHT-1M')
+        if used_weight is not None:
+            self.weight.sync(int(used_weight))
+        order_count = headers.get('X-MBX-ORDER-COUNT-10S')
+        if order_count is not None and account:
+            self._order_bucket(account).sync(int(order_count))
+
+    def penalize(self, retry_after: float | None):
+        """Stop dispatching after a 429/418 response for as long as the server asked."""
+        self.weight.block(retry_after or 60)
+
+    def stats(self) -> dict:
+        queue_depth = Counter(RequestPriority(waiter.priority).name for waiter in self._queue)
+        return {
+            'queue_depth': {priority.name: queue_depth.get(priority.name, 0) for priority in RequestPriority},
+            'dispatched': dict(self._dispatched),
+            'wait_seconds': {name: round(value, 3) for name, value in self._wait_time.items()},
+            'available_weight': round(max(self.weight.tokens, 0), 1),
+            'weight_capacity': self.weight.capacity,
+            'blocked_for': round(max(self.weight.blocked_until - time.monotonic(), 0), 1),
+        }
+
+
+@dataclass(order=True)
+class _BudgetWaiter:
+    priority: int
+    sequence: int
+    model: str = field(compare=False)
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class _ModelBudget:
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int):
+        self.tokens = TokenBucket(tokens_per_minute, 60)
+        self.requests = TokenBucket(requests_per_minute, 60)
+
+    def delay(self, tokens: int) -> float:
+        return max(self.requests.delay(1), self.tokens.delay(tokens))
+
+
+class TokenBudgetLimiter:
+    """
+    Requests and tokens per minute budget of an LLM provider, shared by all agent runs of the process.
+    The provider limits every model separately, so each model has its own pair of buckets.
+    Token usage is only known after the call, so an estimate is reserved upfront and corrected by `reconcile`.
+    Waiters are dispatched in priority order; a waiter blocked by its model's budget does not hold back other models.
+    """
+
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int):
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self.models: dict[str, _ModelBudget] = {}
+
+        self._queue: list[_BudgetWaiter] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatched = Counter()
+        self._wait_time = Counter()
+
+    def _budget(self, model: str) -> _ModelBudget:
+        budget = self.models.get(model)
+        if budget is None:
+            budget = self.models[model] = _ModelBudget(self.tokens_per_minute, self.requests_per_minute)
+        return budget
+
+    async def acquire(self, tokens: int, model: str, priority: RequestPriority = RequestPriority.INTERACTIVE):
+        loop = asyncio.get_running_loop()
+        waiter = _BudgetWaiter(priority, next(self._sequence), model, tokens, loop.create_future())
+        bisect.insort(self._queue, waiter)
+        started_at = time.monotonic()
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                self._dispatch()
+            raise
+        self._wait_time[RequestPriority(priority).name] += time.monotonic() - started_at
+
+    def _dispatch(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        next_check = None
+        blocked = set()
+        for waiter in list(self._queue):
+            if waiter.future.done():
+                self._queue.remove(waiter)
+                continue
+            if waiter.model in blocked:
+                # Nobody behind the first blocked waiter of a model may jump the queue of that model
+                continue
+
+            budget = self._budget(waiter.model)
+            delay = budget.delay(waiter.tokens)
+            if delay:
+                blocked.add(waiter.model)
+                next_check = min(next_check or delay, delay)
+                continue
+
+            budget.requests.consume(1)
+            budget.tokens.consume(waiter.tokens)
+            self._queue.remove(waiter)
+            self._dispatched[RequestPriority(waiter.priority).name] += 1
+            waiter.future.set_result(None)
+
+        if next_check is not None:
+            self._timer = asyncio.get_running_loop().call_later(next_check, self._dispatch)
+
+    def reconcile(self, reserved: int, used: int, model: str):
+        """Charge the difference between the reserved estimate and the tokens reported by the provider."""
+        bucket = self._budget(model).tokens
+        bucket.consume(used - reserved)
+        bucket.tokens = min(bucket.tokens, bucket.capacity)
+        if used < reserved:
+            self._dispatch()
+
+    def observe(self, headers, model: str):
+        """
+        Update the buckets of `model` from `x-ratelimit-*` response headers. They count every process of the org,
+        so the usage is synced as this process's share: with a quarter of the org limit used,
+        at least a quarter of the process budget is taken.
+        """
+        if not headers:
+            return
+        budget = self._budget(model)
+        for bucket, name in ((budget.requests, 'requests'), (budget.tokens, 'tokens')):
+            limit = headers.get(f'x-ratelimit-limit-{name}')
+            remaining = headers.get(f'x-ratelimit-remaining-{name}')
+            if limit is None or remaining is None or int(limit) <= 0:
+                continue
+            used = min(max(int(limit) - int(remaining), 0), int(limit))
+            bucket.sync(used / int(limit) * bucket.capacity)
+
+    def penalize(self, retry_after: float | None, model: str):
+        """Stop dispatching calls of `model` after a 429 response for as long as the provider asked."""
+        self._budget(model).requests.block(retry_after or 20)
+
+    def stats(self) -> dict:
+        queue_depth = Counter(RequestPriority(waiter.priority).name for waiter in self._queue)
+        now = time.monotonic()
+        return {
+            'queue_depth': {priority.name: queue_depth.get(priority.name, 0) for priority in RequestPriority},
+            'dispatched': dict(self._dispatched),
+            'wait_seconds': {name: round(value, 3) for name, value in self._wait_time.items()},
+            'tokens_capacity': self.tokens_per_minute,
+            'requests_capacity': self.requests_per_minute,
+            'models': {
+                model: {
+                    'available_tokens': round(max(budget.tokens.tokens, 0)),
+                    'available_requests': round(max(budget.requests.tokens, 0), 1),
+                    'blocked_for': round(max(budget.requests.blocked_until - now, 0), 1),
+                }
+                for model, budget in self.models.items()
+            },
+        }
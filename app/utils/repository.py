@@ -96,9 +96,9 @@ class SQLAlchemyRepository(AbstractRepository):
         statement = delete(self.model).where(*self.get_where_clauses(**whereclauses))
         await self.execute(statement)
 
-    async def execute(self, statement) -> Result:
+    async def execute(self, statement, params=None) -> Result:
         try:
-            return await self.session.execute(statement)
+            return await self.session.execute(statement, params)
         except IntegrityError as e:
             logger.exception('IntegrityError: {e}', e=e)
             if 'duplicate' in str(e):
@@ -1,14 +1,23 @@
 from abc import ABC, abstractmethod
 
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
 
 from app.database import async_session
 from app.repositories import (
     MessageRepository,
     ThreadRepository,
+    ThreadArchiveRepository,
     UserRepository,
     BinanceAccountRepository,
-    TradingBotRepository
+    TradingBotRepository,
+    BotActivityRepository,
+    BalanceSnapshotRepository,
+    JobRepository,
+    CachedResponseRepository,
+    LLMUsageRepository,
+    AgentCheckpointRepository,
+    BotPerformanceRepository,
 )
 
 
@@ -16,8 +25,16 @@ class IUnitOfWork(ABC):
     users: UserRepository
     binance_accounts: BinanceAccountRepository
     trading_bots: TradingBotRepository
+    bot_activities: BotActivityRepository
+    bot_performance: BotPerformanceRepository
     threads: ThreadRepository
     messages: MessageRepository
+    thread_archives: ThreadArchiveRepository
+    balance_snapshots: BalanceSnapshotRepository
+    jobs: JobRepository
+    cached_responses: CachedResponseRepository
+    llm_usage: LLMUsageRepository
+    checkpoints: AgentCheckpointRepository
 
     @abstractmethod
     def __init__(self):
@@ -45,18 +62,38 @@ class IUnitOfWork(ABC):
 
 
 class UnitOfWork(IUnitOfWork):
-    def __init__(self, session_factory=None):
+    """
+    Opens a new session per `async with` block, or works inside a request-scoped `session` shared with
+    authentication, so that a request checks out a single connection. A shared session is not closed here;
+    each block runs in a savepoint, so a failed block is rolled back without discarding the session.
+    """
+
+    def __init__(self, session_factory=None, session: AsyncSession | None = None):
         session_factory = session_factory or async_session
         self.session_factory = session_factory
+        self.shared_session = session
+        self._transaction: AsyncSessionTransaction | None = None
 
     async def __aenter__(self):
-        self.session = self.session_factory()
+        if self.shared_session is not None:
+            self.session = self.shared_session
+            self._transaction = await self.session.begin_nested()
+        else:
+            self.session = self.session_factory()
 
         self.users = UserRepository(self.session)
         self.threads = ThreadRepository(self.session)
         self.messages = MessageRepository(self.session)
+        self.thread_archives = ThreadArchiveRepository(self.session)
         self.binance_accounts = BinanceAccountRepository(self.session)
         self.trading_bots = TradingBotRepository(self.session)
+        self.bot_activities = BotActivityRepository(self.session)
+        self.bot_performance = BotPerformanceRepository(self.session)
+        self.balance_snapshots = BalanceSnapshotRepository(self.session)
+        self.jobs = JobRepository(self.session)
+        self.cached_responses = CachedResponseRepository(self.session)
+        self.llm_usage = LLMUsageRepository(self.session)
+        self.checkpoints = AgentCheckpointRepository(self.session)
 
         return self
 
@@ -68,7 +105,8 @@ class UnitOfWork(IUnitOfWork):
             await self.rollback()
         else:
             await self.commit()
-        await self.session.close()
+        if self.shared_session is None:
+            await self.session.close()
         await logger.complete()
 
         if exc:
@@ -81,4 +119,7 @@ class UnitOfWork(IUnitOfWork):
         self.session.add(instance)
 
     async def rollback(self):
-        await self.session.rollback()
+        if self._transaction is not None and self._transaction.is_active:
+            await self._transaction.rollback()
+        else:
+            await self.session.rollback()
@@ -0,0 +1,153 @@
+"""
+Load test of the chat, thread listing and account endpoints.
+
+Start the API offline against a local Postgres, so that neither OpenAI nor Binance is called:
+    PROVIDER=fake BINANCE_FAKE=true uvicorn app.main:app
+and run:
+    python scripts/loadtest.py --base-url http://localhost:8000 --users 50 --duration 60
+
+Every virtual user registers, adds a Binance account and a thread, then calls the scenarios in a loop
+with the given weights. Throughput and p50/p90/p99 latency are reported per scenario.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+
+PASSWORD = 'loadtest-password'
+PROMPTS = [
+    'What is my BTC balance?',
+    'What is the price of ETH?',
+    'Show my open orders',
+    'Should I rebalance my portfolio towards ETH?',
+    'Explain the risk of my current holdings',
+]
+
+
+@dataclass
+class ScenarioStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, status: int, latency: float):
+        self.statuses[status] += 1
+        if status >= 400:
+            self.errors += 1
+        else:
+            self.latencies.append(latency)
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, index: int, run_id: str):
+        self.client = client
+        self.email = f'loadtest-{run_id}-{index}@example.com'
+        self.api_key = f'loadtest-{run_id}-{index}'
+        self.headers: dict = {}
+        self.thread_id: str | None = None
+
+    async def setup(self):
+        response = await self.client.post(
+            '/auth/register',
+            json={'email': self.email, 'password': PASSWORD, 'full_name': 'Load Test', 'avatar': None},
+        )
+        response.raise_for_status()
+        response = await self.client.post('/auth/login', data={'username': self.email, 'password': PASSWORD})
+        response.raise_for_status()
+        self.headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        response = await self.client.post(
+            '/binance/accounts',
+            json={'name': 'load test', 'api_key': self.api_key, 'secret_key': 'secret', 'account_type': 'testnet'},
+            headers=self.headers,
+        )
+        response.raise_for_status()
+        response = await self.client.post('/threads', json={'title': 'Load test'}, headers=self.headers)
+        response.raise_for_status()
+        self.thread_id = response.json()['id']
+
+    async def chat(self, rng: random.Random) -> httpx.Response:
+        return await self.client.post(
+            f'/threads/{self.thread_id}/messages',
+            json={'message': rng.choice(PROMPTS)},
+            headers=self.headers,
+        )
+
+    async def list_threads(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get('/threads', params={'per_page': 10}, headers=self.headers)
+
+    async def account(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get('/binance/account', params={'fresh': True}, headers=self.headers)
+
+
+async def run_user(user: VirtualUser, weights: dict[str, int], deadline: float, stats: dict, seed: int):
+    rng = random.Random(seed)
+    names, scenario_weights = list(weights), list(weights.values())
+    while time.monotonic() < deadline:
+        name = rng.choices(names, scenario_weights)[0]
+        started_at = time.perf_counter()
+        try:
+            response = await getattr(user, name)(rng)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 599
+        stats[name].record(status, time.perf_counter() - started_at)
+
+
+def report(stats: dict[str, ScenarioStats], elapsed: float):
+    print(f'{"scenario":<14}{"requests":>10}{"errors":>8}{"rps":>8}{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}{"max ms":>10}')
+    for name, scenario in stats.items():
+        latencies = scenario.latencies
+        print(
+            f'{name:<14}{len(latencies) + scenario.errors:>10}{scenario.errors:>8}'
+            f'{len(latencies) / elapsed:>8.1f}'
+            f'{percentile(latencies, 0.5) * 1000:>10.0f}{percentile(latencies, 0.9) * 1000:>10.0f}'
+            f'{percentile(latencies, 0.99) * 1000:>10.0f}{max(latencies, default=0) * 1000:>10.0f}'
+        )
+        failures = {status: count for status, count in scenario.statuses.items() if status >= 400}
+        if failures:
+            print(f'{"":<14}failed with {dict(sorted(failures.items()))}')
+
+
+async def main(args):
+    weights = {'chat': args.chat_weight, 'list_threads': args.threads_weight, 'account': args.account_weight}
+    weights = {name: weight for name, weight in weights.items() if weight > 0}
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        run_id = uuid.uuid4().hex[:8]
+        users = [VirtualUser(client, index, run_id) for index in range(args.users)]
+        await asyncio.gather(*(user.setup() for user in users))
+        print(f'{len(users)} users ready, running for {args.duration}s')
+
+        stats = defaultdict(ScenarioStats)
+        started_at = time.monotonic()
+        deadline = started_at + args.duration
+        await asyncio.gather(*(
+            run_user(user, weights, deadline, stats, seed=args.seed + index) for index, user in enumerate(users)
+        ))
+        report(stats, time.monotonic() - started_at)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds of load after setup')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--chat-weight', type=int, default=2)
+    parser.add_argument('--threads-weight', type=int, default=5)
+    parser.add_argument('--account-weight', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,92 @@
+"""
+Database tests run against a disposable Postgres database given by TEST_POSTGRES_URI, which replaces
+POSTGRES_URI for the application. It is migrated to head once and its tables are emptied after every test.
+Without TEST_POSTGRES_URI database tests are skipped; other settings are read from the environment and .env as usual.
+"""
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+TEST_POSTGRES_URI = os.environ.get('TEST_POSTGRES_URI')
+if TEST_POSTGRES_URI:
+    os.environ['POSTGRES_URI'] = TEST_POSTGRES_URI
+
+import app.main  # noqa: E402,F401  Resolves the import cycle between services and inference tools
+from sqlalchemy import text  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.middlewares.context import request_object  # noqa: E402
+from app.models import BinanceAccount, Thread, TradingBot, User  # noqa: E402
+from app.models.users import BinanceAccountType  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.utils.unitofwork import UnitOfWork  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def request_context():
+    """Request seen by code reading `request_object`, as set by `RequestMiddleware`."""
+    token = request_object.set(Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': [], 'query_string': b''}))
+    yield
+    request_object.reset(token)
+
+
+@pytest.fixture(scope='session')
+def migrated_database():
+    if not TEST_POSTGRES_URI:
+        pytest.skip('TEST_POSTGRES_URI is not set')
+    # The CLI like in deployments, the `alembic` directory of the project shadows the package on sys.path here
+    alembic = shutil.which('alembic', path=os.path.dirname(sys.executable)) or 'alembic'
+    subprocess.run([alembic, 'upgrade', 'head'], cwd=BASE_DIR, check=True)
+
+
+@pytest.fixture
+async def database(migrated_database):
+    yield
+    tables = ', '.join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    async with engine.begin() as connection:
+        await connection.execute(text(f'TRUNCATE {tables} RESTART IDENTITY CASCADE'))
+    # Pooled connections belong to the event loop of this test
+    await engine.dispose()
+
+
+@pytest.fixture
+def unit_of_work(database) -> UnitOfWork:
+    return UnitOfWork()
+
+
+@pytest.fixture
+async def user(unit_of_work) -> User:
+    async with unit_of_work:
+        return await unit_of_work.users.create(
+            id=uuid4(), email=f'{uuid4().hex}@example.com', hashed_password='x', is_active=True
+        )
+
+
+@pytest.fixture
+async def thread(unit_of_work, user) -> Thread:
+    async with unit_of_work:
+        return await unit_of_work.threads.create(id=uuid4(), title='Test thread', user_id=user.id)
+
+
+@pytest.fixture
+async def binance_account(unit_of_work, user) -> BinanceAccount:
+    async with unit_of_work:
+        return await unit_of_work.binance_accounts.create(
+            user_id=user.id, name='Test account', api_key='key', secret_key='secret', account_type=BinanceAccountType.LIVE
+        )
+
+
+@pytest.fixture
+async def trading_bot(unit_of_work, user, binance_account) -> TradingBot:
+    async with unit_of_work:
+        return await unit_of_work.trading_bots.create(
+            binance_account_id=binance_account.id, user_id=user.id, name='Test bot', risk_tolerance=5, target_profit=10
+        )
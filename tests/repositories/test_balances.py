@@ -0,0 +1,16 @@
+from datetime import datetime, timedelta
+
+
+async def test_purge_older_than_keeps_recent_snapshots(unit_of_work, binance_account):
+    now = datetime.now()
+    async with unit_of_work:
+        await unit_of_work.balance_snapshots.bulk_create([
+            {'binance_account_id': binance_account.id, 'created_at': now - timedelta(days=days), 'balances': {}}
+            for days in (0, 29, 31, 60)
+        ])
+
+    async with unit_of_work:
+        assert await unit_of_work.balance_snapshots.purge_older_than(timedelta(days=30)) == 2
+        snapshots = await unit_of_work.balance_snapshots.list(binance_account_id=binance_account.id)
+
+    assert len(snapshots) == 2
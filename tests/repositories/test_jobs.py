@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from app.models import JobKind, JobStatus
+from app.utils.unitofwork import UnitOfWork
+
+
+async def test_enqueue_skips_duplicates_of_pending_jobs(unit_of_work):
+    async with unit_of_work:
+        first = await unit_of_work.jobs.enqueue(JobKind.BOT_ANALYSIS, {'bot_id': 1}, dedupe_key='bot:1')
+        assert await unit_of_work.jobs.enqueue(JobKind.BOT_ANALYSIS, {'bot_id': 1}, dedupe_key='bot:1') is None
+        # The key is only unique per kind
+        assert await unit_of_work.jobs.enqueue(JobKind.CHAT_TURN, {}, dedupe_key='bot:1') is not None
+
+    async with unit_of_work:
+        await unit_of_work.jobs.complete(first.id, None)
+        assert await unit_of_work.jobs.enqueue(JobKind.BOT_ANALYSIS, {'bot_id': 1}, dedupe_key='bot:1') is not None
+
+
+async def test_claim_takes_due_jobs_by_priority(unit_of_work):
+    async with unit_of_work:
+        low = await unit_of_work.jobs.enqueue(JobKind.BOT_ANALYSIS, {}, priority=10)
+        high = await unit_of_work.jobs.enqueue(JobKind.CHAT_TURN, {}, priority=0)
+        await unit_of_work.jobs.enqueue(JobKind.CHAT_TURN, {}, run_after=datetime.now() + timedelta(days=1))
+
+    async with unit_of_work:
+        jobs = await unit_of_work.jobs.claim('worker', limit=1)
+    assert [job.id for job in jobs] == [high.id]
+    assert jobs[0].status == JobStatus.RUNNING
+    assert jobs[0].locked_by == 'worker'
+    assert jobs[0].attempts == 1
+
+    async with unit_of_work:
+        assert [job.id for job in await unit_of_work.jobs.claim('worker', limit=10)] == [low.id]
+
+
+async def test_claim_filters_by_kind(unit_of_work):
+    async with unit_of_work:
+        await unit_of_work.jobs.enqueue(JobKind.CHAT_TURN, {})
+        analysis = await unit_of_work.jobs.enqueue(JobKind.BOT_ANALYSIS, {})
+
+    async with unit_of_work:
+        jobs = await unit_of_work.jobs.claim('worker', limit=10, kinds=[JobKind.BOT_ANALYSIS])
+    assert [job.id for job in jobs] == [analysis.id]
+
+
+async def test_concurrent_claims_skip_locked_jobs(unit_of_work):
+    async with unit_of_work:
+        for _ in range(2):
+            await unit_of_work.jobs.enqueue(JobKind.CHAT_TURN, {})
+
+    async with UnitOfWork() as first, UnitOfWork() as second:
+        claimed = await first.jobs.claim('first', limit=1)
+        # The row locked by the first worker is skipped rather than waited for
+        other = await second.jobs.claim('second', limit=10)
+
+    assert len(claimed) == len(other) == 1
+    assert claimed[0].id != other[0].id
+
+
+async def test_failed_job_is_retried_until_attempts_run_out(unit_of_work):
+    async with unit_of_work:
+        job = await unit_of_work.jobs.enqueue(JobKind.CHAT_TURN, {}, max_attempts=2)
+
+    for status in (JobStatus.QUEUED, JobStatus.FAILED):
+        async with unit_of_work:
+            await unit_of_work.jobs.update({'run_after': datetime.now() - timedelta(days=1)}, pk=job.id)
+            job, = await unit_of_work.jobs.claim('worker', limit=1)
+            await unit_of_work.jobs.fail(job, 'boom', retry_in=0)
+            job = await unit_of_work.jobs.retrieve(pk=job.id)
+        assert job.status == status
+        assert job.error == 'boom'
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+
+
+def fill(bot_id, side: str, quantity: str, quote_quantity: str, commission: str = '0', **fields) -> dict:
+    return {
+        'bot_id': bot_id,
+        'activity_type': side,
+        'timestamp': datetime(2026, 10, 1, 12),
+        'details': {
+            'symbol': 'BTCUSDT', 'quantity': quantity, 'quote_quantity': quote_quantity, 'commission': commission,
+        },
+        **fields,
+    }
+
+
+async def test_refresh_folds_fills_once(unit_of_work, trading_bot):
+    async with unit_of_work:
+        await unit_of_work.bot_activities.bulk_create([
+            fill(trading_bot.id, 'BUY', '1', '100', commission='1'),
+            {'bot_id': trading_bot.id, 'activity_type': 'ANALYSIS', 'details': {}},
+            fill(trading_bot.id, 'SELL', '1', '150', commission='1'),
+        ])
+
+    async with unit_of_work:
+        assert await unit_of_work.bot_performance.refresh(trading_bot.id, limit=100) == 2
+    async with unit_of_work:
+        assert await unit_of_work.bot_performance.refresh(trading_bot.id, limit=100) == 0
+        performance = await unit_of_work.bot_performance.retrieve(bot_id=trading_bot.id)
+        daily = await unit_of_work.bot_performance.list_daily(trading_bot.id)
+
+    assert (performance.trades, performance.closed_trades, performance.winning_trades) == (2, 1, 1)
+    assert performance.volume == 250
+    assert performance.fees == 2
+    assert performance.realized_pnl == 48
+    assert performance.positions == {}
+    assert [(day.day.isoformat(), day.trades, day.realized_pnl) for day in daily] == [('2026-10-01', 2, 48)]
+
+
+async def test_refresh_folds_in_batches(unit_of_work, trading_bot):
+    async with unit_of_work:
+        await unit_of_work.bot_activities.bulk_create([fill(trading_bot.id, 'BUY', '1', '100') for _ in range(3)])
+
+    counts = []
+    for _ in range(3):
+        async with unit_of_work:
+            counts.append(await unit_of_work.bot_performance.refresh(trading_bot.id, limit=2))
+        async with unit_of_work:
+            performance = await unit_of_work.bot_performance.retrieve(bot_id=trading_bot.id)
+
+    assert counts == [2, 1, 0]
+    assert performance.trades == 3
+    assert performance.positions == {'BTCUSDT': ['3', '300']}
+
+
+async def test_refresh_counts_fills_committed_after_newer_ones(unit_of_work, trading_bot):
+    async with unit_of_work:
+        await unit_of_work.bot_activities.bulk_create([fill(trading_bot.id, 'BUY', '1', '100', id=1000)])
+    async with unit_of_work:
+        assert await unit_of_work.bot_performance.refresh(trading_bot.id, limit=100) == 1
+
+    # A fill whose id was taken before the folded one, but committed after it
+    async with unit_of_work:
+        await unit_of_work.bot_activities.bulk_create([fill(trading_bot.id, 'BUY', '1', '100', id=999)])
+    async with unit_of_work:
+        assert await unit_of_work.bot_performance.refresh(trading_bot.id, limit=100) == 1
+        performance = await unit_of_work.bot_performance.retrieve(bot_id=trading_bot.id)
+
+    assert performance.trades == 2
+
+
+@pytest.mark.parametrize('details', [None, {'symbol': 'BTCUSDT'}, {'symbol': 'BTCUSDT', 'quantity': 'x'}])
+async def test_refresh_skips_unusable_fills(unit_of_work, trading_bot, details):
+    async with unit_of_work:
+        await unit_of_work.bot_activities.bulk_create([
+            {'bot_id': trading_bot.id, 'activity_type': 'BUY', 'details': details},
+        ])
+
+    async with unit_of_work:
+        assert await unit_of_work.bot_performance.refresh(trading_bot.id, limit=100) == 1
+        performance = await unit_of_work.bot_performance.retrieve(bot_id=trading_bot.id)
+
+    assert performance.trades == 0
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.inference.history import from_chat_messages
+from app.services.threads import ThreadService
+
+TOOL_TURN = [
+    HumanMessage(content='What is BTC worth?'),
+    AIMessage(content='', tool_calls=[{'id': 'call_1', 'name': 'get_latest_price', 'args': {'symbol': 'BTCUSDT'}}]),
+    ToolMessage(content='{"price": "65000"}', tool_call_id='call_1'),
+    AIMessage(content='BTC trades at 65000 USDT.'),
+]
+
+
+async def test_list_messages_hides_tool_calls_but_keeps_answers(unit_of_work, thread):
+    await ThreadService.add_messages(unit_of_work, thread.id, from_chat_messages(TOOL_TURN))
+
+    async with unit_of_work:
+        visible = await unit_of_work.messages.list(thread_id=thread.id, include_tool_messages=False)
+        everything = await unit_of_work.messages.list(thread_id=thread.id)
+
+    assert [(message.role, message.content) for message in visible['items']] == [
+        ('user', 'What is BTC worth?'),
+        ('assistant', 'BTC trades at 65000 USDT.'),
+    ]
+    assert len(everything['items']) == 4
+
+
+async def test_list_with_preview_of_archived_thread(unit_of_work, user, thread):
+    await ThreadService.add_messages(unit_of_work, thread.id, from_chat_messages(TOOL_TURN))
+    async with unit_of_work:
+        assert await unit_of_work.thread_archives.archive(thread.id, inactive_for=timedelta(0)) == 4
+
+    async with unit_of_work:
+        page = await unit_of_work.threads.list_with_preview(user_id=user.id)
+
+    [preview] = page['items']
+    assert preview.message_count == 2
+    assert preview.last_message_role == 'assistant'
+    assert preview.last_message_content == 'BTC trades at 65000 USDT.'
+
+
+async def test_list_with_preview_shows_the_answer(unit_of_work, user, thread):
+    await ThreadService.add_messages(unit_of_work, thread.id, from_chat_messages(TOOL_TURN))
+
+    async with unit_of_work:
+        page = await unit_of_work.threads.list_with_preview(user_id=user.id)
+
+    [preview] = page['items']
+    assert preview.message_count == 2
+    assert preview.last_message_role == 'assistant'
+    assert preview.last_message_content == 'BTC trades at 65000 USDT.'
@@ -0,0 +1,58 @@
+from uuid import uuid4
+
+import pytest
+
+from app.models import BinanceAccount
+from app.models.users import BinanceAccountType
+from app.services import binance
+from app.services.binance import BinanceClientPool
+
+
+class Client:
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
+        self.api_key = api_key
+        self.api_secret = api_secret
+
+    async def close_connection(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def create_client(monkeypatch):
+    monkeypatch.setattr(binance, 'create_client', Client)
+
+
+def binance_account(**fields) -> BinanceAccount:
+    return BinanceAccount(**{
+        'id': uuid4(), 'api_key': 'key', 'secret_key': 'secret', 'account_type': BinanceAccountType.LIVE, **fields
+    })
+
+
+async def test_client_is_reused_for_the_same_account():
+    pool = BinanceClientPool(maxsize=10, idle_timeout=60)
+    account = binance_account()
+
+    assert await pool.get(account) is await pool.get(account)
+
+
+async def test_client_is_rebuilt_after_secret_rotation():
+    pool = BinanceClientPool(maxsize=10, idle_timeout=60)
+    account = binance_account()
+    client = await pool.get(account)
+
+    account.secret_key = 'rotated'
+    rebuilt = await pool.get(account)
+
+    assert rebuilt is not client
+    assert rebuilt.api_secret == 'rotated'
+    assert pool.stats()['size'] == 1
+
+
+async def test_discarded_account_gets_a_new_client():
+    pool = BinanceClientPool(maxsize=10, idle_timeout=60)
+    account = binance_account()
+    client = await pool.get(account)
+
+    pool.discard(account.id)
+
+    assert await pool.get(account) is not client
@@ -0,0 +1,53 @@
+import json
+from decimal import Decimal
+
+from langchain_core.messages import ToolMessage
+
+from app.services.trading_bots import _fills
+
+
+def place_order(order: dict | str, call_id: str = 'call') -> ToolMessage:
+    content = order if isinstance(order, str) else json.dumps(order)
+    return ToolMessage(content=content, name='place_order', tool_call_id=call_id)
+
+
+def order(**fields) -> dict:
+    return {
+        'symbol': 'BTCUSDT', 'side': 'BUY', 'orderId': 1, 'executedQty': '0.5', 'cummulativeQuoteQty': '30000',
+        'fills': [], **fields,
+    }
+
+
+def test_fills_count_commission_in_quote_and_base_asset():
+    fills = _fills([place_order(order(fills=[
+        {'price': '60000', 'qty': '0.25', 'commission': '3', 'commissionAsset': 'USDT'},
+        {'price': '60000', 'qty': '0.25', 'commission': '0.0001', 'commissionAsset': 'BTC'},
+        {'price': '60000', 'qty': '0', 'commission': '0.01', 'commissionAsset': 'BNB'},
+    ]))])
+
+    assert fills == [{
+        'symbol': 'BTCUSDT', 'side': 'BUY', 'quantity': '0.5', 'quote_quantity': '30000', 'price': '60000',
+        'commission': '9.0000', 'order_id': 1,
+    }]
+
+
+def test_fills_price_orders_without_quote_quantity_from_their_fills():
+    fill, = _fills([place_order(order(cummulativeQuoteQty='0', fills=[
+        {'price': '60000', 'qty': '0.25'}, {'price': '62000', 'qty': '0.25'},
+    ]))])
+
+    assert Decimal(fill['quote_quantity']) == 30500
+    assert Decimal(fill['price']) == 61000
+
+
+def test_fills_skip_repeated_unfilled_and_failed_orders():
+    conversation = [
+        place_order(order(), 'first'),
+        place_order(order(), 'repeated'),
+        place_order(order(orderId=2, executedQty='0')),
+        place_order({'error': 'Insufficient balance'}),
+        place_order('Order rejected'),
+        ToolMessage(content=json.dumps(order(orderId=3)), name='get_order', tool_call_id='other'),
+    ]
+
+    assert [fill['order_id'] for fill in _fills(conversation)] == [1]
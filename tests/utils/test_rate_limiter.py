@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.utils.rate_limiter import PriorityRateLimiter, RequestPriority, TokenBudgetLimiter
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def limiter() -> PriorityRateLimiter:
+    return PriorityRateLimiter(weight_per_minute=600, orders_per_10s=1)
+
+
+async def test_waiters_are_served_by_priority(limiter):
+    limiter.weight.tokens = 0
+    served = []
+
+    async def acquire(priority: RequestPriority):
+        await limiter.acquire(10, priority)
+        served.append(priority)
+
+    priorities = [RequestPriority.BACKGROUND, RequestPriority.INTERACTIVE]
+    tasks = [asyncio.create_task(acquire(priority)) for priority in priorities]
+    await settle()
+    assert served == []
+
+    # Room for one request: the interactive one goes first although it came second
+    limiter.weight.tokens = 10
+    limiter._dispatch()
+    await settle()
+    assert served == [RequestPriority.INTERACTIVE]
+    assert limiter.stats()['queue_depth']['BACKGROUND'] == 1
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def test_order_limit_of_one_account_does_not_hold_back_others(limiter):
+    await limiter.acquire(1, account='a', orders=1)
+
+    blocked = asyncio.create_task(limiter.acquire(1, account='a', orders=1))
+    await settle()
+    await asyncio.wait_for(limiter.acquire(1, account='b', orders=1), timeout=1)
+
+    assert not blocked.done()
+    blocked.cancel()
+
+
+async def test_penalty_stops_dispatching(limiter):
+    limiter.penalize(retry_after=5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(1), timeout=0.05)
+    assert limiter.stats()['blocked_for'] > 0
+
+
+async def test_cancelled_waiter_leaves_the_queue(limiter):
+    limiter.weight.tokens = 0
+    task = asyncio.create_task(limiter.acquire(10))
+    await settle()
+    assert limiter.stats()['queue_depth']['INTERACTIVE'] == 1
+
+    task.cancel()
+    await settle()
+    assert limiter.stats()['queue_depth']['INTERACTIVE'] == 0
+
+
+def test_observed_weight_lowers_available_weight(limiter):
+    limiter.observe({'X-MBX-USED-WEIGHT-1M': '500'})
+
+    assert limiter.weight.tokens <= 100
+
+
+@pytest.fixture
+def budget() -> TokenBudgetLimiter:
+    return TokenBudgetLimiter(tokens_per_minute=100, requests_per_minute=60)
+
+
+async def test_exhausted_model_does_not_hold_back_other_models(budget):
+    await budget.acquire(100, 'large')
+
+    blocked = asyncio.create_task(budget.acquire(50, 'large'))
+    await settle()
+    await asyncio.wait_for(budget.acquire(50, 'small'), timeout=1)
+
+    assert not blocked.done()
+    blocked.cancel()
+
+
+async def test_unused_reservation_is_given_back(budget):
+    await budget.acquire(100, 'model')
+    waiting = asyncio.create_task(budget.acquire(50, 'model'))
+    await settle()
+    assert not waiting.done()
+
+    budget.reconcile(reserved=100, used=40, model='model')
+    await asyncio.wait_for(waiting, timeout=1)
+
+
+async def test_reconcile_charges_tokens_used_over_the_reservation(budget):
+    await budget.acquire(10, 'model')
+
+    budget.reconcile(reserved=10, used=60, model='model')
+
+    assert budget.models['model'].tokens.tokens == pytest.approx(40, abs=0.5)
+
+
+def test_observed_org_usage_takes_its_share_of_the_budget(budget):
+    budget.observe({
+        'x-ratelimit-limit-tokens': '1000', 'x-ratelimit-remaining-tokens': '250',
+        'x-ratelimit-limit-requests': '10', 'x-ratelimit-remaining-requests': '10',
+    }, model='model')
+
+    assert budget.models['model'].tokens.tokens <= 25
+    assert budget.models['model'].requests.tokens == pytest.approx(60, abs=0.1)
+
+
+async def test_penalized_model_waits(budget):
+    budget.penalize(retry_after=5, model='model')
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(budget.acquire(1, 'model'), timeout=0.05)
+    assert budget.stats()['models']['model']['blocked_for'] > 0